@@ -0,0 +1,217 @@
+"""
+Admin API Routes
+
+FastAPI router for administrative endpoints. Every route requires the
+ADMIN_API_KEY in the X-Admin-Key header.
+"""
+
+import csv
+import io
+import json
+import logging
+from dataclasses import asdict
+from typing import Any, AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import create_unit_of_work, get_readonly_user_repository, require_admin_key
+from app.api.responses import model_response
+from app.api.schemas import ImportRejectionResponse, UserImportResponse, UserPageResponse, UserResponse
+from app.domain.models import User
+from app.domain.repository import InvalidCursor, UserRepository
+from app.domain.usermanagement.user_import import ImportReport, UserImportService
+from app.infrastructure.import_files import aiter_lines, read_import_records
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(require_admin_key)])
+
+# Exported user fields; credentials and token versions are never exported
+EXPORT_FIELDS = (
+    "id", "email", "first_name", "last_name", "is_active", "is_verified",
+    "created_at", "updated_at", "last_login"
+)
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Import hashes allowed in the shared hashing pool at once; the remaining
+# slots stay free for logins
+IMPORT_HASH_CONCURRENCY = 1
+
+
+@router.get(
+    "/users",
+    response_model=UserPageResponse,
+    summary="List users",
+    description="List users oldest first, one page at a time, using the next_cursor of the previous page"
+)
+async def list_users(
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None),
+    is_active: Optional[bool] = Query(default=None),
+    user_repo: UserRepository = Depends(get_readonly_user_repository)
+):
+    """
+    List users with keyset pagination.
+    
+    Pages are ordered by creation time and id; pass ``next_cursor`` back
+    as ``cursor`` to get the following page. A missing ``next_cursor``
+    marks the last page.
+    """
+    try:
+        page = await user_repo.list_users_page(limit=limit, cursor=cursor, is_active=is_active)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    return model_response(
+        UserPageResponse(
+            users=[
+                UserResponse(
+                    id=user.id,
+                    email=str(user.email),
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    is_active=user.is_active,
+                    is_verified=user.is_verified,
+                    created_at=user.created_at,
+                    last_login=user.last_login
+                )
+                for user in page.users
+            ],
+            next_cursor=page.next_cursor
+        )
+    )
+
+
+def _export_values(user: User) -> List[Any]:
+    return [
+        str(user.id),
+        str(user.email),
+        user.first_name,
+        user.last_name,
+        user.is_active,
+        user.is_verified,
+        user.created_at.isoformat(),
+        user.updated_at.isoformat(),
+        user.last_login.isoformat() if user.last_login else None,
+    ]
+
+
+def _csv_cell(value: object) -> object:
+    # Keep spreadsheet applications from evaluating user-supplied names as formulas
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@", "\t", "\r"):
+        return "'" + value
+    return value
+
+
+def _encode_ndjson(users: List[User]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, _export_values(user))), separators=(",", ":")) + "\n"
+        for user in users
+    )
+
+
+def _encode_csv(users: List[User]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([_csv_cell(value) for value in _export_values(user)] for user in users)
+    return buffer.getvalue()
+
+
+async def _export_chunks(export_format: str, is_active: Optional[bool]) -> AsyncIterator[str]:
+    """
+    Stream the export, one encoded chunk per batch of users.
+    
+    The unit of work is opened here because the request's dependencies
+    may be torn down before the response body is sent.
+    """
+    encode = _encode_csv if export_format == "csv" else _encode_ndjson
+    if export_format == "csv":
+        yield ",".join(EXPORT_FIELDS) + "\n"
+    
+    async with create_unit_of_work() as uow:
+        batch: List[User] = []
+        async for user in uow.users.stream_users(is_active=is_active, batch_size=EXPORT_BATCH_SIZE):
+            batch.append(user)
+            if len(batch) == EXPORT_BATCH_SIZE:
+                yield encode(batch)
+                batch = []
+        if batch:
+            yield encode(batch)
+
+
+@router.get(
+    "/users/export",
+    summary="Export users",
+    description="Stream every user as NDJSON or CSV, oldest first",
+    response_class=StreamingResponse
+)
+async def export_users(
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    is_active: Optional[bool] = Query(default=None)
+):
+    """
+    Export users.
+    
+    Rows are read through a server-side cursor and written to the client
+    as each batch arrives, so the export runs in constant memory and
+    yields to other requests between batches.
+    """
+    return StreamingResponse(
+        _export_chunks(export_format, is_active),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'}
+    )
+
+
+@router.post(
+    "/users/import",
+    response_model=UserImportResponse,
+    summary="Import users",
+    description="Create users in bulk from an NDJSON or CSV request body"
+)
+async def import_users(
+    request: Request,
+    import_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(default=500, ge=1, le=5000)
+):
+    """
+    Import users.
+    
+    The body is parsed as it is received and imported in batches, each
+    committed on its own, so a failure part-way keeps the batches before
+    it. Plain passwords are hashed in the shared hashing pool one at a
+    time (IMPORT_HASH_CONCURRENCY), so logins on this worker wait behind
+    at most one import hash; such imports are slow, so use pre-hashed
+    passwords or the ``cli.py import-users`` command for large migrations.
+    """
+    def log_progress(report: ImportReport) -> None:
+        logger.info(
+            "User import: %d processed, %d imported (%.0f users/s)",
+            report.processed, report.imported, report.users_per_second
+        )
+    
+    async with create_unit_of_work() as uow:
+        service = UserImportService(
+            uow,
+            batch_size=batch_size,
+            progress=log_progress,
+            hash_concurrency=IMPORT_HASH_CONCURRENCY
+        )
+        report = await service.import_records(
+            read_import_records(aiter_lines(request.stream()), import_format)
+        )
+    
+    return UserImportResponse(
+        processed=report.processed,
+        imported=report.imported,
+        duplicates=report.duplicates,
+        invalid=report.invalid,
+        elapsed_seconds=report.elapsed_seconds,
+        users_per_second=report.users_per_second,
+        rejections=[ImportRejectionResponse(**asdict(rejection)) for rejection in report.rejections]
+    )
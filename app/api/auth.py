@@ -5,12 +5,16 @@ FastAPI router for user authentication endpoints including
 login, signup, password reset, and user management.
 """
 
+import math
+from typing import Any, Dict, Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 
 from app.api.schemas import (
     UserCreateRequest,
     UserLoginRequest,
+    RefreshTokenRequest,
     PasswordResetRequest,
     PasswordResetConfirmRequest,
     UserResponse,
@@ -18,16 +22,24 @@ from app.api.schemas import (
     MessageResponse,
     ErrorResponse
 )
+from app.api.responses import model_response
 from app.api.dependencies import (
     get_login_service,
     get_signup_service,
     get_password_reset_service,
-    get_current_user
+    get_current_identity,
+    get_readonly_user_repository,
+    get_access_token_claims,
+    get_client_ip,
+    get_last_login_buffer,
+    get_revocation_store,
+    get_token_refresh_service
 )
 from app.domain.usermanagement.login import (
     LoginService,
     InvalidCredentials,
-    InactiveAccount
+    InactiveAccount,
+    TooManyAttempts
 )
 from app.domain.usermanagement.signup import (
     SignupService,
@@ -39,8 +51,16 @@ from app.domain.usermanagement.password_reset import (
     InvalidToken,
     UserNotFound
 )
-from app.domain.models import User
+from app.domain.usermanagement.token_refresh import (
+    TokenRefreshService,
+    InvalidRefreshToken,
+    RefreshTokenReused
+)
+from app.domain.models import Identity
+from app.domain.repository import UserRepository
 from app.infrastructure.config import settings
+from app.infrastructure.login_tracker import LastLoginBuffer
+from app.infrastructure.token_store import RevocationStore
 import logging
 
 logger = logging.getLogger(__name__)
@@ -63,27 +83,25 @@ async def signup(
     try:
         user = await signup_service.register(
             email=request.email,
-            password=request.password
+            password=request.password,
+            first_name=request.first_name,
+            last_name=request.last_name
         )
         
-        # Update profile if first/last name provided
-        if request.first_name or request.last_name:
-            user.update_profile(
-                first_name=request.first_name,
-                last_name=request.last_name
-            )
-        
-        logger.info(f"New user registered: {user.email}")
+        logger.info("New user registered: %s", user.id)
         
-        return UserResponse(
-            id=user.id,
-            email=str(user.email),
-            first_name=user.first_name,
-            last_name=user.last_name,
-            is_active=user.is_active,
-            is_verified=user.is_verified,
-            created_at=user.created_at,
-            last_login=user.last_login
+        return model_response(
+            UserResponse(
+                id=user.id,
+                email=str(user.email),
+                first_name=user.first_name,
+                last_name=user.last_name,
+                is_active=user.is_active,
+                is_verified=user.is_verified,
+                created_at=user.created_at,
+                last_login=user.last_login
+            ),
+            status_code=status.HTTP_201_CREATED
         )
     
     except EmailAlreadyRegistered:
@@ -97,7 +115,8 @@ async def signup(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Signup error: {str(e)}")
+        # Only the type: database errors render the bound email and password hash
+        logger.error("Signup error: %s", type(e).__name__)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during registration"
@@ -108,33 +127,46 @@ async def signup(
     "/login",
     response_model=TokenResponse,
     summary="User login",
-    description="Authenticate user and return access token"
+    description="Authenticate user and return access and refresh tokens"
 )
 async def login(
     request: UserLoginRequest,
-    login_service: LoginService = Depends(get_login_service)
+    login_service: LoginService = Depends(get_login_service),
+    token_service: TokenRefreshService = Depends(get_token_refresh_service),
+    last_login_buffer: LastLoginBuffer = Depends(get_last_login_buffer),
+    client_ip: Optional[str] = Depends(get_client_ip)
 ):
     """Authenticate user and return tokens."""
     try:
         user = await login_service.authenticate(
             email=request.email,
-            password=request.password
+            password=request.password,
+            client_ip=client_ip
         )
         
-        # Update last login timestamp
-        user.update_login_timestamp()
+        # Update last login timestamp (persisted in batches by the buffer)
+        last_login_buffer.record(user.id, user.update_login_timestamp())
         
-        # Create access token
-        access_token = login_service.create_access_token(user)
+        # Create access token and start a refresh token family
+        tokens = await token_service.issue_tokens(user)
         
-        logger.info(f"User logged in: {user.email}")
+        logger.info("User logged in: %s", user.id)
         
-        return TokenResponse(
-            access_token=access_token,
-            token_type="bearer",
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # Convert to seconds
+        return model_response(
+            TokenResponse(
+                access_token=tokens.access_token,
+                token_type="bearer",
+                expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # Convert to seconds
+                refresh_token=tokens.refresh_token
+            )
         )
     
+    except TooManyAttempts as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
     except InvalidCredentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -146,13 +178,65 @@ async def login(
             detail="Account is deactivated"
         )
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        logger.error("Login error: %s", type(e).__name__)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during login"
         )
 
 
+@router.post(
+    "/refresh",
+    response_model=TokenResponse,
+    summary="Refresh tokens",
+    description="Exchange a refresh token for a new access token and refresh token"
+)
+async def refresh_tokens(
+    request: RefreshTokenRequest,
+    token_service: TokenRefreshService = Depends(get_token_refresh_service)
+):
+    """
+    Refresh tokens.
+    
+    Each refresh token can be exchanged once. Replaying an already used
+    refresh token revokes every refresh token issued from the same login.
+    """
+    try:
+        tokens = await token_service.refresh(request.refresh_token)
+        
+        return model_response(
+            TokenResponse(
+                access_token=tokens.access_token,
+                token_type="bearer",
+                expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+                refresh_token=tokens.refresh_token
+            )
+        )
+    
+    except RefreshTokenReused:
+        logger.warning("Refresh token reuse detected, token family revoked")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+    except InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+    except InactiveAccount:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Account is deactivated"
+        )
+    except Exception as e:
+        logger.error("Token refresh error: %s", type(e).__name__)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during token refresh"
+        )
+
+
 @router.post(
     "/password-reset",
     response_model=MessageResponse,
@@ -177,7 +261,7 @@ async def request_password_reset(
         # 3. Send email with reset link
         # 4. Return success message without token
         
-        logger.info(f"Password reset requested for: {request.email}")
+        logger.info("Password reset requested")
         
         return MessageResponse(
             message="Password reset instructions have been sent to your email (feature pending implementation)",
@@ -185,7 +269,7 @@ async def request_password_reset(
         )
     
     except Exception as e:
-        logger.error(f"Password reset request error: {str(e)}")
+        logger.error("Password reset request error: %s", type(e).__name__)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during password reset request"
@@ -232,7 +316,7 @@ async def confirm_password_reset(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Password reset confirmation error: {str(e)}")
+        logger.error("Password reset confirmation error: %s", type(e).__name__)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during password reset"
@@ -246,18 +330,33 @@ async def confirm_password_reset(
     description="Get current authenticated user information"
 )
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    identity: Identity = Depends(get_current_identity),
+    user_repo: UserRepository = Depends(get_readonly_user_repository)
 ):
-    """Get current user information."""
-    return UserResponse(
-        id=current_user.id,
-        email=str(current_user.email),
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        is_active=current_user.is_active,
-        is_verified=current_user.is_verified,
-        created_at=current_user.created_at,
-        last_login=current_user.last_login
+    """
+    Get current user information.
+    
+    Identity comes from the token claims and the profile from the user
+    cache, so a warm request does not touch the database.
+    """
+    current_user = await user_repo.get_by_id(identity.user_id)
+    if not current_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return model_response(
+        UserResponse(
+            id=current_user.id,
+            email=str(current_user.email),
+            first_name=current_user.first_name,
+            last_name=current_user.last_name,
+            is_active=current_user.is_active,
+            is_verified=current_user.is_verified,
+            created_at=current_user.created_at,
+            last_login=current_user.last_login
+        )
     )
 
 
@@ -265,16 +364,28 @@ async def get_current_user_info(
     "/logout",
     response_model=MessageResponse,
     summary="User logout",
-    description="Logout user (client should discard token)"
+    description="Revoke the bearer access token and its refresh tokens"
 )
-async def logout():
+async def logout(
+    claims: Dict[str, Any] = Depends(get_access_token_claims),
+    store: RevocationStore = Depends(get_revocation_store),
+    token_service: TokenRefreshService = Depends(get_token_refresh_service)
+):
     """
     Logout user.
     
-    Since we're using stateless JWT tokens, logout is handled on the client side
-    by discarding the token. In production, you might want to implement token blacklisting.
+    Revokes the presented access token until it expires, so it is rejected
+    by every authenticated endpoint even if it leaks, and the refresh
+    tokens issued alongside it.
     """
+    jti = claims.get("jti")
+    if jti:
+        await store.revoke(jti, claims["exp"])
+    family = claims.get("fam")
+    if family:
+        await token_service.revoke_family(family)
+    
     return MessageResponse(
         message="Logged out successfully",
         success=True
-    )
\ No newline at end of file
+    )
@@ -4,55 +4,183 @@ API Dependencies
 FastAPI dependencies for authentication, database sessions, and other common functionality.
 """
 
-from fastapi import Depends, HTTPException, status
+import hmac
+import ipaddress
+
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.database import get_db_session
+from app.infrastructure.cache import token_version_cache, user_cache
+from app.infrastructure.config import settings
+from app.infrastructure.database import get_readonly_db_session
+from app.infrastructure.login_tracker import LastLoginBuffer, last_login_buffer
+from app.infrastructure.rate_limit import LoginThrottle, login_throttle
 from app.infrastructure.repositories import SQLAlchemyUserRepository
 from app.infrastructure.security import JWTManager
+from app.infrastructure.token_store import RevocationStore, refresh_token_store, revocation_store
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
 from app.domain.usermanagement.login import LoginService
 from app.domain.usermanagement.signup import SignupService
 from app.domain.usermanagement.password_reset import PasswordResetService
-from app.domain.repository import UserRepository
-from app.domain.models import User
-from typing import Optional
+from app.domain.usermanagement.token_refresh import TokenRefreshService
+from app.domain.repository import UnitOfWork, UserRepository
+from app.domain.models import Identity, User
+from typing import Any, AsyncIterator, Dict, Optional
+from uuid import UUID
 
 # Security
 security = HTTPBearer(auto_error=False)
 
 
+def _user_repository(session: AsyncSession) -> SQLAlchemyUserRepository:
+    if not settings.USER_CACHE_ENABLED:
+        return SQLAlchemyUserRepository(session)
+    return SQLAlchemyUserRepository(session, cache=user_cache, version_cache=token_version_cache)
+
+
+def create_unit_of_work() -> SQLAlchemyUnitOfWork:
+    """Create a unit of work wired to the user caches when they are enabled."""
+    if not settings.USER_CACHE_ENABLED:
+        return SQLAlchemyUnitOfWork()
+    return SQLAlchemyUnitOfWork(cache=user_cache, version_cache=token_version_cache)
+
+
+async def get_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """
+    Dependency for getting a unit of work for the request.
+    
+    Services commit their own work; anything still uncommitted when the
+    request ends is committed then, or rolled back if the request failed.
+    """
+    async with create_unit_of_work() as uow:
+        yield uow
+
+
 async def get_user_repository(
-    session: AsyncSession = Depends(get_db_session)
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> UserRepository:
     """Dependency for getting user repository."""
-    return SQLAlchemyUserRepository(session)
+    return uow.users
+
+
+async def get_readonly_user_repository(
+    session: AsyncSession = Depends(get_readonly_db_session)
+) -> UserRepository:
+    """Dependency for getting a user repository for read-only paths."""
+    return _user_repository(session)
+
+
+async def get_login_throttle() -> Optional[LoginThrottle]:
+    """Dependency for getting the login throttle, or None when disabled."""
+    return login_throttle if settings.LOGIN_RATE_LIMIT_ENABLED else None
 
 
 async def get_login_service(
-    user_repo: UserRepository = Depends(get_user_repository)
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    throttle: Optional[LoginThrottle] = Depends(get_login_throttle)
 ) -> LoginService:
     """Dependency for getting login service."""
-    return LoginService(user_repo)
+    return LoginService(uow, throttle=throttle)
+
+
+_TRUSTED_PROXY_NETWORKS = settings.trusted_proxy_networks
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    """
+    Dependency for getting the client IP address.
+    
+    X-Real-IP and X-Forwarded-For are only honoured when the direct peer is
+    a trusted proxy (TRUSTED_PROXIES); otherwise anyone could pick the IP
+    they are rate limited under.
+    """
+    peer = request.client.host if request.client else None
+    if not peer or not _is_trusted_proxy(peer):
+        return peer
+    
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip.strip()
+    forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",") if ip.strip()]
+    # The rightmost address not added by one of our proxies is the client
+    for ip in reversed(forwarded):
+        if not _is_trusted_proxy(ip):
+            return ip
+    return forwarded[0] if forwarded else peer
+
+
+def _is_trusted_proxy(ip: str) -> bool:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in network for network in _TRUSTED_PROXY_NETWORKS)
+
+
+async def require_admin_key(
+    x_admin_key: Optional[str] = Header(default=None)
+) -> None:
+    """
+    Dependency guarding admin endpoints with the ADMIN_API_KEY header.
+    Raises 403 if no key is configured or the header does not match.
+    """
+    if not settings.ADMIN_API_KEY or not x_admin_key or not hmac.compare_digest(
+        x_admin_key.encode("utf-8"), settings.ADMIN_API_KEY.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
 
 
 async def get_signup_service(
-    user_repo: UserRepository = Depends(get_user_repository)
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> SignupService:
     """Dependency for getting signup service."""
-    return SignupService(user_repo)
+    return SignupService(uow)
 
 
 async def get_password_reset_service(
-    user_repo: UserRepository = Depends(get_user_repository)
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> PasswordResetService:
     """Dependency for getting password reset service."""
-    return PasswordResetService(user_repo)
+    return PasswordResetService(uow)
+
+
+async def get_token_refresh_service(
+    user_repo: UserRepository = Depends(get_readonly_user_repository)
+) -> TokenRefreshService:
+    """Dependency for getting token refresh service."""
+    return TokenRefreshService(user_repo, refresh_token_store)
+
+
+async def get_last_login_buffer() -> LastLoginBuffer:
+    """Dependency for getting the last_login write-behind buffer."""
+    return last_login_buffer
+
+
+async def get_revocation_store() -> RevocationStore:
+    """Dependency for getting the token revocation store."""
+    return revocation_store
+
+
+async def _verify_access_token(token: str, store: RevocationStore) -> Optional[Dict[str, Any]]:
+    """Return the claims of a valid, unrevoked access token, or None."""
+    claims = JWTManager.verify_token_claims(token)
+    if not claims or not claims.get("sub"):
+        return None
+    # Tokens issued before jti claims were added cannot be revoked
+    jti = claims.get("jti")
+    if jti and await store.is_revoked(jti):
+        return None
+    return claims
 
 
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    user_repo: UserRepository = Depends(get_user_repository)
+    user_repo: UserRepository = Depends(get_readonly_user_repository),
+    store: RevocationStore = Depends(get_revocation_store)
 ) -> Optional[User]:
     """
     Get current user from JWT token (optional).
@@ -62,23 +190,25 @@ async def get_current_user_optional(
         return None
     
     try:
-        user_id = JWTManager.verify_token(credentials.credentials)
-        if not user_id:
+        claims = await _verify_access_token(credentials.credentials, store)
+        if not claims:
             return None
         
-        from uuid import UUID
-        return await user_repo.get_by_id(UUID(user_id))
+        user = await user_repo.get_by_id(UUID(claims["sub"]))
+        if not user or user.token_version != claims.get("ver", 0):
+            return None
+        return user
     except Exception:
         return None
 
 
-async def get_current_user(
+async def get_access_token_claims(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    user_repo: UserRepository = Depends(get_user_repository)
-) -> User:
+    store: RevocationStore = Depends(get_revocation_store)
+) -> Dict[str, Any]:
     """
-    Get current user from JWT token (required).
-    Raises 401 if no token or invalid token.
+    Get the claims of the bearer access token (required).
+    Raises 401 if no token, or the token is invalid, expired or revoked.
     """
     if not credentials:
         raise HTTPException(
@@ -87,21 +217,37 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    claims = await _verify_access_token(credentials.credentials, store)
+    if not claims:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+
+async def get_current_user(
+    claims: Dict[str, Any] = Depends(get_access_token_claims),
+    user_repo: UserRepository = Depends(get_readonly_user_repository)
+) -> User:
+    """
+    Get current user from JWT token (required).
+    Raises 401 if no token or invalid token.
+    """
     try:
-        user_id = JWTManager.verify_token(credentials.credentials)
-        if not user_id:
+        user = await user_repo.get_by_id(UUID(claims["sub"]))
+        if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
+                detail="User not found",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        from uuid import UUID
-        user = await user_repo.get_by_id(UUID(user_id))
-        if not user:
+        if user.token_version != claims.get("ver", 0):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
+                detail="Token is no longer valid",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
@@ -120,4 +266,58 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+
+async def get_current_identity(
+    claims: Dict[str, Any] = Depends(get_access_token_claims),
+    user_repo: UserRepository = Depends(get_readonly_user_repository)
+) -> Identity:
+    """
+    Get the caller's identity from JWT claims (required).
+    
+    Trusts the signed ``act``/``vrf`` claims instead of loading the user;
+    only the user's token version is looked up, and that is served from
+    the token version cache. Raises 401 if the token is invalid, or was
+    issued before the user was deactivated or changed their password.
+    """
+    try:
+        user_id = UUID(claims["sub"])
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Tokens from before token versions existed carry no "ver" and match version 0
+    token_version = claims.get("ver", 0)
+    current_version = await user_repo.get_token_version(user_id)
+    if current_version is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if current_version != token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token is no longer valid",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Tokens are only issued to active users and deactivation bumps the
+    # version, so a matching version without "act" means still active
+    if not claims.get("act", True):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User account is deactivated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return Identity(
+        user_id=user_id,
+        is_active=True,
+        is_verified=bool(claims.get("vrf", False)),
+        token_version=token_version
+    )
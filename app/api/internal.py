@@ -0,0 +1,42 @@
+"""
+Internal API Routes
+
+Operational endpoints for sizing and troubleshooting. These are not part
+of the public API: they require the X-Admin-Key header and are also
+blocked at the reverse proxy.
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import require_admin_key
+
+from app.infrastructure.cache import token_version_cache, user_cache
+from app.infrastructure.db_pool import pool_monitor
+from app.infrastructure.log_pipeline import log_pipeline
+from app.infrastructure.login_tracker import last_login_buffer
+from app.infrastructure.rate_limit import login_throttle
+from app.infrastructure.security import JWTManager, password_hashing_pool
+from app.infrastructure.token_store import refresh_token_store, revocation_store
+
+router = APIRouter(dependencies=[Depends(require_admin_key)])
+
+
+@router.get(
+    "/stats",
+    summary="Runtime statistics",
+    description="Connection pool, hashing pool, cache and buffer metrics for this worker"
+)
+async def runtime_stats():
+    """Get runtime statistics for this worker process."""
+    return {
+        "db_pool": pool_monitor.stats(),
+        "password_hashing": password_hashing_pool.stats(),
+        "user_cache": user_cache.stats(),
+        "token_version_cache": token_version_cache.stats(),
+        "token_cache": JWTManager.token_cache_stats(),
+        "last_login_buffer": last_login_buffer.stats(),
+        "login_throttle": login_throttle.stats(),
+        "token_revocation": revocation_store.stats(),
+        "refresh_tokens": refresh_token_store.stats(),
+        "logging": log_pipeline.stats(),
+    }
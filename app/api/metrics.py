@@ -0,0 +1,27 @@
+"""
+Metrics Route
+
+Prometheus scrape endpoint. Like the internal routes it is not part of
+the public API: it requires the X-Admin-Key header (set it with
+``http_headers`` in the Prometheus scrape config) and is also blocked at
+the reverse proxy.
+"""
+
+from fastapi import APIRouter, Depends, Response
+
+from app.api.dependencies import require_admin_key
+from app.infrastructure.metrics import render_metrics
+
+router = APIRouter(dependencies=[Depends(require_admin_key)])
+
+
+@router.get("/metrics", summary="Prometheus metrics")
+def metrics() -> Response:
+    """
+    Get all metrics in the Prometheus text format.
+
+    Defined without async so that FastAPI runs it in the thread pool:
+    aggregating worker files in multiprocess mode reads from disk.
+    """
+    content, media_type = render_metrics()
+    return Response(content, media_type=media_type)
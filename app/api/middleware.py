@@ -0,0 +1,139 @@
+"""
+ASGI Middleware
+
+Pure ASGI middleware, which avoids the extra task and response buffering
+of Starlette's BaseHTTPMiddleware on every request.
+"""
+
+import re
+import time
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.log_pipeline import request_id_var
+from app.infrastructure.metrics import HTTP_METHODS, HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_PROGRESS
+from app.infrastructure.query_stats import QueryStats, current_query_stats
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# Accepted incoming ids, e.g. the proxy's $request_id; anything else is replaced
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    """
+    Assign each HTTP request a correlation id.
+
+    Uses the X-Request-ID header sent by the reverse proxy when it is
+    present and well-formed, and a random id otherwise. The id is available
+    to log records through ``request_id_var`` while the request is handled
+    and is returned in the X-Request-ID response header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (REQUEST_ID_HEADER.encode(), request_id.encode())
+                ]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per route and requests in progress.
+
+    Latency is labelled with the matched route's path template rather than
+    the request path, which keeps label cardinality bounded; requests that
+    match no API route (404s, docs pages) are labelled "other". Requests in
+    progress are labelled by method only, since the route is not known
+    until the request has been routed.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            # Set on the shared scope by FastAPI's router once a route matched
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method, getattr(route, "path", "other"), str(status)
+            ).observe(time.perf_counter() - started)
+
+
+class QueryStatsMiddleware:
+    """
+    Account the SQL statements each HTTP request runs.
+
+    Sets a fresh QueryStats as ``current_query_stats`` for the request,
+    which the engine's QueryTracker fills in. With ``server_timing`` the
+    response carries a Server-Timing header with the request's query
+    count and DB time, as of when the response starts.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        started = time.perf_counter()
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timing = stats.server_timing(time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_server_timing if self.server_timing else send)
+        finally:
+            current_query_stats.reset(token)
@@ -0,0 +1,73 @@
+"""
+Fast JSON Responses
+
+Response classes that skip FastAPI's generic response path. Returning a
+Pydantic model normally makes FastAPI validate it again against the
+response model, dump it to a dict of JSON-compatible values and then
+encode that dict with the standard library ``json`` module. The classes
+here encode in one step instead:
+
+- ``ModelJSONResponse`` renders a model with its pydantic-core serializer,
+  which is compiled once per model class and writes UUID and datetime
+  fields straight to JSON bytes.
+- ``FastJSONResponse`` renders any other content with orjson when it is
+  installed, and with the standard library otherwise.
+
+Both are enabled by the FAST_JSON_RESPONSES setting.
+"""
+
+from typing import Any, Mapping, Optional, Union
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.infrastructure.config import settings
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - orjson is optional
+    HAS_ORJSON = False
+
+
+class ModelJSONResponse(Response):
+    """Response rendering a Pydantic model with its compiled serializer."""
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson, falling back to the standard library."""
+
+    def render(self, content: Any) -> bytes:
+        if not HAS_ORJSON:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_response(
+    model: BaseModel,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> Union[BaseModel, Response]:
+    """
+    Return a response model through the fast path when it is enabled.
+
+    Routes keep declaring ``response_model`` for the OpenAPI schema. When
+    FAST_JSON_RESPONSES is off the model is returned unchanged and FastAPI
+    serializes it as usual, using the route's own status code.
+
+    Args:
+        model: Response model instance
+        status_code: HTTP status code for the fast path
+        headers: Extra response headers for the fast path
+
+    Returns:
+        A rendered response, or the model itself
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return model
+    return ModelJSONResponse(model, status_code=status_code, headers=headers)
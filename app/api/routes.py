@@ -4,6 +4,9 @@ API Routes Module
 Centralized router configuration and registration.
 """
 
+from app.api.admin import router as admin_router
 from app.api.auth import router as auth_router
+from app.api.internal import router as internal_router
+from app.api.metrics import router as metrics_router
 
-__all__ = ["auth_router"]
\ No newline at end of file
+__all__ = ["admin_router", "auth_router", "internal_router", "metrics_router"]
\ No newline at end of file
@@ -5,7 +5,7 @@ Pydantic models for API request/response validation and serialization.
 """
 
 from pydantic import BaseModel, EmailStr, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -30,6 +30,11 @@ class UserLoginRequest(BaseModel):
     password: str
 
 
+class RefreshTokenRequest(BaseModel):
+    """Request model for exchanging a refresh token."""
+    refresh_token: str
+
+
 class PasswordResetRequest(BaseModel):
     """Request model for password reset initiation."""
     email: EmailStr
@@ -62,6 +67,30 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class UserPageResponse(BaseModel):
+    """Response model for one page of users."""
+    users: List[UserResponse]
+    next_cursor: Optional[str] = None
+
+
+class ImportRejectionResponse(BaseModel):
+    """Response model for a record rejected by an import."""
+    line: int
+    email: Optional[str]
+    reason: str
+
+
+class UserImportResponse(BaseModel):
+    """Response model for a bulk user import."""
+    processed: int
+    imported: int
+    duplicates: int
+    invalid: int
+    elapsed_seconds: float
+    users_per_second: float
+    rejections: List[ImportRejectionResponse]
+
+
 class TokenResponse(BaseModel):
     """Response model for authentication tokens."""
     access_token: str
@@ -2,6 +2,9 @@
 Domain Models
 
 Contains core business entities and value objects following DDD principles.
+
+Models are slotted dataclasses: instances carry no per-instance ``__dict__``,
+which keeps batch jobs that hold many users in memory small.
 """
 
 from dataclasses import dataclass, field
@@ -11,7 +14,7 @@ from uuid import UUID, uuid4
 import re
 
 
-@dataclass
+@dataclass(slots=True)
 class Email:
     """Value object for email addresses with validation."""
     value: str
@@ -21,6 +24,18 @@ class Email:
         if not self._is_valid_email(self.value):
             raise ValueError(f"Invalid email format: {self.value}")
     
+    @classmethod
+    def from_trusted(cls, value: str) -> "Email":
+        """
+        Build an Email from an already normalized and validated address.
+        
+        Skips normalization and validation; only for values that went
+        through ``Email(...)`` before being stored, such as database reads.
+        """
+        email = object.__new__(cls)
+        email.value = value
+        return email
+    
     @staticmethod
     def _is_valid_email(email: str) -> bool:
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -30,7 +45,7 @@ class Email:
         return self.value
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """
     User aggregate root representing a platform user.
@@ -48,6 +63,7 @@ class User:
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
     last_login: Optional[datetime] = None
+    token_version: int = 0
     
     @classmethod
     def create(
@@ -65,10 +81,46 @@ class User:
             last_name=last_name
         )
     
-    def update_login_timestamp(self) -> None:
-        """Update the last login timestamp."""
+    @classmethod
+    def from_trusted(
+        cls,
+        id: UUID,
+        email: str,
+        hashed_password: str,
+        is_active: bool,
+        is_verified: bool,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        created_at: datetime,
+        updated_at: datetime,
+        last_login: Optional[datetime],
+        token_version: int
+    ) -> "User":
+        """
+        Rehydrate a stored user without re-validating it.
+        
+        The email is trusted as stored (see ``Email.from_trusted``). Meant
+        for the infrastructure layer mapping persisted rows.
+        """
+        return cls(
+            id=id,
+            email=Email.from_trusted(email),
+            hashed_password=hashed_password,
+            is_active=is_active,
+            is_verified=is_verified,
+            first_name=first_name,
+            last_name=last_name,
+            created_at=created_at,
+            updated_at=updated_at,
+            last_login=last_login,
+            token_version=token_version
+        )
+    
+    def update_login_timestamp(self) -> datetime:
+        """Update the last login timestamp and return it."""
         self.last_login = datetime.utcnow()
         self.updated_at = datetime.utcnow()
+        return self.last_login
     
     def activate(self) -> None:
         """Activate the user account."""
@@ -76,8 +128,9 @@ class User:
         self.updated_at = datetime.utcnow()
     
     def deactivate(self) -> None:
-        """Deactivate the user account."""
+        """Deactivate the user account and invalidate issued tokens."""
         self.is_active = False
+        self.token_version += 1
         self.updated_at = datetime.utcnow()
     
     def verify_email(self) -> None:
@@ -85,9 +138,18 @@ class User:
         self.is_verified = True
         self.updated_at = datetime.utcnow()
     
-    def update_password(self, new_hashed_password: str) -> None:
-        """Update user password."""
+    def update_password(self, new_hashed_password: str, invalidate_tokens: bool = True) -> None:
+        """
+        Update user password.
+        
+        Args:
+            new_hashed_password: New password hash
+            invalidate_tokens: Invalidate issued tokens; pass False when only
+                re-hashing the same password
+        """
         self.hashed_password = new_hashed_password
+        if invalidate_tokens:
+            self.token_version += 1
         self.updated_at = datetime.utcnow()
     
     def update_profile(
@@ -117,7 +179,22 @@ class User:
         return f"User(id={self.id}, email={self.email})"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class Identity:
+    """
+    Caller identity taken from verified access token claims.
+    
+    Carries only what the token asserts, so it can be used without loading
+    the user. The claims are current as long as ``token_version`` matches
+    the user's, since deactivation and password changes bump it.
+    """
+    user_id: UUID
+    is_active: bool
+    is_verified: bool
+    token_version: int
+
+
+@dataclass(slots=True)
 class PasswordResetToken:
     """Domain model for password reset tokens."""
     token: str
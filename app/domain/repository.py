@@ -5,12 +5,62 @@ Defines the contracts for data persistence following the Repository pattern.
 These interfaces are implemented by the infrastructure layer.
 """
 
+import base64
+import binascii
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Optional, List, Tuple
 from uuid import UUID
 from app.domain.models import User
 
 
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class UserPage:
+    """One page of users in (created_at, id) order."""
+    users: List[User]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+def encode_cursor(user: User) -> str:
+    """
+    Encode the position just after a user as an opaque page cursor.
+    
+    Args:
+        user: Last user on the current page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{user.created_at.isoformat()}|{user.id.hex}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a page cursor.
+    
+    Args:
+        cursor: Cursor produced by ``encode_cursor``
+        
+    Returns:
+        The (created_at, id) position the cursor points after
+        
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        created_at, user_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(hex=user_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor("invalid-cursor")
+
+
 class UserRepository(ABC):
     """
     Repository interface for User aggregate.
@@ -24,6 +74,32 @@ class UserRepository(ABC):
         """Add a new user to the repository."""
         pass
     
+    @abstractmethod
+    async def add_unique(self, user: User) -> bool:
+        """
+        Add a new user unless the email is already registered.
+        
+        Uniqueness is decided by the store in the same operation as the
+        insert, so concurrent registrations cannot both succeed.
+        
+        Returns:
+            True if the user was added, False if the email is taken
+        """
+        pass
+    
+    @abstractmethod
+    async def add_many(self, users: List[User]) -> List[User]:
+        """
+        Add new users in bulk, skipping those whose email is registered.
+        
+        Like ``add_unique``, uniqueness is decided by the store as part of
+        the insert, so concurrent imports and signups cannot collide.
+        
+        Returns:
+            The users that were not added because their email is taken
+        """
+        pass
+    
     @abstractmethod
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Retrieve a user by their ID."""
@@ -40,8 +116,28 @@ class UserRepository(ABC):
         pass
     
     @abstractmethod
-    async def update_password(self, user_id: UUID, hashed_password: str) -> None:
-        """Update a user's password."""
+    async def get_token_version(self, user_id: UUID) -> Optional[int]:
+        """
+        Get a user's current token version.
+        
+        Returns:
+            The version, or None if the user does not exist
+        """
+        pass
+    
+    @abstractmethod
+    async def update_password(
+        self,
+        user_id: UUID,
+        hashed_password: str,
+        invalidate_tokens: bool = True
+    ) -> None:
+        """
+        Update a user's password.
+        
+        Unless ``invalidate_tokens`` is False, the user's token version is
+        bumped so previously issued tokens are rejected.
+        """
         pass
     
     @abstractmethod
@@ -59,6 +155,51 @@ class UserRepository(ABC):
         """List users with optional filtering."""
         pass
     
+    @abstractmethod
+    async def list_users_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> UserPage:
+        """
+        List users in (created_at, id) order, one page at a time.
+        
+        Unlike ``list_users``, each page starts after the position encoded
+        in ``cursor`` rather than at an offset, so deep pages cost the same
+        as the first and rows inserted meanwhile do not shift later pages.
+        
+        Args:
+            limit: Maximum users per page
+            cursor: ``next_cursor`` of the previous page, or None for the first page
+            is_active: Optional active-status filter
+            
+        Returns:
+            The page, with the cursor of the next page if there may be more
+            
+        Raises:
+            InvalidCursor: If the cursor is malformed
+        """
+        pass
+    
+    @abstractmethod
+    def stream_users(
+        self,
+        is_active: Optional[bool] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[User]:
+        """
+        Iterate over every user in (created_at, id) order.
+        
+        Users are fetched ``batch_size`` at a time, so memory stays flat
+        however many users there are. Implementations are async generators.
+        
+        Args:
+            is_active: Optional active-status filter
+            batch_size: Rows fetched from the store per round trip
+        """
+        pass
+    
     @abstractmethod
     async def exists_by_email(self, email: str) -> bool:
         """Check if a user exists with the given email."""
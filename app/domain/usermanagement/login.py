@@ -1,8 +1,10 @@
 # python
 # File: app/domain/usermanagement/login.py
-from app.domain.repository import UserRepository
+from app.domain.repository import UnitOfWork
 from app.domain.models import User
+from app.infrastructure.rate_limit import LoginThrottle
 from app.infrastructure.security import PasswordHasher, JWTManager
+from typing import Any, Dict, Optional
 
 class InvalidCredentials(Exception):
     pass
@@ -10,26 +12,56 @@ class InvalidCredentials(Exception):
 class InactiveAccount(Exception):
     pass
 
+class TooManyAttempts(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__("too-many-attempts")
+        self.retry_after = retry_after
+
+def identity_claims(user: User) -> Dict[str, Any]:
+    """Claims that let access tokens stand in for the user's auth state."""
+    return {
+        "act": user.is_active,
+        "vrf": user.is_verified,
+        "ver": user.token_version,
+    }
+
 class LoginService:
     """
     Domain use-case for authentication.
-    - Verifies credentials.
+    - Throttles attempts per account and client IP before any password check.
+    - Verifies credentials, upgrading outdated hashes in the same unit of work.
+    - Ends the lookup's read transaction before the bcrypt check, so the
+      database connection is not held while hashing; authenticate must
+      therefore run before any other work on the unit.
     - Optionally produces access tokens (delegates to JWTManager).
     """
-    def __init__(self, user_repo: UserRepository):
-        self.user_repo = user_repo
+    def __init__(self, uow: UnitOfWork, throttle: Optional[LoginThrottle] = None):
+        self.uow = uow
+        self.throttle = throttle
 
-    async def authenticate(self, email: str, password: str) -> User:
+    async def authenticate(self, email: str, password: str, client_ip: Optional[str] = None) -> User:
         email_norm = email.strip().lower()
-        user = await self.user_repo.get_by_email(email_norm)
-        if not user or not PasswordHasher.verify(password, user.hashed_password):
+        if self.throttle:
+            attempt = await self.throttle.check(email_norm, client_ip)
+            if not attempt.allowed:
+                raise TooManyAttempts(attempt.retry_after)
+        user = await self.uow.users.get_by_email(email_norm)
+        # Release the pooled connection; the rehash below starts a new transaction
+        await self.uow.rollback()
+        if not user or not await PasswordHasher.verify_async(password, user.hashed_password):
             raise InvalidCredentials("invalid-credentials")
         if not user.is_active:
             raise InactiveAccount("account-inactive")
+        if PasswordHasher.needs_rehash(user.hashed_password):
+            # Upgrade hashes made with an outdated cost factor while we have the plain password
+            new_hash = await PasswordHasher.hash_async(password)
+            await self.uow.users.update_password(user.id, new_hash, invalidate_tokens=False)
+            await self.uow.commit()
+            user.update_password(new_hash, invalidate_tokens=False)
         return user
 
     def create_access_token(self, user: User, expires_minutes: int = None) -> str:
         # JWTManager.create_access_token expects minutes for expires_delta
-        if expires_minutes is None:
-            return JWTManager.create_access_token(str(user.id))
-        return JWTManager.create_access_token(str(user.id), expires_delta=expires_minutes)
+        return JWTManager.create_access_token(
+            str(user.id), expires_delta=expires_minutes, additional_claims=identity_claims(user)
+        )
@@ -1,7 +1,7 @@
 # python
 # File: app/domain/usermanagement/password_reset.py
 from uuid import UUID
-from app.domain.repository import UserRepository
+from app.domain.repository import UnitOfWork
 from app.infrastructure.security import PasswordHasher, JWTManager
 from jose import JWTError
 import re
@@ -19,10 +19,11 @@ class PasswordResetService:
     """
     Domain use-case for password recovery:
     - Generates short-lived reset tokens.
-    - Validates reset token and updates password via repository.
+    - Validates reset token and updates password via repository, looking up
+      the user and writing the new hash in one unit of work.
     """
-    def __init__(self, user_repo: UserRepository):
-        self.user_repo = user_repo
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
 
     @staticmethod
     def _validate_password_strength(password: str) -> None:
@@ -48,10 +49,12 @@ class PasswordResetService:
         except Exception:
             raise InvalidToken("invalid-token")
 
-        user = await self.user_repo.get_by_id(user_uuid)
+        # Hash before the lookup so no transaction is held open during bcrypt
+        self._validate_password_strength(new_password)
+        hashed = await PasswordHasher.hash_async(new_password)
+
+        user = await self.uow.users.get_by_id(user_uuid)
         if not user:
             raise UserNotFound("user-not-found")
-
-        self._validate_password_strength(new_password)
-        hashed = PasswordHasher.hash(new_password)
-        await self.user_repo.update_password(user_uuid, hashed)
+        await self.uow.users.update_password(user_uuid, hashed)
+        await self.uow.commit()
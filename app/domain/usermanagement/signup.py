@@ -1,5 +1,5 @@
-from typing import Protocol
-from app.domain.repository import UserRepository
+from typing import Optional
+from app.domain.repository import UnitOfWork
 from app.domain.models import User
 from app.infrastructure.security import PasswordHasher
 import re
@@ -14,11 +14,12 @@ class SignupService:
     """
     Domain use-case for user signup/registration.
     - Validates password strength.
-    - Ensures email uniqueness via UserRepository.
-    - Hashes password and persists new User.
+    - Hashes password and persists new User, profile included, in one insert.
+    - Ensures email uniqueness via UserRepository.add_unique, so the check
+      and the insert are a single atomic database operation.
     """
-    def __init__(self, user_repo: UserRepository):
-        self.user_repo = user_repo
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
 
     @staticmethod
     def _validate_password_strength(password: str) -> None:
@@ -27,13 +28,18 @@ class SignupService:
         if not re.search(r"[A-Za-z]", password) or not re.search(r"\d", password):
             raise WeakPassword("password-must-contain-letters-and-numbers")
 
-    async def register(self, email: str, password: str) -> User:
+    async def register(
+        self,
+        email: str,
+        password: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None
+    ) -> User:
         email_norm = email.strip().lower()
-        existing = await self.user_repo.get_by_email(email_norm)
-        if existing:
-            raise EmailAlreadyRegistered("email-already-registered")
         self._validate_password_strength(password)
-        hashed = PasswordHasher.hash(password)
-        user = User.create(email=email_norm, hashed_password=hashed)
-        await self.user_repo.add(user)
+        hashed = await PasswordHasher.hash_async(password)
+        user = User.create(email=email_norm, hashed_password=hashed, first_name=first_name, last_name=last_name)
+        if not await self.uow.users.add_unique(user):
+            raise EmailAlreadyRegistered("email-already-registered")
+        await self.uow.commit()
         return user
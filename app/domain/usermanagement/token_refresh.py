@@ -0,0 +1,84 @@
+# python
+# File: app/domain/usermanagement/token_refresh.py
+import time
+import uuid
+from dataclasses import dataclass
+from uuid import UUID
+from app.domain.repository import UserRepository
+from app.domain.models import User
+from app.domain.usermanagement.login import InactiveAccount, identity_claims
+from app.infrastructure.config import settings
+from app.infrastructure.security import JWTManager
+from app.infrastructure.token_store import RefreshTokenStore, RotationOutcome
+
+class InvalidRefreshToken(Exception):
+    pass
+
+class RefreshTokenReused(Exception):
+    pass
+
+@dataclass
+class TokenPair:
+    access_token: str
+    refresh_token: str
+
+class TokenRefreshService:
+    """
+    Domain use-case for extending sessions without a password:
+    - Issues an access/refresh token pair at login, starting a token family.
+    - Exchanges a refresh token for a new pair, rotating the refresh token.
+    - Revokes the family when a superseded refresh token is replayed.
+    """
+    def __init__(self, user_repo: UserRepository, token_store: RefreshTokenStore):
+        self.user_repo = user_repo
+        self.token_store = token_store
+
+    @staticmethod
+    def _create_pair(user: User, family: str, jti: str, expires_at: int) -> TokenPair:
+        return TokenPair(
+            access_token=JWTManager.create_access_token(
+                str(user.id), additional_claims={"fam": family, **identity_claims(user)}
+            ),
+            refresh_token=JWTManager.create_refresh_token(
+                str(user.id),
+                additional_claims={"jti": jti, "fam": family, "exp": expires_at, "ver": user.token_version}
+            ),
+        )
+
+    @staticmethod
+    def _refresh_expiry() -> int:
+        return int(time.time()) + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+    async def issue_tokens(self, user: User) -> TokenPair:
+        family, jti, expires_at = uuid.uuid4().hex, uuid.uuid4().hex, self._refresh_expiry()
+        await self.token_store.issue(family, jti, expires_at)
+        return self._create_pair(user, family, jti, expires_at)
+
+    async def refresh(self, refresh_token: str) -> TokenPair:
+        claims = JWTManager.verify_token_claims(refresh_token, token_type="refresh_token")
+        if not claims or not claims.get("sub") or not claims.get("fam") or not claims.get("jti"):
+            raise InvalidRefreshToken("invalid-refresh-token")
+        family = claims["fam"]
+
+        try:
+            user = await self.user_repo.get_by_id(UUID(claims["sub"]))
+        except ValueError:
+            raise InvalidRefreshToken("invalid-refresh-token")
+        # Tokens from before token versions existed carry no "ver" and match version 0
+        if not user or claims.get("ver", 0) != user.token_version:
+            await self.token_store.revoke_family(family)
+            raise InvalidRefreshToken("invalid-refresh-token")
+        if not user.is_active:
+            await self.token_store.revoke_family(family)
+            raise InactiveAccount("account-inactive")
+
+        jti, expires_at = uuid.uuid4().hex, self._refresh_expiry()
+        outcome = await self.token_store.rotate(family, claims["jti"], jti, expires_at)
+        if outcome is RotationOutcome.REUSED:
+            raise RefreshTokenReused("refresh-token-reused")
+        if outcome is not RotationOutcome.ROTATED:
+            raise InvalidRefreshToken("invalid-refresh-token")
+        return self._create_pair(user, family, jti, expires_at)
+
+    async def revoke_family(self, family: str) -> None:
+        await self.token_store.revoke_family(family)
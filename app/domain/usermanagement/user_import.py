@@ -0,0 +1,195 @@
+# python
+# File: app/domain/usermanagement/user_import.py
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterable, Awaitable, Callable, List, Optional, Set, Union
+from app.domain.repository import UnitOfWork
+from app.domain.models import Email, User
+from app.domain.usermanagement.signup import SignupService, WeakPassword
+from app.infrastructure.security import PasswordHasher
+
+logger = logging.getLogger(__name__)
+
+# Modular crypt format of bcrypt: $2a$/$2b$/$2y$, a cost of 04-31, then 53 salt and hash characters
+BCRYPT_HASH = re.compile(r"^\$2[aby]\$(0[4-9]|[12]\d|3[01])\$[./A-Za-z0-9]{53}$")
+
+# Matches the users table column sizes
+MAX_EMAIL_LENGTH = 255
+MAX_NAME_LENGTH = 100
+
+# Per-record rejections kept in the report; the counters cover every record
+MAX_REPORTED_REJECTIONS = 100
+
+@dataclass
+class ImportRecord:
+    line: int
+    email: Optional[str] = None
+    password: Optional[str] = None
+    password_hash: Optional[str] = None  # Pre-hashed bcrypt value, used instead of password
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    is_verified: bool = False
+    error: Optional[str] = None  # Set by readers for lines that could not be parsed
+
+@dataclass
+class _ValidRecord:
+    record: ImportRecord
+    email: str  # Normalized
+    secret: str  # Plain password, or the bcrypt hash when hashed is set
+    hashed: bool
+
+@dataclass
+class ImportRejection:
+    line: int
+    email: Optional[str]
+    reason: str
+
+@dataclass
+class ImportReport:
+    processed: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    elapsed_seconds: float = 0.0
+    rejections: List[ImportRejection] = field(default_factory=list)
+
+    @property
+    def users_per_second(self) -> float:
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def reject(self, record: ImportRecord, reason: str, duplicate: bool = False) -> None:
+        if duplicate:
+            self.duplicates += 1
+        else:
+            self.invalid += 1
+        if len(self.rejections) < MAX_REPORTED_REJECTIONS:
+            self.rejections.append(ImportRejection(record.line, record.email, reason))
+
+class UserImportService:
+    """
+    Domain use-case for importing users in bulk, e.g. legacy accounts:
+    - Reads records as they stream in and handles them in batches.
+    - Validates each record like signup does; pre-hashed bcrypt values are
+      kept as they are (login upgrades their cost later).
+    - Hashes a batch's plain passwords through ``hash_password``, at most
+      ``hash_concurrency`` at a time when set. Callers sharing a hashing
+      pool with logins should bound it, so a login queues behind at most
+      that many import hashes instead of the whole batch.
+    - Inserts each batch with one ``UserRepository.add_many`` call; emails
+      that are already registered, or repeated in the batch, are counted
+      as duplicates rather than failing the import.
+    - Commits each batch, so a failure part-way keeps earlier batches, and
+      then calls ``progress``.
+    """
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        batch_size: int = 500,
+        hash_password: Callable[[str], Awaitable[str]] = PasswordHasher.hash_async,
+        progress: Optional[Callable[[ImportReport], None]] = None,
+        hash_concurrency: Optional[int] = None
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if hash_concurrency is not None and hash_concurrency < 1:
+            raise ValueError("hash_concurrency must be at least 1")
+        self.uow = uow
+        self.batch_size = batch_size
+        self.hash_password = hash_password
+        self.progress = progress
+        self._hash_slots = asyncio.Semaphore(hash_concurrency) if hash_concurrency else None
+
+    async def import_records(self, records: AsyncIterable[ImportRecord]) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        batch: List[ImportRecord] = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                await self._import_batch(batch, report, started)
+                batch = []
+        if batch:
+            await self._import_batch(batch, report, started)
+
+        logger.info(
+            "User import finished: %d imported, %d duplicates, %d invalid in %.1fs",
+            report.imported, report.duplicates, report.invalid, report.elapsed_seconds
+        )
+        return report
+
+    async def _import_batch(self, records: List[ImportRecord], report: ImportReport, started: float) -> None:
+        accepted: List[_ValidRecord] = []
+        seen: Set[str] = set()
+        for record in records:
+            valid = self._validate(record)
+            if isinstance(valid, str):
+                report.reject(record, valid)
+            elif valid.email in seen:
+                report.reject(record, "duplicate-email-in-batch", duplicate=True)
+            else:
+                seen.add(valid.email)
+                accepted.append(valid)
+
+        hashes = await asyncio.gather(*(self._hash(valid.secret) for valid in accepted if not valid.hashed))
+        hashes_iter = iter(hashes)
+        users: List[User] = []
+        for valid in accepted:
+            user = User.create(
+                email=valid.email,
+                hashed_password=valid.secret if valid.hashed else next(hashes_iter),
+                first_name=valid.record.first_name,
+                last_name=valid.record.last_name
+            )
+            if valid.record.is_verified:
+                user.verify_email()
+            users.append(user)
+
+        skipped = {str(user.email) for user in await self.uow.users.add_many(users)} if users else set()
+        for valid in accepted:
+            if valid.email in skipped:
+                report.reject(valid.record, "email-already-registered", duplicate=True)
+        report.imported += len(users) - len(skipped)
+        report.processed += len(records)
+
+        await self.uow.commit()
+        report.elapsed_seconds = time.perf_counter() - started
+        if self.progress:
+            self.progress(report)
+
+    async def _hash(self, password: str) -> str:
+        if self._hash_slots is None:
+            return await self.hash_password(password)
+        async with self._hash_slots:
+            return await self.hash_password(password)
+
+    @staticmethod
+    def _validate(record: ImportRecord) -> Union[str, _ValidRecord]:
+        """Normalize the record's email; return why it cannot be imported, or its validated values."""
+        if record.error:
+            return record.error
+        if not record.email:
+            return "missing-email"
+        record.email = email = record.email.strip().lower()
+        if len(email) > MAX_EMAIL_LENGTH:
+            return "email-too-long"
+        try:
+            Email(email)
+        except ValueError:
+            return "invalid-email"
+        if any(name and len(name) > MAX_NAME_LENGTH for name in (record.first_name, record.last_name)):
+            return "name-too-long"
+
+        if record.password_hash:
+            if not BCRYPT_HASH.match(record.password_hash):
+                return "invalid-password-hash"
+            return _ValidRecord(record, email, record.password_hash, hashed=True)
+        if not record.password:
+            return "missing-password"
+        try:
+            SignupService._validate_password_strength(record.password)
+        except WeakPassword as e:
+            return str(e)
+        return _ValidRecord(record, email, record.password, hashed=False)
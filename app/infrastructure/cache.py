@@ -0,0 +1,352 @@
+"""
+Caching Infrastructure
+
+Provides an in-process TTL+LRU cache, a two-tier cache of hydrated users
+and a two-tier cache of users' token versions (local memory with an
+optional Redis second tier).
+"""
+
+import copy
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from app.domain.models import User
+from app.infrastructure.config import settings
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache with per-entry expiry.
+
+    Entries expire after ``ttl_seconds`` unless an explicit expiry is given
+    when they are stored. Expired entries are dropped lazily on lookup and the
+    least recently used entry is evicted once the cache is full.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """Get a live entry, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: Optional[float] = None) -> None:
+        """
+        Store an entry.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            expires_at: Absolute expiry on the cache's clock (defaults to now + TTL)
+        """
+        if expires_at is None:
+            expires_at = self._clock() + self.ttl_seconds
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: K) -> None:
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class UserCache:
+    """
+    Two-tier cache of hydrated users keyed by user id.
+
+    The first tier is a per-process TTLCache. When a Redis URL is configured,
+    Redis acts as a shared second tier so workers can fill each other's
+    misses. Invalidations clear both tiers, but other workers' local tiers
+    only catch up when their entries expire, so the TTL bounds staleness.
+    Redis failures are logged and treated as misses.
+
+    Password hashes are never cached: cached users come back with an empty
+    ``hashed_password``, which verifies no password. Credentials are checked
+    against users read from the database (``get_by_email``).
+    """
+
+    KEY_PREFIX = "user:"
+
+    def __init__(self, max_size: int, ttl_seconds: int, redis_url: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self._local: TTLCache[UUID, User] = TTLCache(max_size, ttl_seconds)
+        self._redis: Any = None
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+
+    def _get_redis(self) -> Any:
+        if self._redis is None and self.redis_url:
+            import redis.asyncio as redis
+            self._redis = redis.from_url(self.redis_url)
+        return self._redis
+
+    async def get(self, user_id: UUID) -> Optional[User]:
+        """Get a copy of a cached user, or None on a miss in both tiers."""
+        user = self._local.get(user_id)
+        if user is not None:
+            return copy.copy(user)
+
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            data = await client.get(self.KEY_PREFIX + str(user_id))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("User cache Redis read failed: %s", e)
+            return None
+        if data is None:
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        user = _deserialize_user(data)
+        self._local.set(user_id, user)
+        return copy.copy(user)
+
+    async def set(self, user: User) -> None:
+        """Store a copy of a user, without its password hash, in both tiers."""
+        cached = copy.copy(user)
+        cached.hashed_password = ""
+        self._local.set(user.id, cached)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            await client.set(
+                self.KEY_PREFIX + str(user.id),
+                _serialize_user(cached),
+                ex=self.ttl_seconds
+            )
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("User cache Redis write failed: %s", e)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop a user from both tiers."""
+        self._local.delete(user_id)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            await client.delete(self.KEY_PREFIX + str(user_id))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("User cache Redis invalidation failed: %s", e)
+
+    async def invalidate_many(self, user_ids: Iterable[UUID]) -> None:
+        """Drop several users from both tiers with a single Redis call."""
+        keys = []
+        for user_id in user_ids:
+            self._local.delete(user_id)
+            keys.append(self.KEY_PREFIX + str(user_id))
+        client = self._get_redis()
+        if client is None or not keys:
+            return
+        try:
+            await client.delete(*keys)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("User cache Redis invalidation failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for both tiers."""
+        return {
+            "local": self._local.stats(),
+            "redis": {
+                "enabled": bool(self.redis_url),
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "errors": self.redis_errors,
+            },
+        }
+
+    async def close(self) -> None:
+        """Close the Redis connection, if any."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+class TokenVersionCache:
+    """
+    Two-tier cache of users' current token versions keyed by user id.
+
+    Lets access tokens be checked against the user's token version without
+    loading the user. Writers that bump a version invalidate it here; other
+    workers' local tiers catch up when their entries expire, so the TTL
+    bounds how long a revoked token keeps working on those workers.
+    Redis failures are logged and treated as misses.
+    """
+
+    KEY_PREFIX = "user-version:"
+
+    def __init__(self, max_size: int, ttl_seconds: int, redis_url: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self._local: TTLCache[UUID, int] = TTLCache(max_size, ttl_seconds)
+        self._redis: Any = None
+        self.redis_errors = 0
+
+    def _get_redis(self) -> Any:
+        if self._redis is None and self.redis_url:
+            import redis.asyncio as redis
+            self._redis = redis.from_url(self.redis_url)
+        return self._redis
+
+    async def get(self, user_id: UUID) -> Optional[int]:
+        """Get a cached token version, or None on a miss in both tiers."""
+        version = self._local.get(user_id)
+        if version is not None:
+            return version
+
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            data = await client.get(self.KEY_PREFIX + str(user_id))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Token version cache Redis read failed: %s", e)
+            return None
+        if data is None:
+            return None
+        version = int(data)
+        self._local.set(user_id, version)
+        return version
+
+    async def set(self, user_id: UUID, version: int) -> None:
+        """Store a token version in both tiers."""
+        self._local.set(user_id, version)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            await client.set(self.KEY_PREFIX + str(user_id), version, ex=self.ttl_seconds)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Token version cache Redis write failed: %s", e)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop a token version from both tiers."""
+        self._local.delete(user_id)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            await client.delete(self.KEY_PREFIX + str(user_id))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Token version cache Redis invalidation failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for the local tier."""
+        return {
+            "local": self._local.stats(),
+            "redis": {"enabled": bool(self.redis_url), "errors": self.redis_errors},
+        }
+
+    async def close(self) -> None:
+        """Close the Redis connection, if any."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+def _serialize_user(user: User) -> str:
+    return json.dumps({
+        "id": str(user.id),
+        "email": str(user.email),
+        "is_active": user.is_active,
+        "is_verified": user.is_verified,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "created_at": user.created_at.isoformat(),
+        "updated_at": user.updated_at.isoformat(),
+        "last_login": user.last_login.isoformat() if user.last_login else None,
+        "token_version": user.token_version,
+    })
+
+
+def _deserialize_user(data: Any) -> User:
+    fields = json.loads(data)
+    # Entries are written by _serialize_user from validated users
+    return User.from_trusted(
+        id=UUID(fields["id"]),
+        email=fields["email"],
+        hashed_password="",
+        is_active=fields["is_active"],
+        is_verified=fields["is_verified"],
+        first_name=fields["first_name"],
+        last_name=fields["last_name"],
+        created_at=datetime.fromisoformat(fields["created_at"]),
+        updated_at=datetime.fromisoformat(fields["updated_at"]),
+        last_login=datetime.fromisoformat(fields["last_login"]) if fields["last_login"] else None,
+        token_version=fields.get("token_version", 0),
+    )
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL
+)
+
+token_version_cache = TokenVersionCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL
+)
@@ -5,8 +5,9 @@ Centralized configuration management using environment variables
 with sensible defaults and validation.
 """
 
+import ipaddress
 import os
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import validator
 from pydantic_settings import BaseSettings
 
@@ -28,13 +29,48 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite+aiosqlite:///./ornakala.db"
     DATABASE_ECHO: bool = False
+    # "create_all" creates missing tables at startup and refuses to start if an
+    # existing table lacks a column (development);
+    # "migrations" only checks the Alembic revision (run `python cli.py migrate` first)
+    DATABASE_SCHEMA_MODE: str = "create_all"
+    SLOW_QUERY_MS: float = 200.0  # Statements at least this slow are logged; 0 disables
+    QUERY_REPEAT_WARN_THRESHOLD: int = 10  # DEBUG only: warn when a request repeats a statement more often
+    DB_POOL_SIZE: Optional[int] = None  # None uses the per-dialect default
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
     
     # Security settings
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
+    JWT_BACKEND: str = "native"  # "native" (HS256 only) or "jose"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 60
+    TOKEN_CACHE_SIZE: int = 10000  # Verified-token LRU size, 0 disables
+    REVOCATION_BACKEND: str = "memory"  # Revocations and refresh families: "memory" or "redis"
+    REVOCATION_SYNC_INTERVAL_SECONDS: float = 2.0
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    
+    # Password hashing settings
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_TARGET_MS: Optional[int] = None  # Calibrate rounds at startup when set
+    
+    # Login throttling (checked before bcrypt)
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "redis"
+    LOGIN_RATE_LIMIT_EMAIL_ATTEMPTS: int = 5
+    LOGIN_RATE_LIMIT_IP_ATTEMPTS: int = 20
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+    
+    # Peers whose X-Real-IP / X-Forwarded-For headers are trusted (comma-separated CIDRs)
+    TRUSTED_PROXIES: str = "127.0.0.0/8,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16,::1/128"
+    
+    # Encode hot API responses with compiled Pydantic serializers and orjson
+    FAST_JSON_RESPONSES: bool = True
     
     # CORS settings
     ALLOWED_ORIGINS: List[str] = ["*"]
@@ -50,8 +86,35 @@ class Settings(BaseSettings):
     # Redis settings (for future caching/sessions)
     REDIS_URL: Optional[str] = None
     
-    # Logging
+    # Authenticated-user cache settings
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 30
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = 10  # Bounds how long a revoked token works on other workers
+    
+    # last_login write-behind settings
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS: float = 5.0
+    LAST_LOGIN_FLUSH_THRESHOLD: int = 500
+    
+    # Logging ("json" lines or "text"); written by a background thread
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_INFO_SAMPLE_RATE: float = 1.0  # Fraction of requests whose INFO logs are kept
+    
+    # Prometheus /metrics endpoint and request metrics. /metrics requires ADMIN_API_KEY
+    # (also block it at the proxy).
+    # Multiple workers also need PROMETHEUS_MULTIPROC_DIR in the environment.
+    METRICS_ENABLED: bool = True
+    
+    # Server-Timing response header with each request's DB time and query count.
+    # Off by default: timings and query counts can reveal whether an account exists.
+    SERVER_TIMING_ENABLED: bool = False
+    
+    # Internal endpoints, guarded by ADMIN_API_KEY (also block /internal at the proxy)
+    INTERNAL_STATS_ENABLED: bool = True
+    
+    # Admin API (sent as the X-Admin-Key header; the admin API is disabled when unset)
+    ADMIN_API_KEY: Optional[str] = None
     
     @validator("SECRET_KEY")
     def validate_secret_key(cls, v):
@@ -60,6 +123,61 @@ class Settings(BaseSettings):
                 raise ValueError("Secret key must be changed in production")
         return v
     
+    @validator("DATABASE_SCHEMA_MODE")
+    def validate_database_schema_mode(cls, v):
+        if v not in ("create_all", "migrations"):
+            raise ValueError("DATABASE_SCHEMA_MODE must be 'create_all' or 'migrations'")
+        return v
+    
+    @validator("LOG_FORMAT")
+    def validate_log_format(cls, v):
+        if v not in ("json", "text"):
+            raise ValueError("LOG_FORMAT must be 'json' or 'text'")
+        return v
+    
+    @validator("LOG_INFO_SAMPLE_RATE")
+    def validate_log_info_sample_rate(cls, v):
+        if not 0.0 <= v <= 1.0:
+            raise ValueError("LOG_INFO_SAMPLE_RATE must be between 0 and 1")
+        return v
+    
+    @validator("PASSWORD_HASH_EXECUTOR")
+    def validate_password_hash_executor(cls, v):
+        if v not in ("thread", "process"):
+            raise ValueError("PASSWORD_HASH_EXECUTOR must be 'thread' or 'process'")
+        return v
+    
+    @validator("JWT_BACKEND")
+    def validate_jwt_backend(cls, v):
+        if v not in ("native", "jose"):
+            raise ValueError("JWT_BACKEND must be 'native' or 'jose'")
+        return v
+    
+    @validator("REVOCATION_BACKEND")
+    def validate_revocation_backend(cls, v):
+        if v not in ("memory", "redis"):
+            raise ValueError("REVOCATION_BACKEND must be 'memory' or 'redis'")
+        return v
+    
+    @validator("BCRYPT_ROUNDS")
+    def validate_bcrypt_rounds(cls, v):
+        if not 4 <= v <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+    
+    @validator("LOGIN_RATE_LIMIT_BACKEND")
+    def validate_login_rate_limit_backend(cls, v):
+        if v not in ("memory", "redis"):
+            raise ValueError("LOGIN_RATE_LIMIT_BACKEND must be 'memory' or 'redis'")
+        return v
+    
+    @validator("TRUSTED_PROXIES")
+    def validate_trusted_proxies(cls, v):
+        for network in v.split(","):
+            if network.strip():
+                ipaddress.ip_network(network.strip(), strict=False)
+        return v
+    
     @validator("ALLOWED_ORIGINS", pre=True)
     def parse_cors_origins(cls, v):
         if isinstance(v, str):
@@ -68,6 +186,14 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(",")]
         return v
     
+    @property
+    def trusted_proxy_networks(self) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+        """Get TRUSTED_PROXIES as parsed networks"""
+        return [
+            ipaddress.ip_network(network.strip(), strict=False)
+            for network in self.TRUSTED_PROXIES.split(",") if network.strip()
+        ]
+    
     @property
     def cors_origins(self) -> List[str]:
         """Get CORS origins as a list for FastAPI CORSMiddleware"""
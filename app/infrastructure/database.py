@@ -8,22 +8,43 @@ using SQLAlchemy with async support.
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import Column, String, DateTime, Boolean, Text
+from sqlalchemy import Column, String, DateTime, Boolean, Index, Integer, Text, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.dialects.sqlite import CHAR
 from sqlalchemy.types import TypeDecorator, CHAR
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import uuid
 
 from app.infrastructure.config import settings
+from app.infrastructure.db_pool import engine_options, pool_monitor
+from app.infrastructure.metrics import instrument_engine
+from app.infrastructure.query_stats import QueryTracker
+
+# Alembic revision the models in this module correspond to (migrations/versions).
+# Bump it together with every new migration.
+SCHEMA_REVISION = "0003"
 
 # SQLAlchemy setup
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
-    future=True
+    # Keep bound values (emails, password hashes) out of error messages and logs
+    hide_parameters=not settings.DEBUG,
+    future=True,
+    **engine_options(settings)
+)
+pool_monitor.attach(engine.sync_engine)
+instrument_engine(engine.sync_engine)
+
+# Per-request query counts and DB time, slow-query log, N+1 warnings in debug
+query_tracker = QueryTracker(
+    slow_query_seconds=settings.SLOW_QUERY_MS / 1000 if settings.SLOW_QUERY_MS else None,
+    repeat_threshold=settings.QUERY_REPEAT_WARN_THRESHOLD if settings.DEBUG else 0
 )
+query_tracker.attach(engine.sync_engine)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -31,6 +52,16 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Read-only sessions run in autocommit mode (supported by both the SQLite and
+# PostgreSQL drivers), so plain SELECTs issue no BEGIN/COMMIT round trips.
+# Statements autocommit individually: never write through these sessions.
+ReadOnlySessionLocal = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 Base = declarative_base()
 
 
@@ -83,6 +114,38 @@ class UserModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     last_login = Column(DateTime, nullable=True)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    __table_args__ = (
+        # Keyset pagination order for list_users_page
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
+
+class SchemaOutOfDate(RuntimeError):
+    """Raised when the database schema is not at SCHEMA_REVISION."""
+    pass
+
+
+def _create_missing_tables(connection: Connection) -> None:
+    """
+    Create missing tables and check existing ones have every model column.
+    
+    Raises:
+        SchemaOutOfDate: If an existing table lacks a column
+    """
+    Base.metadata.create_all(connection)
+    inspector = inspect(connection)
+    missing: List[str] = []
+    for table in Base.metadata.sorted_tables:
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        missing.extend(f"{table.name}.{column.name}" for column in table.columns if column.name not in present)
+    if missing:
+        raise SchemaOutOfDate(
+            f"Database is missing columns {', '.join(missing)}, which create_all cannot add; "
+            f"run `python cli.py migrate` (first `alembic stamp 0001` for databases created "
+            f"before migrations) and start with DATABASE_SCHEMA_MODE=migrations"
+        )
 
 
 class DatabaseManager:
@@ -90,9 +153,43 @@ class DatabaseManager:
     
     @staticmethod
     async def initialize():
-        """Initialize database and create tables."""
+        """
+        Initialize the database according to DATABASE_SCHEMA_MODE.
+        
+        In "create_all" mode missing tables are created, which inspects every
+        table on each boot, and startup fails if an existing table is behind
+        the models. In "migrations" mode Alembic owns the schema and startup
+        only checks the stored revision with a single query.
+        
+        Raises:
+            SchemaOutOfDate: If the schema is behind the models
+        """
+        if settings.DATABASE_SCHEMA_MODE == "migrations":
+            await DatabaseManager.verify_schema()
+            return
         async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_missing_tables)
+    
+    @staticmethod
+    async def verify_schema():
+        """
+        Check that the database was migrated to SCHEMA_REVISION.
+        
+        Raises:
+            SchemaOutOfDate: If the revision is missing or different
+        """
+        try:
+            async with engine.connect() as conn:
+                result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+                revisions = set(result.scalars())
+        except DBAPIError:
+            revisions = set()
+        if revisions != {SCHEMA_REVISION}:
+            found = ", ".join(sorted(revisions)) or "none"
+            raise SchemaOutOfDate(
+                f"Database schema revision is {found}, expected {SCHEMA_REVISION}; "
+                f"run `python cli.py migrate`"
+            )
     
     @staticmethod
     async def close():
@@ -115,4 +212,18 @@ async def get_db_session() -> AsyncSession:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_readonly_db_session() -> AsyncSession:
+    """
+    Dependency for getting a read-only database session.
+    
+    The session never flushes or commits; use it only for endpoints that
+    read data.
+    
+    Yields:
+        Autocommit database session that automatically closes after use
+    """
+    async with ReadOnlySessionLocal() as session:
+        yield session
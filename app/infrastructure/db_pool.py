@@ -0,0 +1,168 @@
+"""
+Database Connection Pool
+
+Builds engine pool options from settings with per-dialect defaults and
+instruments the pool so checkout pressure is visible.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.infrastructure.config import Settings
+from app.infrastructure.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT_SECONDS,
+    DB_POOL_CONNECTS,
+    DB_POOL_INVALIDATIONS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+)
+
+# Defaults for server databases; sized for a few workers per 1 GB container
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+
+class PoolMonitor:
+    """
+    Collects connection pool metrics.
+
+    Checkout/checkin/connect/invalidate counts come from SQLAlchemy pool
+    events. Checkout wait time and timeouts are recorded by
+    InstrumentedAsyncQueuePool, since no event fires before a checkout
+    starts waiting. Every event also updates the Prometheus pool metrics.
+    """
+
+    def __init__(self) -> None:
+        self._engine: Optional[Engine] = None
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def attach(self, engine: Engine) -> None:
+        """Register pool event listeners through an engine (survives dispose)."""
+        self._engine = engine
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        if isinstance(engine.pool, QueuePool):
+            DB_POOL_SIZE.set(engine.pool.size())
+
+    @property
+    def pool(self) -> Optional[Pool]:
+        """The monitored engine's current pool."""
+        return self._engine.pool if self._engine else None
+
+    def _on_checkout(self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+        DB_POOL_CHECKED_OUT.inc()
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.checkins += 1
+        self.checked_out = max(0, self.checked_out - 1)
+        DB_POOL_CHECKED_OUT.dec()
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.connects += 1
+        DB_POOL_CONNECTS.inc()
+
+    def _on_invalidate(self, dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        self.invalidations += 1
+        DB_POOL_INVALIDATIONS.inc()
+
+    def record_wait(self, seconds: float) -> None:
+        """Record how long a checkout waited for a connection."""
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+        DB_POOL_CHECKOUT_WAIT_SECONDS.observe(seconds)
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up waiting."""
+        self.timeouts += 1
+        DB_POOL_TIMEOUTS.inc()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get a snapshot of the pool metrics."""
+        pool = self.pool
+        stats: Dict[str, Any] = {
+            "pool_class": type(pool).__name__ if pool else None,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "avg_checkout_wait_ms": (
+                self.total_wait_seconds / self.checkouts * 1000 if self.checkouts else 0.0
+            ),
+            "max_checkout_wait_ms": self.max_wait_seconds * 1000,
+        }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "timeout_seconds": pool.timeout(),
+            })
+        return stats
+
+
+pool_monitor = PoolMonitor()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that reports checkout wait time and timeouts."""
+
+    def connect(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_monitor.record_timeout()
+            raise
+        finally:
+            pool_monitor.record_wait(time.perf_counter() - started)
+
+
+def engine_options(settings: Settings) -> Dict[str, Any]:
+    """
+    Build pool keyword arguments for create_async_engine.
+
+    SQLite keeps the pool its dialect chooses, unsized and uninstrumented:
+    StaticPool for in-memory databases and, for files, NullPool with the
+    pinned SQLAlchemy 2.0.23 or AsyncAdaptedQueuePool with later releases
+    of the aiosqlite dialect. Server databases get an instrumented queue
+    pool sized from settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Keyword arguments for create_async_engine
+    """
+    if make_url(settings.DATABASE_URL).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else DEFAULT_POOL_SIZE,
+        "max_overflow": (
+            settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else DEFAULT_MAX_OVERFLOW
+        ),
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
@@ -0,0 +1,110 @@
+"""
+Import File Readers
+
+Turns streamed NDJSON or CSV input into user import records one line at
+a time, so files of any size are read in constant memory.
+
+Recognized fields: email, password, password_hash, first_name, last_name
+and is_verified. CSV input needs a header row naming its columns; quoted
+fields must not span lines.
+"""
+
+import csv
+import json
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Optional
+
+from app.domain.usermanagement.user_import import ImportRecord
+
+IMPORT_FORMATS = ("ndjson", "csv")
+_TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+async def aiter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of byte chunks, such as a request body, into text lines.
+    
+    Args:
+        chunks: UTF-8 encoded chunks split at arbitrary points
+        
+    Yields:
+        Lines without their line terminators
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+    if pending:
+        yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+async def aiter_file_lines(lines: Iterable[str]) -> AsyncIterator[str]:
+    """Adapt a synchronous line iterable, such as an open file, to async iteration."""
+    for line in lines:
+        yield line.rstrip("\r\n")
+
+
+def _to_record(line: int, fields: Dict[str, object]) -> ImportRecord:
+    def text(name: str) -> Optional[str]:
+        value = fields.get(name)
+        return str(value) if value not in (None, "") else None
+    
+    is_verified = fields.get("is_verified")
+    if not isinstance(is_verified, bool):
+        is_verified = str(is_verified or "").strip().lower() in _TRUE_VALUES
+    return ImportRecord(
+        line=line,
+        email=text("email"),
+        password=text("password"),
+        password_hash=text("password_hash"),
+        first_name=text("first_name"),
+        last_name=text("last_name"),
+        is_verified=is_verified
+    )
+
+
+async def read_import_records(lines: AsyncIterable[str], import_format: str) -> AsyncIterator[ImportRecord]:
+    """
+    Parse import lines into records.
+    
+    Blank lines are skipped. Lines that cannot be parsed become records
+    with ``error`` set, so they are reported rather than aborting the import.
+    
+    Args:
+        lines: Input lines
+        import_format: "ndjson" or "csv"
+        
+    Yields:
+        One record per data line, numbered from 1 as in the input
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f"import_format must be one of {', '.join(IMPORT_FORMATS)}")
+    
+    header = None
+    number = 0
+    async for line in lines:
+        number += 1
+        if not line.strip():
+            continue
+        
+        if import_format == "ndjson":
+            try:
+                fields = json.loads(line)
+            except ValueError:
+                yield ImportRecord(line=number, error="malformed-json")
+                continue
+            if not isinstance(fields, dict):
+                yield ImportRecord(line=number, error="malformed-json")
+                continue
+            yield _to_record(number, fields)
+            continue
+        
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            continue
+        if len(values) != len(header):
+            yield ImportRecord(line=number, error="wrong-column-count")
+            continue
+        yield _to_record(number, dict(zip(header, values)))
@@ -0,0 +1,166 @@
+"""
+JWT Backends
+
+Encoding/decoding strategies used by JWTManager. The native HS256 backend
+is a lean implementation built on the standard library; python-jose is kept
+as the compatibility backend for other algorithms. Both raise python-jose's
+exception types, so callers can catch ``JWTError`` regardless of backend.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, cast
+
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+
+class JWTBackend(ABC):
+    """Interface for encoding and verifying signed JWTs."""
+
+    name: str = ""
+
+    @abstractmethod
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """
+        Sign claims into a compact JWT.
+
+        Args:
+            claims: JSON-serializable claims (timestamps as epoch seconds)
+
+        Returns:
+            Encoded JWT token string
+        """
+        pass
+
+    @abstractmethod
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a JWT and return its claims.
+
+        Args:
+            token: Encoded JWT token string
+
+        Returns:
+            Decoded claims
+
+        Raises:
+            ExpiredSignatureError: If the token is expired
+            JWTError: If the token is malformed or the signature is invalid
+        """
+        pass
+
+
+class JoseJWTBackend(JWTBackend):
+    """python-jose backed implementation supporting all of its algorithms."""
+
+    name = "jose"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return cast(str, jwt.encode(claims, self.secret_key, algorithm=self.algorithm))
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        return cast(Dict[str, Any], jwt.decode(token, self.secret_key, algorithms=[self.algorithm]))
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HS256JWTBackend(JWTBackend):
+    """
+    Minimal HS256 implementation.
+
+    The HMAC key schedule and the encoded header are computed once, and
+    timestamps are plain integers, so each operation is a JSON dump/load,
+    a base64 pass and one HMAC. Tokens are interchangeable with python-jose.
+    """
+
+    name = "native"
+
+    def __init__(self, secret_key: str):
+        self._mac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+        self._header = _b64encode(
+            json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode()
+        )
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = self._header + b"." + payload
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            signing_input, _, signature = token.encode("ascii").rpartition(b".")
+            header, _, payload = signing_input.partition(b".")
+            if not header or not payload:
+                raise JWTError("Not enough segments")
+            if header != self._header:
+                # Tokens from other encoders may order or space the header differently
+                header_claims = json.loads(_b64decode(header))
+                if not isinstance(header_claims, dict) or header_claims.get("alg") != "HS256":
+                    raise JWTError("The specified alg value is not allowed")
+            if not hmac.compare_digest(self._sign(signing_input), _b64decode(signature)):
+                raise JWTError("Signature verification failed.")
+            claims = json.loads(_b64decode(payload))
+        except (UnicodeError, binascii.Error, ValueError) as e:
+            raise JWTError("Invalid token") from e
+
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload")
+        self._validate_times(claims)
+        return claims
+
+    @staticmethod
+    def _validate_times(claims: Dict[str, Any]) -> None:
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise JWTClaimsError("Expiration Time claim (exp) must be an integer.")
+            if exp < now:
+                raise ExpiredSignatureError("Signature has expired.")
+        nbf = claims.get("nbf")
+        if nbf is not None:
+            if not isinstance(nbf, (int, float)):
+                raise JWTClaimsError("Not Before claim (nbf) must be an integer.")
+            if nbf > now:
+                raise JWTClaimsError("The token is not yet valid (nbf)")
+
+
+def create_jwt_backend(name: str, secret_key: str, algorithm: str) -> JWTBackend:
+    """
+    Build the configured JWT backend.
+
+    The native backend only implements HS256; any other algorithm is
+    served by python-jose.
+
+    Args:
+        name: Backend name ("native" or "jose")
+        secret_key: Signing key
+        algorithm: JWS algorithm
+
+    Returns:
+        JWT backend instance
+    """
+    if name == "native" and algorithm == "HS256":
+        return HS256JWTBackend(secret_key)
+    return JoseJWTBackend(secret_key, algorithm)
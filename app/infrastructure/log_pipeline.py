@@ -0,0 +1,196 @@
+"""
+Log Pipeline
+
+Queue-based logging: records are filtered and enqueued on the thread that
+logs them, and formatted and written by a background listener thread, so
+request handlers never format messages or block on log I/O.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, TextIO
+
+import structlog
+from structlog.typing import EventDict, Processor, WrappedLogger
+
+# Correlation id of the request being handled, set by RequestIdMiddleware
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+# Loggers that uvicorn gives their own synchronous handlers
+SERVER_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Attach the current request id to records and sample request logs.
+
+    Runs on the logging thread, before a record is enqueued. Records at
+    INFO and below that belong to a request are kept with probability
+    ``sample_rate``; the decision is derived from the request id, so a
+    sampled request keeps all of its records. Warnings, errors and records
+    logged outside requests are always kept.
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = request_id_var.get()
+        record.request_id = request_id or "-"
+        if request_id is None or record.levelno > logging.INFO or self.sample_rate >= 1.0:
+            return True
+        if zlib.crc32(request_id.encode()) / 2**32 < self.sample_rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records unformatted.
+
+    The standard handler merges the arguments into the message before
+    enqueueing; here that is left to the listener thread's formatter.
+    Arguments are rendered when the record is written, so they must not
+    be mutated after logging.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _add_record_timestamp(logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+    """Timestamp an event with the time it was logged rather than written."""
+    record = event_dict.get("_record")
+    if record is not None:
+        event_dict["timestamp"] = datetime.fromtimestamp(record.created, timezone.utc).isoformat()
+    return event_dict
+
+
+def _drop_color_message(logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+    """Drop the ANSI-colored copy of the message that uvicorn adds to its records."""
+    event_dict.pop("color_message", None)
+    return event_dict
+
+
+def json_formatter() -> logging.Formatter:
+    """
+    Formatter rendering standard library records as one JSON object per line.
+
+    Each object has ``event`` (the formatted message), ``level``, ``logger``,
+    ``timestamp`` and ``request_id``, plus any ``extra`` fields.
+    """
+    pre_chain: List[Processor] = [
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.ExtraAdder(),
+        _drop_color_message,
+        _add_record_timestamp,
+    ]
+    processors: List[Processor] = [
+        structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+        structlog.processors.format_exc_info,
+        structlog.processors.JSONRenderer(),
+    ]
+    return structlog.stdlib.ProcessorFormatter(foreign_pre_chain=pre_chain, processors=processors)
+
+
+class LogPipeline:
+    """
+    Routes log records through a queue to a background writer thread.
+
+    ``install`` puts a DeferredQueueHandler on the root logger; the caller
+    only pays for the level check, the request filter and a queue put. A
+    QueueListener thread formats each record (JSON or text) and writes it
+    to ``stream``. The queue is unbounded, so a slow stream delays output
+    rather than requests.
+    """
+
+    def __init__(self) -> None:
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.request_filter = RequestContextFilter()
+        self.handler = DeferredQueueHandler(self.queue)
+        self.handler.addFilter(self.request_filter)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+
+    def install(
+        self,
+        level: str = "INFO",
+        log_format: str = "json",
+        sample_rate: float = 1.0,
+        stream: Optional[TextIO] = None,
+        logger: Optional[logging.Logger] = None
+    ) -> None:
+        """
+        Start the writer thread and attach the queue handler.
+
+        Calling it again replaces the previous configuration.
+
+        Args:
+            level: Minimum level of ``logger``
+            log_format: "json" or "text"
+            sample_rate: Fraction of requests whose INFO records are kept
+            stream: Output stream (default: stderr)
+            logger: Logger to attach to (default: the root logger)
+        """
+        self.stop()
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(json_formatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+        self.request_filter.sample_rate = sample_rate
+
+        target = logger or logging.getLogger()
+        target.setLevel(level)
+        if self.handler not in target.handlers:
+            target.addHandler(self.handler)
+
+        self._listener = logging.handlers.QueueListener(self.queue, output, respect_handler_level=True)
+        self._listener.start()
+
+    def route_server_loggers(self) -> None:
+        """Send uvicorn's records, including access logs, through the pipeline."""
+        for name in SERVER_LOGGERS:
+            server_logger = logging.getLogger(name)
+            server_logger.handlers.clear()
+            server_logger.propagate = True
+
+    def stop(self) -> None:
+        """Write the queued records and stop the writer thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def stats(self) -> Dict[str, int]:
+        """Get pipeline statistics."""
+        return {
+            "queued": self.queue.qsize(),
+            "sampled_out": self.request_filter.sampled_out,
+        }
+
+
+log_pipeline = LogPipeline()
+
+
+def configure_logging(settings: Any) -> None:
+    """
+    Configure application logging from settings.
+
+    Installs the log pipeline on the root logger with LOG_LEVEL, LOG_FORMAT
+    and LOG_INFO_SAMPLE_RATE, routes uvicorn's loggers through it, and
+    drains the queue when the process exits.
+
+    Args:
+        settings: Application settings
+    """
+    log_pipeline.install(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_INFO_SAMPLE_RATE)
+    log_pipeline.route_server_loggers()
+    atexit.register(log_pipeline.stop)
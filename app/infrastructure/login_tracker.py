@@ -0,0 +1,169 @@
+"""
+Last Login Tracking
+
+Write-behind buffer that persists users' last_login timestamps in
+batches, keeping per-login writes off the request path.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infrastructure.cache import UserCache, user_cache
+from app.infrastructure.config import settings
+from app.infrastructure.database import AsyncSessionLocal, UserModel
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on ids per UPDATE statement, keeps the CASE expression bounded
+MAX_BATCH_SIZE = 1000
+
+
+class LastLoginBuffer:
+    """
+    Write-behind buffer for last_login timestamps.
+
+    Logins record ``(user_id, timestamp)`` pairs in memory, keeping only the
+    latest timestamp per user. A background task flushes the buffer every
+    ``flush_interval`` seconds, or as soon as ``flush_threshold`` users are
+    pending, as one bulk UPDATE per batch. Timestamps still buffered when the
+    process dies without a clean shutdown are lost, which is acceptable for
+    last_login.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_interval: float,
+        flush_threshold: int,
+        cache: Optional[UserCache] = None
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.cache = cache
+        self._pending: Dict[UUID, datetime] = {}
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def record(self, user_id: UUID, timestamp: datetime) -> None:
+        """Buffer a login, keeping only the latest timestamp per user."""
+        previous = self._pending.get(user_id)
+        if previous is None or timestamp > previous:
+            self._pending[user_id] = timestamp
+        if len(self._pending) >= self.flush_threshold and self._flush_requested:
+            self._flush_requested.set()
+
+    async def flush(self) -> int:
+        """
+        Write all buffered timestamps to the database.
+
+        Returns:
+            Number of users written
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            started = time.perf_counter()
+            try:
+                async with self.session_factory() as session:
+                    items = list(pending.items())
+                    for offset in range(0, len(items), MAX_BATCH_SIZE):
+                        await session.execute(self._bulk_update(items[offset:offset + MAX_BATCH_SIZE]))
+                    await session.commit()
+            except Exception as e:
+                self.failed_flushes += 1
+                # Put the batch back without overwriting newer logins
+                for user_id, timestamp in pending.items():
+                    self.record(user_id, timestamp)
+                logger.error("Failed to flush last_login buffer: %s", e)
+                return 0
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flushes += 1
+            self.flushed_rows += len(pending)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+
+        if self.cache:
+            await self.cache.invalidate_many(pending.keys())
+        return len(pending)
+
+    @staticmethod
+    def _bulk_update(items: Iterable[Tuple[UUID, datetime]]) -> Any:
+        """Build one UPDATE that sets each user's last_login via CASE."""
+        items = list(items)
+        # Comparisons against the column bind ids through its GUID type
+        last_login = case(*[(UserModel.id == user_id, timestamp) for user_id, timestamp in items])
+        return (
+            update(UserModel)
+            .where(UserModel.id.in_([user_id for user_id, _ in items]))
+            .values(last_login=last_login)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _run(self, flush_requested: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            flush_requested.clear()
+            # Shielded so stop() cannot cancel a batch halfway through
+            await asyncio.shield(self.flush())
+
+    def start(self) -> None:
+        """Start the periodic flush task on the running event loop."""
+        if self._task is None:
+            self._flush_requested = asyncio.Event()
+            self._lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run(self._flush_requested))
+
+    async def stop(self) -> None:
+        """Stop the flush task and drain the buffer."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self._flush_requested = None
+        self._lock = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get buffer size and flush metrics."""
+        return {
+            "buffered": len(self._pending),
+            "flush_interval_seconds": self.flush_interval,
+            "flush_threshold": self.flush_threshold,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+        }
+
+
+last_login_buffer = LastLoginBuffer(
+    session_factory=AsyncSessionLocal,
+    flush_interval=settings.LAST_LOGIN_FLUSH_INTERVAL_SECONDS,
+    flush_threshold=settings.LAST_LOGIN_FLUSH_THRESHOLD,
+    cache=user_cache if settings.USER_CACHE_ENABLED else None
+)
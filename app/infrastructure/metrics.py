@@ -0,0 +1,154 @@
+"""
+Prometheus Metrics
+
+Metric definitions for HTTP requests, database statements, the connection
+pool, cryptographic operations and the login throttle, and their text
+exposition for /metrics.
+
+With several worker processes, export PROMETHEUS_MULTIPROC_DIR (an empty
+directory shared by the workers) in the environment before they start.
+Each worker then writes its samples to memory-mapped files there, and
+/metrics aggregates all workers whichever one serves the scrape.
+"""
+
+import os
+import time
+from typing import Any, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Latency buckets in seconds, from cached reads up to bcrypt-bound requests
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+CRYPTO_BUCKETS = (0.00005, 0.0001, 0.00025, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+DB_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "OTHER")
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], buckets=REQUEST_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled",
+    ["method"], multiprocess_mode="livesum"
+)
+
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds", "Database statement latency",
+    ["operation"], buckets=DB_BUCKETS
+)
+DB_STATEMENT_ERRORS = Counter(
+    "db_statement_errors_total", "Database statements that raised", ["operation"]
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured connections per pool (without overflow)", multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Connections checked out of the pool", multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pool connection", buckets=DB_BUCKETS
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up waiting for a connection")
+DB_POOL_CONNECTS = Counter("db_pool_connections_opened_total", "New database connections opened")
+DB_POOL_INVALIDATIONS = Counter("db_pool_invalidations_total", "Pooled connections invalidated")
+
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds", "bcrypt time per operation in the hashing pool",
+    ["operation"], buckets=CRYPTO_BUCKETS
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "password_hash_queue_wait_seconds", "Time spent waiting for a hashing pool slot",
+    buckets=REQUEST_BUCKETS
+)
+
+JWT_SECONDS = Histogram(
+    "jwt_duration_seconds", "JWT signing and verification time",
+    ["operation"], buckets=CRYPTO_BUCKETS
+)
+# Bound once; labels() takes a lock and a dict lookup per call
+JWT_ENCODE_SECONDS = JWT_SECONDS.labels("encode")
+JWT_DECODE_SECONDS = JWT_SECONDS.labels("decode")
+
+LOGIN_ATTEMPTS = Counter(
+    "login_attempts_total", "Login attempts by login throttle decision", ["outcome"]
+)
+LOGIN_ADMITTED = LOGIN_ATTEMPTS.labels("admitted")
+LOGIN_REJECTED_BY_EMAIL = LOGIN_ATTEMPTS.labels("rejected_by_email")
+LOGIN_REJECTED_BY_IP = LOGIN_ATTEMPTS.labels("rejected_by_ip")
+
+_STATEMENT_SECONDS = {operation: DB_STATEMENT_SECONDS.labels(operation) for operation in DB_OPERATIONS}
+
+
+def statement_operation(statement: str) -> str:
+    """Classify a SQL statement by its leading keyword."""
+    keyword = statement.lstrip()[:6].upper()
+    return keyword if keyword in _STATEMENT_SECONDS else "OTHER"
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    started = conn.info["metrics_started"].pop()
+    _STATEMENT_SECONDS[statement_operation(statement)].observe(time.perf_counter() - started)
+
+
+def _on_error(exception_context: Any) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("metrics_started"):
+        connection.info["metrics_started"].pop()
+    DB_STATEMENT_ERRORS.labels(statement_operation(exception_context.statement or "")).inc()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement an engine executes.
+
+    Args:
+        engine: Sync engine (``AsyncEngine.sync_engine`` for async engines)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _on_error)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        Exposition body and its content type
+    """
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_stopped() -> None:
+    """Drop this worker's live gauges from the multiprocess aggregation."""
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(os.getpid())
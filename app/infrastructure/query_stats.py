@@ -0,0 +1,113 @@
+"""
+Query Statistics
+
+Per-request SQL accounting from SQLAlchemy cursor events: statement count
+and database time for the Server-Timing header, a slow-query log, and a
+warning for statements repeated within one request (likely N+1 queries).
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text written to the log
+MAX_LOGGED_STATEMENT_LENGTH = 1000
+
+
+@dataclass
+class QueryStats:
+    """Statements run while handling one request."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    # Executions per statement text, kept only when repeats are tracked
+    shapes: Dict[str, int] = field(default_factory=dict)
+
+    def server_timing(self, total_seconds: float) -> str:
+        """
+        Format the stats as a Server-Timing header value.
+
+        Args:
+            total_seconds: Time spent handling the request so far
+
+        Returns:
+            Header value with "db" and "app" metrics in milliseconds
+        """
+        return (
+            f'db;dur={self.total_seconds * 1000:.2f};desc="{self.count} queries", '
+            f"app;dur={total_seconds * 1000:.2f}"
+        )
+
+
+# Stats of the request being handled, set by QueryStatsMiddleware
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _truncate(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > MAX_LOGGED_STATEMENT_LENGTH:
+        return statement[:MAX_LOGGED_STATEMENT_LENGTH] + "..."
+    return statement
+
+
+class QueryTracker:
+    """
+    Times every statement an engine executes.
+
+    Each statement is added to the current request's QueryStats, when
+    there is one. Statements slower than ``slow_query_seconds`` are logged
+    as warnings, with their SQL but never their parameters. When
+    ``repeat_threshold`` is set, a request that runs the same statement
+    text more than that many times logs one warning for it; statement
+    texts carry placeholders, so the same text is the same query shape.
+    """
+
+    def __init__(self, slow_query_seconds: Optional[float] = None, repeat_threshold: int = 0):
+        self.slow_query_seconds = slow_query_seconds
+        self.repeat_threshold = repeat_threshold
+        self.slow_queries = 0
+
+    def attach(self, engine: Engine) -> None:
+        """Register the cursor event listeners on a (sync) engine."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _before_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        if self.slow_query_seconds and elapsed >= self.slow_query_seconds:
+            self.slow_queries += 1
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, _truncate(statement))
+
+        stats = current_query_stats.get()
+        if stats is None:
+            return
+        stats.count += 1
+        stats.total_seconds += elapsed
+        if self.repeat_threshold:
+            repeats = stats.shapes.get(statement, 0) + 1
+            stats.shapes[statement] = repeats
+            if repeats == self.repeat_threshold + 1:
+                logger.warning(
+                    "Possible N+1 query, statement repeated more than %d times in one request: %s",
+                    self.repeat_threshold, _truncate(statement)
+                )
+
+    def _on_error(self, exception_context: Any) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
@@ -0,0 +1,254 @@
+"""
+Rate Limiting
+
+Per-key attempt limiters with an in-memory token bucket backend and a
+Redis sliding-window backend, and the login throttle built on them.
+"""
+
+import hashlib
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.infrastructure.config import Settings, settings
+from app.infrastructure.metrics import LOGIN_ADMITTED, LOGIN_REJECTED_BY_EMAIL, LOGIN_REJECTED_BY_IP
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of an attempt against a limiter."""
+    allowed: bool
+    retry_after: float = 0.0  # Seconds until the next attempt would be allowed
+
+
+class RateLimiter(ABC):
+    """Allows up to ``limit`` attempts per key within ``window_seconds``."""
+
+    name: str = "abstract"
+
+    def __init__(self, limit: int, window_seconds: float):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    async def hit(self, key: str) -> RateLimitResult:
+        """Record an attempt for a key if it is within the limit."""
+        pass
+
+    async def close(self) -> None:
+        """Release connections."""
+        pass
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """
+    Token bucket per key held in process memory.
+
+    Each bucket holds up to ``limit`` tokens and refills continuously at
+    ``limit / window_seconds`` tokens per second, so bursts up to the limit
+    are allowed and the sustained rate is the limit per window. At most
+    ``max_keys`` buckets are kept; the least recently used are dropped
+    first, which at worst forgives a key's past attempts.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: float,
+        max_keys: int = 100000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        super().__init__(limit, window_seconds)
+        self.max_keys = max_keys
+        self.refill_per_second = limit / window_seconds
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str) -> RateLimitResult:
+        now = self._clock()
+        tokens, updated_at = self._buckets.get(key, (float(self.limit), now))
+        tokens = min(float(self.limit), tokens + (now - updated_at) * self.refill_per_second)
+
+        if tokens >= 1:
+            tokens -= 1
+            result = RateLimitResult(allowed=True)
+        else:
+            result = RateLimitResult(allowed=False, retry_after=(1 - tokens) / self.refill_per_second)
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Sliding-window log per key shared between workers through Redis.
+
+    Each key is a sorted set of attempt timestamps. A Lua script drops
+    attempts older than the window and records the new one only if fewer
+    than ``limit`` remain, atomically. Keys are hashed so no email address
+    is stored in Redis. Redis failures are logged and the attempt is
+    allowed, so an outage cannot lock every user out.
+    """
+
+    name = "redis"
+    KEY_PREFIX = "rate-limit:"
+
+    # Returns "0" when allowed, otherwise the seconds until the oldest attempt leaves the window
+    HIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return '0'
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return tostring(tonumber(oldest[2]) + window - now)
+"""
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: float,
+        redis_url: str,
+        clock: Callable[[], float] = time.time
+    ):
+        super().__init__(limit, window_seconds)
+        self.redis_url = redis_url
+        self._clock = clock
+        self._redis: Any = None
+        self.errors = 0
+
+    def _get_redis(self) -> Any:
+        if self._redis is None:
+            import redis.asyncio as redis
+            self._redis = redis.from_url(self.redis_url)
+        return self._redis
+
+    async def hit(self, key: str) -> RateLimitResult:
+        now = self._clock()
+        redis_key = self.KEY_PREFIX + hashlib.sha256(key.encode("utf-8")).hexdigest()
+        try:
+            retry_after = float(await self._get_redis().eval(
+                self.HIT_SCRIPT, 1, redis_key,
+                now, self.window_seconds, self.limit, f"{now}:{uuid.uuid4().hex}"
+            ))
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Rate limiter Redis call failed, allowing attempt: %s", e)
+            return RateLimitResult(allowed=True)
+        if retry_after <= 0:
+            return RateLimitResult(allowed=True)
+        return RateLimitResult(allowed=False, retry_after=retry_after)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+class LoginThrottle:
+    """
+    Limits login attempts per client IP and per account.
+
+    The IP limit stops one client from spraying many accounts; the email
+    limit stops credential stuffing against one account from many IPs.
+    Attempts are counted before the password is checked, so rejected
+    attempts never reach bcrypt. An attempt rejected by the IP limit does
+    not consume the account's budget. Decisions are counted per instance
+    for ``stats`` and in the ``login_attempts_total`` Prometheus counter.
+    """
+
+    def __init__(self, by_email: RateLimiter, by_ip: RateLimiter):
+        self.by_email = by_email
+        self.by_ip = by_ip
+        self.admitted = 0
+        self.rejected_by_email = 0
+        self.rejected_by_ip = 0
+
+    async def check(self, email: str, client_ip: Optional[str] = None) -> RateLimitResult:
+        """
+        Record a login attempt.
+
+        Args:
+            email: Normalized email address
+            client_ip: Client IP address, when known
+
+        Returns:
+            Whether the attempt may proceed, and when to retry if not
+        """
+        if client_ip:
+            result = await self.by_ip.hit("ip:" + client_ip)
+            if not result.allowed:
+                self.rejected_by_ip += 1
+                LOGIN_REJECTED_BY_IP.inc()
+                return result
+        result = await self.by_email.hit("email:" + email)
+        if not result.allowed:
+            self.rejected_by_email += 1
+            LOGIN_REJECTED_BY_EMAIL.inc()
+            return result
+        self.admitted += 1
+        LOGIN_ADMITTED.inc()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get admitted/rejected attempt counters."""
+        return {
+            "backend": self.by_email.name,
+            "admitted": self.admitted,
+            "rejected_by_email": self.rejected_by_email,
+            "rejected_by_ip": self.rejected_by_ip,
+        }
+
+    async def close(self) -> None:
+        """Release connections."""
+        await self.by_email.close()
+        await self.by_ip.close()
+
+
+def create_login_throttle(settings: Settings) -> LoginThrottle:
+    """
+    Build the login throttle selected by settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Login throttle
+    """
+    window = settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("LOGIN_RATE_LIMIT_BACKEND=redis requires REDIS_URL")
+        return LoginThrottle(
+            by_email=RedisRateLimiter(settings.LOGIN_RATE_LIMIT_EMAIL_ATTEMPTS, window, settings.REDIS_URL),
+            by_ip=RedisRateLimiter(settings.LOGIN_RATE_LIMIT_IP_ATTEMPTS, window, settings.REDIS_URL),
+        )
+    return LoginThrottle(
+        by_email=InMemoryRateLimiter(settings.LOGIN_RATE_LIMIT_EMAIL_ATTEMPTS, window),
+        by_ip=InMemoryRateLimiter(settings.LOGIN_RATE_LIMIT_IP_ATTEMPTS, window),
+    )
+
+
+login_throttle = create_login_throttle(settings)
@@ -5,26 +5,72 @@ Concrete implementation of the UserRepository interface
 using SQLAlchemy for data persistence.
 """
 
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List, Set
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, literal, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.repository import UserRepository
-from app.domain.models import User, Email
+from app.domain.repository import UserPage, UserRepository, decode_cursor, encode_cursor
+from app.domain.models import User
+from app.infrastructure.cache import TokenVersionCache, UserCache
 from app.infrastructure.database import UserModel
 
 
+# Columns in User.from_trusted argument order; selecting columns instead of
+# the entity returns plain rows that bypass ORM instance construction
+_USER_COLUMNS = (
+    UserModel.id,
+    UserModel.email,
+    UserModel.hashed_password,
+    UserModel.is_active,
+    UserModel.is_verified,
+    UserModel.first_name,
+    UserModel.last_name,
+    UserModel.created_at,
+    UserModel.updated_at,
+    UserModel.last_login,
+    UserModel.token_version,
+)
+
+# Dialects that support INSERT ... ON CONFLICT DO NOTHING RETURNING
+_UPSERT_DIALECTS = {"postgresql": postgresql, "sqlite": sqlite}
+
+
 class SQLAlchemyUserRepository(UserRepository):
     """
     SQLAlchemy implementation of UserRepository.
     
     Handles the mapping between domain models and database models.
+    When a UserCache is supplied, ``get_by_id`` is served from it, and when
+    a TokenVersionCache is supplied, ``get_token_version`` is served from
+    that. Every write that touches a user invalidates the user's entries,
+    and ``after_commit`` invalidates them again: until the write commits,
+    other sessions still read, and may cache, the old row.
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: Optional[UserCache] = None,
+        version_cache: Optional[TokenVersionCache] = None
+    ):
         self.session = session
+        self.cache = cache
+        self.version_cache = version_cache
+        self._written: Set[UUID] = set()
+    
+    async def after_commit(self) -> None:
+        """Drop the users written in the committed transaction from the caches."""
+        written, self._written = self._written, set()
+        for user_id in written:
+            await self._drop_cached(user_id)
+    
+    def after_rollback(self) -> None:
+        """Forget the users written in the rolled back transaction."""
+        self._written.clear()
     
     async def add(self, user: User) -> None:
         """Add a new user to the database."""
@@ -32,54 +78,145 @@ class SQLAlchemyUserRepository(UserRepository):
         self.session.add(db_user)
         await self.session.flush()  # Ensure the user is persisted
     
+    async def add_unique(self, user: User) -> bool:
+        """
+        Add a new user unless the email is already registered.
+        
+        On PostgreSQL and SQLite this is a single
+        ``INSERT ... ON CONFLICT (email) DO NOTHING RETURNING id`` relying on
+        the unique email index. Other dialects fall back to an insert inside
+        a savepoint that treats an IntegrityError as a conflict.
+        """
+        dialect = self.session.bind.dialect.name
+        if dialect in _UPSERT_DIALECTS:
+            stmt = (
+                _UPSERT_DIALECTS[dialect].insert(UserModel)
+                .values(**self._to_row(user))
+                .on_conflict_do_nothing(index_elements=[UserModel.email])
+                .returning(UserModel.id)
+            )
+            result = await self.session.execute(stmt)
+            return result.scalar_one_or_none() is not None
+        
+        try:
+            async with self.session.begin_nested():
+                self.session.add(self._to_db_model(user))
+        except IntegrityError:
+            return False
+        return True
+    
+    async def add_many(self, users: List[User]) -> List[User]:
+        """
+        Add new users in bulk, skipping those whose email is registered.
+        
+        On PostgreSQL and SQLite this executes one cached
+        ``INSERT ... ON CONFLICT (email) DO NOTHING RETURNING id`` over all
+        rows, which SQLAlchemy sends as multi-row VALUES batches
+        ("insertmanyvalues"); users whose id is not returned were
+        conflicts, including later repeats of an email within ``users``.
+        Other dialects fall back to ``add_unique`` per user.
+        """
+        dialect = self.session.bind.dialect.name
+        if dialect not in _UPSERT_DIALECTS:
+            return [user for user in users if not await self.add_unique(user)]
+        
+        stmt = (
+            _UPSERT_DIALECTS[dialect].insert(UserModel)
+            .on_conflict_do_nothing(index_elements=[UserModel.email])
+            .returning(UserModel.id)
+        )
+        result = await self.session.execute(stmt, [self._to_row(user) for user in users])
+        inserted = set(result.scalars())
+        return [user for user in users if user.id not in inserted]
+    
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
-        """Retrieve a user by their ID."""
-        stmt = select(UserModel).where(UserModel.id == user_id)
+        """
+        Retrieve a user by their ID.
+        
+        Users served from the cache carry no password hash; use
+        ``get_by_email`` to check credentials.
+        """
+        if self.cache:
+            cached = await self.cache.get(user_id)
+            if cached:
+                return cached
+        
+        stmt = select(*_USER_COLUMNS).where(UserModel.id == user_id)
         result = await self.session.execute(stmt)
-        db_user = result.scalar_one_or_none()
+        row = result.first()
+        if not row:
+            return None
         
-        return self._to_domain_model(db_user) if db_user else None
+        user = self._row_to_domain_model(row)
+        if self.cache:
+            await self.cache.set(user)
+        return user
     
     async def get_by_email(self, email: str) -> Optional[User]:
         """Retrieve a user by their email address."""
-        stmt = select(UserModel).where(UserModel.email == email.lower())
+        stmt = select(*_USER_COLUMNS).where(UserModel.email == email.lower())
         result = await self.session.execute(stmt)
-        db_user = result.scalar_one_or_none()
+        row = result.first()
         
-        return self._to_domain_model(db_user) if db_user else None
+        return self._row_to_domain_model(row) if row else None
     
     async def update(self, user: User) -> None:
-        """Update an existing user."""
-        stmt = (
-            update(UserModel)
-            .where(UserModel.id == user.id)
-            .values(
-                email=str(user.email),
-                hashed_password=user.hashed_password,
-                is_active=user.is_active,
-                is_verified=user.is_verified,
-                first_name=user.first_name,
-                last_name=user.last_name,
-                updated_at=user.updated_at,
-                last_login=user.last_login
-            )
-        )
+        """
+        Update an existing user.
+        
+        An empty ``hashed_password`` (a user read from the cache) leaves the
+        stored hash unchanged.
+        """
+        values: Dict[str, Any] = {
+            "email": str(user.email),
+            "is_active": user.is_active,
+            "is_verified": user.is_verified,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "updated_at": user.updated_at,
+            "last_login": user.last_login,
+            "token_version": user.token_version
+        }
+        if user.hashed_password:
+            values["hashed_password"] = user.hashed_password
+        stmt = update(UserModel).where(UserModel.id == user.id).values(**values)
         await self.session.execute(stmt)
+        await self._invalidate(user.id)
+    
+    async def get_token_version(self, user_id: UUID) -> Optional[int]:
+        """Get a user's current token version."""
+        if self.version_cache:
+            cached = await self.version_cache.get(user_id)
+            if cached is not None:
+                return cached
+        
+        stmt = select(UserModel.token_version).where(UserModel.id == user_id)
+        result = await self.session.execute(stmt)
+        version = result.scalar_one_or_none()
+        if version is not None and self.version_cache:
+            await self.version_cache.set(user_id, version)
+        return version
     
-    async def update_password(self, user_id: UUID, hashed_password: str) -> None:
-        """Update a user's password."""
+    async def update_password(
+        self,
+        user_id: UUID,
+        hashed_password: str,
+        invalidate_tokens: bool = True
+    ) -> None:
+        """Update a user's password, bumping its token version unless told not to."""
         from datetime import datetime
-        stmt = (
-            update(UserModel)
-            .where(UserModel.id == user_id)
-            .values(hashed_password=hashed_password, updated_at=datetime.utcnow())
-        )
+        values: Dict[str, Any] = {"hashed_password": hashed_password, "updated_at": datetime.utcnow()}
+        if invalidate_tokens:
+            values["token_version"] = UserModel.token_version + 1
+        stmt = update(UserModel).where(UserModel.id == user_id).values(**values)
         await self.session.execute(stmt)
+        await self._invalidate(user_id)
     
     async def delete(self, user_id: UUID) -> None:
         """Delete a user (hard delete - consider soft delete in production)."""
         stmt = delete(UserModel).where(UserModel.id == user_id)
         await self.session.execute(stmt)
+        await self._invalidate(user_id)
     
     async def list_users(
         self,
@@ -88,16 +225,83 @@ class SQLAlchemyUserRepository(UserRepository):
         is_active: Optional[bool] = None
     ) -> List[User]:
         """List users with optional filtering."""
-        stmt = select(UserModel)
+        stmt = select(*_USER_COLUMNS)
         
         if is_active is not None:
             stmt = stmt.where(UserModel.is_active == is_active)
         
         stmt = stmt.offset(offset).limit(limit)
         result = await self.session.execute(stmt)
-        db_users = result.scalars().all()
         
-        return [self._to_domain_model(db_user) for db_user in db_users]
+        from_row = self._row_to_domain_model
+        return [from_row(row) for row in result]
+    
+    async def list_users_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> UserPage:
+        """
+        List users in (created_at, id) order using keyset pagination.
+        
+        The cursor becomes a ``(created_at, id) > (:created_at, :id)`` row
+        comparison, which the ``ix_users_created_at_id`` index answers by
+        seeking to the position instead of scanning past skipped rows. One
+        extra row is fetched to tell whether another page follows.
+        """
+        stmt = select(*_USER_COLUMNS)
+        
+        if is_active is not None:
+            stmt = stmt.where(UserModel.is_active == is_active)
+        if cursor is not None:
+            created_at, user_id = decode_cursor(cursor)
+            # Bind with the column types so the id is compared in its stored form
+            position = tuple_(
+                literal(created_at, UserModel.created_at.type), literal(user_id, UserModel.id.type)
+            )
+            stmt = stmt.where(tuple_(UserModel.created_at, UserModel.id) > position)
+        
+        stmt = stmt.order_by(UserModel.created_at, UserModel.id).limit(limit + 1)
+        result = await self.session.execute(stmt)
+        
+        from_row = self._row_to_domain_model
+        users = [from_row(row) for row in result]
+        if len(users) <= limit:
+            return UserPage(users=users)
+        del users[limit:]
+        return UserPage(users=users, next_cursor=encode_cursor(users[-1]))
+    
+    async def stream_users(
+        self,
+        is_active: Optional[bool] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[User]:
+        """
+        Iterate over every user in (created_at, id) order.
+        
+        ``session.stream`` with ``yield_per`` uses a server-side cursor
+        where the driver supports one, so only one batch of rows is held
+        at a time. Each batch is fetched with an await, so other requests
+        on the worker keep running during a long export. On PostgreSQL,
+        server-side cursors need a transaction, so use a transactional
+        session rather than a read-only autocommit session.
+        """
+        stmt = select(*_USER_COLUMNS)
+        
+        if is_active is not None:
+            stmt = stmt.where(UserModel.is_active == is_active)
+        
+        stmt = stmt.order_by(UserModel.created_at, UserModel.id).execution_options(yield_per=batch_size)
+        result = await self.session.stream(stmt)
+        
+        from_row = self._row_to_domain_model
+        try:
+            async for rows in result.partitions():
+                for row in rows:
+                    yield from_row(row)
+        finally:
+            await result.close()
     
     async def exists_by_email(self, email: str) -> bool:
         """Check if a user exists with the given email."""
@@ -105,32 +309,45 @@ class SQLAlchemyUserRepository(UserRepository):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none() is not None
     
+    async def _invalidate(self, user_id: UUID) -> None:
+        """Drop a user from the caches after a write, and again after its commit."""
+        if self.cache or self.version_cache:
+            self._written.add(user_id)
+            await self._drop_cached(user_id)
+    
+    async def _drop_cached(self, user_id: UUID) -> None:
+        if self.cache:
+            await self.cache.invalidate(user_id)
+        if self.version_cache:
+            await self.version_cache.invalidate(user_id)
+    
     def _to_db_model(self, user: User) -> UserModel:
         """Convert domain model to database model."""
-        return UserModel(
-            id=user.id,
-            email=str(user.email),
-            hashed_password=user.hashed_password,
-            is_active=user.is_active,
-            is_verified=user.is_verified,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-            last_login=user.last_login
-        )
+        return UserModel(**self._to_row(user))
+    
+    def _to_row(self, user: User) -> Dict[str, Any]:
+        """Convert domain model to column values."""
+        return {
+            "id": user.id,
+            "email": str(user.email),
+            "hashed_password": user.hashed_password,
+            "is_active": user.is_active,
+            "is_verified": user.is_verified,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "created_at": user.created_at,
+            "updated_at": user.updated_at,
+            "last_login": user.last_login,
+            "token_version": user.token_version
+        }
     
-    def _to_domain_model(self, db_user: UserModel) -> User:
-        """Convert database model to domain model."""
-        return User(
-            id=db_user.id,
-            email=Email(db_user.email),
-            hashed_password=db_user.hashed_password,
-            is_active=db_user.is_active,
-            is_verified=db_user.is_verified,
-            first_name=db_user.first_name,
-            last_name=db_user.last_name,
-            created_at=db_user.created_at,
-            updated_at=db_user.updated_at,
-            last_login=db_user.last_login
-        )
\ No newline at end of file
+    @staticmethod
+    def _row_to_domain_model(row: Any) -> User:
+        """
+        Convert a row of ``_USER_COLUMNS`` to a domain model.
+        
+        Rows come from Core-style column selects, so no ORM instance or
+        identity-map entry is created, and stored values were validated on
+        write, so they are not re-validated.
+        """
+        return User.from_trusted(*row)
@@ -5,11 +5,136 @@ Provides security utilities including password hashing,
 JWT token management, and other cryptographic operations.
 """
 
+import asyncio
+import hashlib
+import time
+import uuid
 import bcrypt
-from jose import jwt
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from jose import JWTError
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable, TypeVar
+from app.infrastructure.cache import TTLCache
 from app.infrastructure.config import settings
+from app.infrastructure.jwt_backends import JWTBackend, create_jwt_backend
+from app.infrastructure.metrics import (
+    JWT_DECODE_SECONDS,
+    JWT_ENCODE_SECONDS,
+    PASSWORD_HASH_SECONDS,
+    PASSWORD_HASH_WAIT_SECONDS,
+)
+
+T = TypeVar("T")
+
+
+class PasswordHashingPool:
+    """
+    Bounded worker pool for bcrypt operations.
+    
+    bcrypt is deliberately slow, so running it on the event loop stalls
+    every other request handled by the worker. The pool runs the work on
+    threads (bcrypt releases the GIL) or processes and caps how many
+    operations run at once; callers beyond the cap wait their turn.
+    Queue depth and wait times are tracked for monitoring.
+    """
+    
+    def __init__(self, max_concurrency: int, executor_type: str = "thread"):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if executor_type not in ("thread", "process"):
+            raise ValueError("executor_type must be 'thread' or 'process'")
+        self.max_concurrency = max_concurrency
+        self.executor_type = executor_type
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+    
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_concurrency)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking function in the pool without blocking the event loop.
+        
+        Args:
+            func: Picklable callable to run (module-level for process pools)
+            *args: Positional arguments for the callable
+            
+        Returns:
+            The callable's return value
+        """
+        semaphore = self._get_semaphore()
+        queued_at = time.perf_counter()
+        self._queue_depth += 1
+        if semaphore.locked():
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+        try:
+            await semaphore.acquire()
+        finally:
+            self._queue_depth -= 1
+        
+        started = time.perf_counter()
+        waited = started - queued_at
+        self._total_wait_seconds += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        PASSWORD_HASH_WAIT_SECONDS.observe(waited)
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            # Timed here rather than in the worker, so process pools are covered too
+            PASSWORD_HASH_SECONDS.labels(func.__name__).observe(time.perf_counter() - started)
+            self._running -= 1
+            self._completed += 1
+            semaphore.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get a snapshot of the pool metrics."""
+        started = self._completed + self._running
+        return {
+            "executor": self.executor_type,
+            "max_concurrency": self.max_concurrency,
+            "running": self._running,
+            "queue_depth": self._queue_depth,
+            "max_queue_depth": self._max_queue_depth,
+            "completed": self._completed,
+            "avg_wait_ms": (self._total_wait_seconds / started * 1000) if started else 0.0,
+            "max_wait_ms": self._max_wait_seconds * 1000,
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker pool; it is recreated lazily on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+password_hashing_pool = PasswordHashingPool(
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    executor_type=settings.PASSWORD_HASH_EXECUTOR
+)
 
 
 class PasswordHasher:
@@ -20,18 +145,62 @@ class PasswordHasher:
     with configurable work factor.
     """
     
+    rounds: int = settings.BCRYPT_ROUNDS
+    
+    @classmethod
+    def configure(cls, rounds: int) -> None:
+        """Set the bcrypt cost factor used for new hashes."""
+        if not 4 <= rounds <= 31:
+            raise ValueError("bcrypt rounds must be between 4 and 31")
+        cls.rounds = rounds
+    
     @staticmethod
-    def hash(password: str) -> str:
+    def calibrate(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+        """
+        Find the bcrypt cost factor closest to a target hash latency.
+        
+        Times a hash at ``min_rounds`` on this machine and doubles the
+        estimate (each extra round doubles the work) while it stays within
+        the target. The result is never below ``min_rounds``. Workers that
+        calibrate independently may disagree by one round near the boundary,
+        so multi-worker deployments should pin the logged value in
+        BCRYPT_ROUNDS once it is known.
+        
+        Args:
+            target_ms: Desired duration of a single hash in milliseconds
+            min_rounds: Lowest acceptable cost factor
+            max_rounds: Highest cost factor to consider
+            
+        Returns:
+            Calibrated cost factor
+        """
+        salt = bcrypt.gensalt(rounds=min_rounds)
+        samples = []
+        for _ in range(3):
+            started = time.perf_counter()
+            bcrypt.hashpw(b"calibration-password", salt)
+            samples.append((time.perf_counter() - started) * 1000)
+        
+        rounds = min_rounds
+        estimate_ms = min(samples)
+        while rounds < max_rounds and estimate_ms * 2 <= target_ms:
+            rounds += 1
+            estimate_ms *= 2
+        return rounds
+    
+    @staticmethod
+    def hash(password: str, rounds: Optional[int] = None) -> str:
         """
         Hash a password using bcrypt.
         
         Args:
             password: Plain text password to hash
+            rounds: Cost factor override (defaults to the configured rounds)
             
         Returns:
             Hashed password string
         """
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=rounds or PasswordHasher.rounds)
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
     
     @staticmethod
@@ -53,6 +222,54 @@ class PasswordHasher:
             )
         except Exception:
             return False
+    
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """
+        Check whether a hash was made with a different cost factor.
+        
+        Args:
+            hashed_password: Previously hashed password
+            
+        Returns:
+            True if the hash should be replaced with one at the current cost
+        """
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return True
+        return int(parts[2]) != PasswordHasher.rounds
+    
+    @staticmethod
+    async def hash_async(password: str) -> str:
+        """
+        Hash a password in the hashing pool without blocking the event loop.
+        
+        Args:
+            password: Plain text password to hash
+            
+        Returns:
+            Hashed password string
+        """
+        # Pass the cost explicitly so process workers use the configured value
+        return await password_hashing_pool.run(
+            PasswordHasher.hash, password, PasswordHasher.rounds
+        )
+    
+    @staticmethod
+    async def verify_async(password: str, hashed_password: str) -> bool:
+        """
+        Verify a password in the hashing pool without blocking the event loop.
+        
+        Args:
+            password: Plain text password
+            hashed_password: Previously hashed password
+            
+        Returns:
+            True if password matches, False otherwise
+        """
+        return await password_hashing_pool.run(
+            PasswordHasher.verify, password, hashed_password
+        )
 
 
 class JWTManager:
@@ -61,8 +278,52 @@ class JWTManager:
     
     Handles creation, validation, and decoding of JWT tokens
     for authentication and authorization.
+    
+    Verified tokens are kept in a bounded LRU keyed by a SHA-256 digest of
+    the token, so a token replayed on every request is only parsed and
+    HMAC-checked once. Entries expire at the token's ``exp`` claim.
+    
+    Signing and verification are delegated to a pluggable JWTBackend
+    (see ``app.infrastructure.jwt_backends``).
     """
     
+    _backend: JWTBackend = create_jwt_backend(
+        settings.JWT_BACKEND, settings.SECRET_KEY, settings.ALGORITHM
+    )
+    _verified_tokens: Optional[TTLCache[bytes, Dict[str, Any]]] = None
+    
+    @classmethod
+    def set_backend(cls, backend: JWTBackend) -> None:
+        """Replace the JWT backend used for encoding and decoding."""
+        cls._backend = backend
+    
+    @classmethod
+    def get_backend(cls) -> JWTBackend:
+        """Get the active JWT backend."""
+        return cls._backend
+    
+    @classmethod
+    def configure_token_cache(
+        cls,
+        max_size: int,
+        clock: Callable[[], float] = time.time
+    ) -> None:
+        """
+        Replace the verified-token cache.
+        
+        Args:
+            max_size: Maximum number of cached tokens (0 disables the cache)
+            clock: Wall-clock source in epoch seconds, compared against ``exp``
+        """
+        cls._verified_tokens = TTLCache(max_size, ttl_seconds=0, clock=clock) if max_size else None
+    
+    @classmethod
+    def token_cache_stats(cls) -> Dict[str, Any]:
+        """Get hit/miss counters for the verified-token cache."""
+        if cls._verified_tokens is None:
+            return {"enabled": False}
+        return {"enabled": True, **cls._verified_tokens.stats()}
+    
     @staticmethod
     def create_access_token(
         subject: str,
@@ -83,49 +344,50 @@ class JWTManager:
         if expires_delta is None:
             expires_delta = settings.ACCESS_TOKEN_EXPIRE_MINUTES
         
-        expire = datetime.utcnow() + timedelta(minutes=expires_delta)
-        
+        now = int(time.time())
         to_encode = {
             "sub": str(subject),
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "exp": now + expires_delta * 60,
+            "iat": now,
+            "jti": uuid.uuid4().hex,
             "type": "access_token"
         }
         
         if additional_claims:
             to_encode.update(additional_claims)
         
-        return jwt.encode(
-            to_encode,
-            settings.SECRET_KEY,
-            algorithm=settings.ALGORITHM
-        )
+        with JWT_ENCODE_SECONDS.time():
+            return JWTManager._backend.encode(to_encode)
     
     @staticmethod
-    def create_refresh_token(subject: str) -> str:
+    def create_refresh_token(
+        subject: str,
+        additional_claims: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         Create a JWT refresh token.
         
         Args:
             subject: Subject identifier (usually user ID)
+            additional_claims: Optional additional claims to include
             
         Returns:
             Encoded JWT refresh token string
         """
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        
+        now = int(time.time())
         to_encode = {
             "sub": str(subject),
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "exp": now + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+            "iat": now,
+            "jti": uuid.uuid4().hex,
             "type": "refresh_token"
         }
         
-        return jwt.encode(
-            to_encode,
-            settings.SECRET_KEY,
-            algorithm=settings.ALGORITHM
-        )
+        if additional_claims:
+            to_encode.update(additional_claims)
+        
+        with JWT_ENCODE_SECONDS.time():
+            return JWTManager._backend.encode(to_encode)
     
     @staticmethod
     def decode_token(token: str) -> Dict[str, Any]:
@@ -139,36 +401,61 @@ class JWTManager:
             Decoded token payload
             
         Raises:
-            jwt.InvalidTokenError: If token is invalid or expired
+            JWTError: If token is invalid or expired
         """
-        return jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        cache = JWTManager._verified_tokens
+        if cache is None:
+            with JWT_DECODE_SECONDS.time():
+                return JWTManager._backend.decode(token)
+        
+        key = hashlib.sha256(token.encode('utf-8')).digest()
+        claims = cache.get(key)
+        if claims is None:
+            with JWT_DECODE_SECONDS.time():
+                claims = JWTManager._backend.decode(token)
+            exp = claims.get("exp")
+            # Only tokens with an expiry are cached; the entry dies with the token
+            if isinstance(exp, (int, float)):
+                cache.set(key, claims, expires_at=exp)
+        return dict(claims)
     
     @staticmethod
-    def verify_token(token: str, token_type: str = "access_token") -> Optional[str]:
+    def verify_token_claims(token: str, token_type: str = "access_token") -> Optional[Dict[str, Any]]:
         """
-        Verify a JWT token and return the subject.
+        Verify a JWT token and return its claims.
         
         Args:
             token: JWT token string
             token_type: Expected token type
             
         Returns:
-            Subject from token if valid, None otherwise
+            Claims from token if valid and of the expected type, None otherwise
         """
         try:
             payload = JWTManager.decode_token(token)
-            
-            # Verify token type
-            if payload.get("type") != token_type:
-                return None
-            
-            return payload.get("sub")
-        except jwt.InvalidTokenError:
+        except JWTError:
             return None
+        
+        # Verify token type
+        if payload.get("type") != token_type:
+            return None
+        
+        return payload
+    
+    @staticmethod
+    def verify_token(token: str, token_type: str = "access_token") -> Optional[str]:
+        """
+        Verify a JWT token and return the subject.
+        
+        Args:
+            token: JWT token string
+            token_type: Expected token type
+            
+        Returns:
+            Subject from token if valid, None otherwise
+        """
+        payload = JWTManager.verify_token_claims(token, token_type)
+        return payload.get("sub") if payload else None
     
     @staticmethod
     def is_token_expired(token: str) -> bool:
@@ -187,10 +474,13 @@ class JWTManager:
             if exp_timestamp:
                 return datetime.utcnow() > datetime.fromtimestamp(exp_timestamp)
             return True
-        except jwt.InvalidTokenError:
+        except JWTError:
             return True
 
 
+JWTManager.configure_token_cache(settings.TOKEN_CACHE_SIZE)
+
+
 class SecurityUtils:
     """Additional security utilities."""
     
@@ -211,5 +501,5 @@ class SecurityUtils:
             if payload.get("type") != "password_reset":
                 return None
             return payload.get("sub")
-        except jwt.InvalidTokenError:
+        except JWTError:
             return None
\ No newline at end of file
@@ -0,0 +1,581 @@
+"""
+Token Stores
+
+Server-side token state. The revocation store tracks revoked token ids
+(``jti`` claims) until the tokens would have expired anyway; its Redis
+backend keeps a local Bloom filter so checking a token that was never
+revoked costs no network round trip. The refresh token store tracks the
+current token of each refresh-token family for rotation and reuse
+detection. Both have an in-memory backend for single-process deployments
+and a Redis backend.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar
+
+from app.infrastructure.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class RevocationStore(ABC):
+    """Set of revoked token ids whose entries expire with the tokens."""
+
+    name: str = "abstract"
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Revoke a token.
+
+        Args:
+            jti: Token id
+            expires_at: Token expiry in epoch seconds; the entry is dropped after it
+        """
+        pass
+
+    @abstractmethod
+    async def is_revoked(self, jti: str) -> bool:
+        """Check whether a token id has been revoked."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Get store size and lookup counters."""
+        pass
+
+    def start(self) -> None:
+        """Start background work on the running event loop, if any."""
+        pass
+
+    async def stop(self) -> None:
+        """Stop background work and release connections."""
+        pass
+
+
+class ExpiringDict(Generic[K, V]):
+    """
+    Dictionary whose entries disappear at their expiry time.
+
+    Entries are grouped into buckets by expiry time. Whole buckets are
+    dropped once their window has passed, so eviction costs nothing while
+    no bucket is due and never scans live entries.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, clock: Callable[[], float] = time.time):
+        if bucket_seconds < 1:
+            raise ValueError("bucket_seconds must be at least 1")
+        self.bucket_seconds = bucket_seconds
+        self._clock = clock
+        self._entries: Dict[K, Tuple[float, V]] = {}
+        self._buckets: Dict[int, Set[K]] = {}
+        self._bucket_heap: List[int] = []
+        self.evicted = 0
+
+    def _bucket(self, expires_at: float) -> int:
+        return math.ceil(expires_at / self.bucket_seconds)
+
+    def _evict(self, now: float) -> None:
+        due = now // self.bucket_seconds
+        while self._bucket_heap and self._bucket_heap[0] <= due:
+            bucket = heapq.heappop(self._bucket_heap)
+            for key in self._buckets.pop(bucket, ()):
+                entry = self._entries.get(key)
+                # A later set() of the same key may have moved it to a newer bucket
+                if entry is not None and self._bucket(entry[0]) == bucket:
+                    del self._entries[key]
+                    self.evicted += 1
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        """Store an entry until ``expires_at`` (epoch seconds)."""
+        now = self._clock()
+        self._evict(now)
+        if expires_at <= now:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (expires_at, value)
+        bucket = self._bucket(expires_at)
+        if bucket not in self._buckets:
+            self._buckets[bucket] = set()
+            heapq.heappush(self._bucket_heap, bucket)
+        self._buckets[bucket].add(key)
+
+    def get(self, key: K) -> Optional[V]:
+        """Get a live entry, or None if missing or expired."""
+        now = self._clock()
+        self._evict(now)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= now:
+            return None
+        return entry[1]
+
+    def expires_at(self, key: K) -> Optional[float]:
+        """Get an entry's expiry, or None if missing."""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove an entry and return its value if it was live."""
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry[1]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def bucket_count(self) -> int:
+        """Number of expiry buckets holding entries."""
+        return len(self._buckets)
+
+
+class InMemoryRevocationStore(RevocationStore):
+    """
+    Revoked token ids held in process memory.
+
+    Lookups are a dict probe; entries are evicted in expiry buckets once
+    the tokens would have expired anyway.
+    """
+
+    name = "memory"
+
+    def __init__(self, bucket_seconds: int = 60, clock: Callable[[], float] = time.time):
+        self._revoked: ExpiringDict[str, bool] = ExpiringDict(bucket_seconds, clock)
+        self.lookups = 0
+        self.hits = 0
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        expires_at = max(expires_at, self._revoked.expires_at(jti) or 0)
+        self._revoked.set(jti, True, expires_at)
+
+    async def is_revoked(self, jti: str) -> bool:
+        self.lookups += 1
+        if self._revoked.get(jti) is None:
+            return False
+        self.hits += 1
+        return True
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "revoked": len(self._revoked),
+            "buckets": self._revoked.bucket_count(),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "evicted": self._revoked.evicted,
+        }
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Never reports a false negative; false positives occur at roughly
+    ``error_rate`` once ``capacity`` items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        """Add an item."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Revoked token ids shared between workers through Redis.
+
+    Each revocation is written as a key that expires with the token, which
+    is the source of truth, and to a sorted feed scored by expiry. Every
+    worker rebuilds a local Bloom filter from the feed every
+    ``sync_interval`` seconds. A token id that is not in the filter is
+    reported as not revoked without contacting Redis; filter hits are
+    confirmed against the key. Revocations made on other workers are
+    therefore seen within ``sync_interval``, and immediately on the worker
+    that made them.
+
+    Until the first sync completes every lookup goes to Redis. Redis
+    failures are logged; a filter hit that cannot be confirmed is treated
+    as revoked.
+    """
+
+    name = "redis"
+    KEY_PREFIX = "revoked:"
+    FEED_KEY = "revoked-feed"
+
+    def __init__(
+        self,
+        redis_url: str,
+        sync_interval: float,
+        bloom_capacity: int = 100000,
+        bloom_error_rate: float = 0.001,
+        clock: Callable[[], float] = time.time
+    ):
+        self.redis_url = redis_url
+        self.sync_interval = sync_interval
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self._clock = clock
+        self._redis: Any = None
+        self._filter: Optional[BloomFilter] = None
+        # Ids revoked on this worker since the running sync started reading the feed
+        self._revoked_during_sync: Optional[Set[str]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.lookups = 0
+        self.filter_skips = 0
+        self.redis_checks = 0
+        self.hits = 0
+        self.errors = 0
+        self.syncs = 0
+
+    def _get_redis(self) -> Any:
+        if self._redis is None:
+            import redis.asyncio as redis
+            self._redis = redis.from_url(self.redis_url)
+        return self._redis
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        now = self._clock()
+        ttl = math.ceil(expires_at - now)
+        if ttl <= 0:
+            return
+        pipeline = self._get_redis().pipeline(transaction=False)
+        pipeline.set(self.KEY_PREFIX + jti, 1, ex=ttl)
+        pipeline.zadd(self.FEED_KEY, {jti: expires_at})
+        pipeline.zremrangebyscore(self.FEED_KEY, "-inf", now)
+        await pipeline.execute()
+        if self._filter is not None:
+            self._filter.add(jti)
+        if self._revoked_during_sync is not None:
+            self._revoked_during_sync.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        self.lookups += 1
+        bloom = self._filter
+        if bloom is not None and jti not in bloom:
+            self.filter_skips += 1
+            return False
+
+        self.redis_checks += 1
+        try:
+            revoked = bool(await self._get_redis().exists(self.KEY_PREFIX + jti))
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Revocation check against Redis failed: %s", e)
+            # Fail closed only when the local filter says the id may be revoked
+            revoked = bloom is not None
+        if revoked:
+            self.hits += 1
+        return revoked
+
+    async def sync(self) -> None:
+        """
+        Rebuild the local Bloom filter from the revocation feed.
+
+        Ids revoked on this worker while the feed is read may be missing
+        from it, so they are added to the new filter before it replaces
+        the old one.
+        """
+        client = self._get_redis()
+        now = self._clock()
+        recent: Set[str] = set()
+        self._revoked_during_sync = recent
+        try:
+            await client.zremrangebyscore(self.FEED_KEY, "-inf", now)
+            revoked = await client.zrangebyscore(self.FEED_KEY, now, "+inf")
+            bloom = BloomFilter(max(self.bloom_capacity, 2 * len(revoked)), self.bloom_error_rate)
+            for jti in revoked:
+                bloom.add(jti.decode("utf-8") if isinstance(jti, bytes) else jti)
+            for jti in recent:
+                bloom.add(jti)
+            self._filter = bloom
+        finally:
+            if self._revoked_during_sync is recent:
+                self._revoked_during_sync = None
+        self.syncs += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Revocation feed sync failed: %s", e)
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        self._filter = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "filter_items": self._filter.count if self._filter else None,
+            "lookups": self.lookups,
+            "filter_skips": self.filter_skips,
+            "redis_checks": self.redis_checks,
+            "hits": self.hits,
+            "errors": self.errors,
+            "syncs": self.syncs,
+        }
+
+
+class RotationOutcome(Enum):
+    """Result of presenting a refresh token for rotation."""
+
+    ROTATED = "rotated"  # The token was current and has been replaced
+    UNKNOWN = "unknown"  # The family expired or was revoked
+    REUSED = "reused"  # A superseded token was replayed; the family is now revoked
+
+
+class RefreshTokenStore(ABC):
+    """
+    Current refresh token id per token family.
+
+    Each login starts a family. Every refresh replaces the family's current
+    token id, so a token can be exchanged once; presenting a superseded
+    token means it was copied, and the whole family is revoked.
+    """
+
+    name: str = "abstract"
+
+    def __init__(self) -> None:
+        self.issued = 0
+        self.rotations = 0
+        self.reuse_detected = 0
+
+    @abstractmethod
+    async def issue(self, family: str, jti: str, expires_at: float) -> None:
+        """
+        Start a token family.
+
+        Args:
+            family: Family id
+            jti: Id of the family's first refresh token
+            expires_at: Token expiry in epoch seconds
+        """
+        pass
+
+    @abstractmethod
+    async def rotate(self, family: str, presented_jti: str, new_jti: str, expires_at: float) -> RotationOutcome:
+        """
+        Atomically replace the family's current token id.
+
+        Args:
+            family: Family id
+            presented_jti: Id of the refresh token being exchanged
+            new_jti: Id of the replacement refresh token
+            expires_at: Replacement token expiry in epoch seconds
+
+        Returns:
+            Rotation outcome
+        """
+        pass
+
+    @abstractmethod
+    async def revoke_family(self, family: str) -> None:
+        """Revoke every refresh token of a family."""
+        pass
+
+    def _count(self, outcome: RotationOutcome) -> RotationOutcome:
+        if outcome is RotationOutcome.ROTATED:
+            self.rotations += 1
+        elif outcome is RotationOutcome.REUSED:
+            self.reuse_detected += 1
+        return outcome
+
+    def stats(self) -> Dict[str, Any]:
+        """Get rotation counters."""
+        return {
+            "backend": self.name,
+            "issued": self.issued,
+            "rotations": self.rotations,
+            "reuse_detected": self.reuse_detected,
+        }
+
+    async def stop(self) -> None:
+        """Release connections."""
+        pass
+
+
+class InMemoryRefreshTokenStore(RefreshTokenStore):
+    """Refresh token families held in process memory."""
+
+    name = "memory"
+
+    def __init__(self, bucket_seconds: int = 3600, clock: Callable[[], float] = time.time):
+        super().__init__()
+        self._families: ExpiringDict[str, str] = ExpiringDict(bucket_seconds, clock)
+
+    async def issue(self, family: str, jti: str, expires_at: float) -> None:
+        self._families.set(family, jti, expires_at)
+        self.issued += 1
+
+    async def rotate(self, family: str, presented_jti: str, new_jti: str, expires_at: float) -> RotationOutcome:
+        current = self._families.get(family)
+        if current is None:
+            return self._count(RotationOutcome.UNKNOWN)
+        if current != presented_jti:
+            self._families.pop(family)
+            return self._count(RotationOutcome.REUSED)
+        self._families.set(family, new_jti, expires_at)
+        return self._count(RotationOutcome.ROTATED)
+
+    async def revoke_family(self, family: str) -> None:
+        self._families.pop(family)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "families": len(self._families)}
+
+
+class RedisRefreshTokenStore(RefreshTokenStore):
+    """
+    Refresh token families shared between workers through Redis.
+
+    Each family is a key holding its current token id and expiring with
+    that token. Rotation runs as a Lua script so two workers cannot both
+    accept the same token.
+    """
+
+    name = "redis"
+    KEY_PREFIX = "refresh-family:"
+
+    # Returns 1 when rotated, 0 when the family is gone, -1 on reuse
+    ROTATE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return 0
+end
+if current ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return -1
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+    def __init__(self, redis_url: str, clock: Callable[[], float] = time.time):
+        super().__init__()
+        self.redis_url = redis_url
+        self._clock = clock
+        self._redis: Any = None
+
+    def _get_redis(self) -> Any:
+        if self._redis is None:
+            import redis.asyncio as redis
+            self._redis = redis.from_url(self.redis_url)
+        return self._redis
+
+    def _ttl(self, expires_at: float) -> int:
+        return max(1, math.ceil(expires_at - self._clock()))
+
+    async def issue(self, family: str, jti: str, expires_at: float) -> None:
+        await self._get_redis().set(self.KEY_PREFIX + family, jti, ex=self._ttl(expires_at))
+        self.issued += 1
+
+    async def rotate(self, family: str, presented_jti: str, new_jti: str, expires_at: float) -> RotationOutcome:
+        result = await self._get_redis().eval(
+            self.ROTATE_SCRIPT, 1, self.KEY_PREFIX + family,
+            presented_jti, new_jti, self._ttl(expires_at)
+        )
+        outcome = {1: RotationOutcome.ROTATED, 0: RotationOutcome.UNKNOWN}.get(int(result), RotationOutcome.REUSED)
+        return self._count(outcome)
+
+    async def revoke_family(self, family: str) -> None:
+        await self._get_redis().delete(self.KEY_PREFIX + family)
+
+    async def stop(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+def create_revocation_store(settings: Settings) -> RevocationStore:
+    """
+    Build the revocation store selected by settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Revocation store
+    """
+    if settings.REVOCATION_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("REVOCATION_BACKEND=redis requires REDIS_URL")
+        return RedisRevocationStore(
+            redis_url=settings.REDIS_URL,
+            sync_interval=settings.REVOCATION_SYNC_INTERVAL_SECONDS,
+            bloom_capacity=settings.REVOCATION_BLOOM_CAPACITY
+        )
+    return InMemoryRevocationStore()
+
+
+revocation_store = create_revocation_store(settings)
+
+
+def create_refresh_token_store(settings: Settings) -> RefreshTokenStore:
+    """
+    Build the refresh token store selected by settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Refresh token store
+    """
+    if settings.REVOCATION_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("REVOCATION_BACKEND=redis requires REDIS_URL")
+        return RedisRefreshTokenStore(redis_url=settings.REDIS_URL)
+    return InMemoryRefreshTokenStore()
+
+
+refresh_token_store = create_refresh_token_store(settings)
@@ -0,0 +1,117 @@
+"""
+SQLAlchemy Unit of Work
+
+Concrete implementation of the UnitOfWork interface that owns one
+SQLAlchemy session and the repositories bound to it.
+"""
+
+from types import TracebackType
+from typing import Any, Callable, Optional, Tuple, Type
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.repository import UnitOfWork, UserRepository
+from app.infrastructure.cache import TokenVersionCache, UserCache
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.repositories import SQLAlchemyUserRepository
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """
+    SQLAlchemy implementation of UnitOfWork.
+
+    Every repository operation between two commits runs in one transaction
+    on the unit's session. Writes are detected from the statements the
+    session executes and flushes, and ``commit`` does nothing when there
+    were none, so read-only use cases never issue a COMMIT. Leaving the
+    context commits outstanding writes, or rolls them back on an exception.
+    Cached users written in a transaction are invalidated again once it
+    has committed, so reads racing the commit cannot keep stale entries.
+
+    Usage:
+        async with SQLAlchemyUnitOfWork() as uow:
+            user = await uow.users.get_by_id(user_id)
+            await uow.users.update_password(user.id, new_hash)
+            await uow.commit()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        cache: Optional[UserCache] = None,
+        version_cache: Optional[TokenVersionCache] = None
+    ):
+        self.session_factory = session_factory
+        self.cache = cache
+        self.version_cache = version_cache
+        self.session: Optional[AsyncSession] = None
+        self._users: Optional[SQLAlchemyUserRepository] = None
+        self._has_writes = False
+
+    async def __aenter__(self) -> "SQLAlchemyUnitOfWork":
+        self.session = self.session_factory()
+        self._users = SQLAlchemyUserRepository(self.session, self.cache, self.version_cache)
+        self._has_writes = False
+        event.listen(self.session.sync_session, "do_orm_execute", self._on_execute)
+        event.listen(self.session.sync_session, "after_flush", self._on_flush)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        session, _ = self._entered()
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            await session.close()
+
+    @property
+    def has_writes(self) -> bool:
+        """Whether there are writes since the last commit or rollback."""
+        return self._has_writes
+
+    async def commit(self) -> None:
+        """Commit the current transaction, or skip it if nothing was written."""
+        session, users = self._entered()
+        if not self._has_writes:
+            return
+        await session.commit()
+        self._has_writes = False
+        await users.after_commit()
+
+    async def rollback(self) -> None:
+        """Rollback the current transaction."""
+        session, users = self._entered()
+        await session.rollback()
+        self._has_writes = False
+        users.after_rollback()
+
+    @property
+    def users(self) -> UserRepository:
+        """Get the user repository bound to this unit's session."""
+        return self._entered()[1]
+
+    def _entered(self) -> Tuple[AsyncSession, SQLAlchemyUserRepository]:
+        """
+        Get the unit's session and repository.
+
+        Raises:
+            RuntimeError: If the unit is used outside ``async with``
+        """
+        if self.session is None or self._users is None:
+            raise RuntimeError("SQLAlchemyUnitOfWork must be entered with `async with` before use")
+        return self.session, self._users
+
+    def _on_execute(self, orm_execute_state: Any) -> None:
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            self._has_writes = True
+
+    def _on_flush(self, session: Any, flush_context: Any) -> None:
+        self._has_writes = True
@@ -0,0 +1,125 @@
+"""
+Ornakala Backend Command Line Tools
+
+Operational commands that run outside the API server.
+
+Usage:
+    python cli.py migrate
+    python cli.py import-users legacy-users.csv --workers 8
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from typing import List, Optional
+
+from app.domain.usermanagement.user_import import ImportReport, UserImportService
+from app.infrastructure.database import DatabaseManager
+from app.infrastructure.import_files import IMPORT_FORMATS, aiter_file_lines, read_import_records
+from app.infrastructure.security import PasswordHasher, PasswordHashingPool
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+
+
+ALEMBIC_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def migrate(revision: str = "head") -> None:
+    """
+    Upgrade the database schema with Alembic.
+
+    Run once per deploy, before the API workers start with
+    DATABASE_SCHEMA_MODE=migrations.
+
+    Args:
+        revision: Target revision
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(ALEMBIC_CONFIG), revision)
+
+
+def _print_progress(report: ImportReport) -> None:
+    print(
+        f"{report.processed:>10,} processed  {report.imported:>10,} imported  "
+        f"{report.duplicates:>8,} duplicates  {report.invalid:>8,} invalid  "
+        f"{report.users_per_second:>8,.0f} users/s",
+        file=sys.stderr
+    )
+
+
+async def import_users(path: str, import_format: str, batch_size: int, workers: int) -> ImportReport:
+    """
+    Import users from an NDJSON or CSV file.
+
+    Plain passwords are hashed across a process pool of ``workers``
+    processes; each batch is committed before the next one is read.
+
+    Args:
+        path: Input file path
+        import_format: "ndjson" or "csv"
+        batch_size: Records per batch and transaction
+        workers: Hashing processes
+
+    Returns:
+        Import report
+    """
+    pool = PasswordHashingPool(max_concurrency=workers, executor_type="process")
+
+    async def hash_password(password: str) -> str:
+        return await pool.run(PasswordHasher.hash, password, PasswordHasher.rounds)
+
+    await DatabaseManager.initialize()
+    try:
+        async with SQLAlchemyUnitOfWork() as uow:
+            service = UserImportService(
+                uow,
+                batch_size=batch_size,
+                hash_password=hash_password,
+                progress=_print_progress
+            )
+            with open(path, encoding="utf-8", newline="") as lines:
+                return await service.import_records(
+                    read_import_records(aiter_file_lines(lines), import_format)
+                )
+    finally:
+        pool.shutdown()
+        await DatabaseManager.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Ornakala Backend command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="Upgrade the database schema")
+    migrate_parser.add_argument("revision", nargs="?", default="head", help="Target revision (default: head)")
+
+    import_parser = commands.add_parser("import-users", help="Import users from an NDJSON or CSV file")
+    import_parser.add_argument("path", help="Input file; one JSON object per line, or CSV with a header row")
+    import_parser.add_argument("--format", choices=IMPORT_FORMATS, help="Input format (default: from the file extension)")
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="Records per batch and transaction")
+    import_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Password hashing processes")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if args.command == "migrate":
+        migrate(args.revision)
+    elif args.command == "import-users":
+        import_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+        report = asyncio.run(import_users(args.path, import_format, args.batch_size, args.workers))
+        for rejection in report.rejections:
+            print(f"line {rejection.line}: {rejection.email or '-'}: {rejection.reason}", file=sys.stderr)
+        print(
+            f"Imported {report.imported:,} of {report.processed:,} users "
+            f"({report.duplicates:,} duplicates, {report.invalid:,} invalid) "
+            f"in {report.elapsed_seconds:.1f}s, {report.users_per_second:,.0f} users/s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,39 +5,58 @@ This module serves as the main entry point for the Ornakala Backend API.
 It provides customer-facing services for jewelry discovery and personalization.
 """
 
-import uvicorn
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-from app.api.routes import auth_router
+from app.api.middleware import MetricsMiddleware, QueryStatsMiddleware, RequestIdMiddleware
+from app.api.responses import FastJSONResponse
+from app.api.routes import admin_router, auth_router, internal_router, metrics_router
 from app.infrastructure.database import DatabaseManager
-from app.infrastructure.config import Settings
+from app.infrastructure.config import settings
+from app.infrastructure.cache import token_version_cache, user_cache
+from app.infrastructure.log_pipeline import configure_logging
+from app.infrastructure.login_tracker import last_login_buffer
+from app.infrastructure.metrics import mark_worker_stopped
+from app.infrastructure.rate_limit import login_throttle
+from app.infrastructure.token_store import refresh_token_store, revocation_store
+from app.infrastructure.security import PasswordHasher, password_hashing_pool
 import logging
 
 __version__ = "1.0.0"
 __author__ = "Ornakala Team"
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Configure logging (records are written by a background thread)
+configure_logging(settings)
 logger = logging.getLogger(__name__)
 
-settings = Settings()
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown events."""
     # Startup
     logger.info("Starting Ornakala Backend API...")
+    if settings.BCRYPT_TARGET_MS:
+        PasswordHasher.configure(PasswordHasher.calibrate(settings.BCRYPT_TARGET_MS))
+        logger.info("Calibrated bcrypt rounds: %d", PasswordHasher.rounds)
     await DatabaseManager.initialize()
     logger.info("Database initialized successfully")
+    last_login_buffer.start()
+    revocation_store.start()
     yield
     # Shutdown
     logger.info("Shutting down Ornakala Backend API...")
+    await revocation_store.stop()
+    await refresh_token_store.stop()
+    await last_login_buffer.stop()
+    logger.info("Pending last_login updates flushed")
     await DatabaseManager.close()
     logger.info("Database connections closed")
+    password_hashing_pool.shutdown()
+    logger.info("Password hashing pool stopped")
+    await user_cache.close()
+    await token_version_cache.close()
+    await login_throttle.close()
+    mark_worker_stopped()
 
 def create_app() -> FastAPI:
     """Application factory function."""
@@ -45,9 +64,21 @@ def create_app() -> FastAPI:
         title="Ornakala Backend API",
         description="Backend service for Ornakala's customer platform",
         version=__version__,
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
     )
 
+    # Tag each request with a correlation id for its log records
+    app.add_middleware(RequestIdMiddleware)
+
+    # Record per-route latency and in-flight requests
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    # Count each request's SQL statements for Server-Timing and N+1 warnings
+    if settings.SERVER_TIMING_ENABLED or settings.DEBUG:
+        app.add_middleware(QueryStatsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -59,6 +90,11 @@ def create_app() -> FastAPI:
 
     # Include routers
     app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication"])
+    app.include_router(admin_router, prefix="/api/v1/admin", tags=["Admin"])
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router, include_in_schema=False)
+    if settings.INTERNAL_STATS_ENABLED:
+        app.include_router(internal_router, prefix="/internal", include_in_schema=False)
 
     @app.get("/health")
     async def health_check():
@@ -88,7 +124,10 @@ app = create_app()
 
 def main() -> None:
     """Main application entry point."""
-    logger.info(f"Starting Ornakala Backend v{__version__}")
+    # Imported here so that importing the app (workers, tests) does not load the server
+    import uvicorn
+
+    logger.info("Starting Ornakala Backend v%s", __version__)
     uvicorn.run(
         "main:app",
         host=settings.HOST,
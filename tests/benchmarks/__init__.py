@@ -0,0 +1,14 @@
+"""
+Performance benchmarks for Ornakala Backend.
+
+Benchmarks are standalone scripts (``bench_*.py``) and are not collected
+by pytest. Run them as modules from the repository root, for example::
+
+    python -m tests.benchmarks.bench_password_hashing
+
+``suite.py`` runs the authentication hot paths together and can save the
+results as JSON and fail on regressions against a saved baseline::
+
+    python -m tests.benchmarks.suite --save baseline.json
+    python -m tests.benchmarks.suite --baseline baseline.json
+"""
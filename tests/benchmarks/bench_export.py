@@ -0,0 +1,71 @@
+"""
+Peak memory of a full users export, streamed vs materialized.
+
+Seeds a temporary SQLite database and encodes every user as NDJSON twice:
+once through the admin export's streaming chunks and once by loading
+every user with ``list_users`` first. Peak traced memory (tracemalloc)
+stays flat for the stream and grows with the table when materialized.
+
+Usage:
+    python -m tests.benchmarks.bench_export --users 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+from typing import Awaitable, Callable  # noqa: E402
+
+from app.api.admin import _encode_ndjson, _export_chunks  # noqa: E402
+from app.infrastructure.database import AsyncSessionLocal, DatabaseManager  # noqa: E402
+from app.infrastructure.repositories import SQLAlchemyUserRepository  # noqa: E402
+from tests.benchmarks.bench_pagination import _seed  # noqa: E402
+
+
+async def _streamed() -> int:
+    written = 0
+    async for chunk in _export_chunks("ndjson", None):
+        written += len(chunk)
+    return written
+
+
+async def _materialized() -> int:
+    async with AsyncSessionLocal() as session:
+        users = await SQLAlchemyUserRepository(session).list_users(limit=2**62)
+    return len(_encode_ndjson(users))
+
+
+async def _measure(export: Callable[[], Awaitable[int]]) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    written = await export()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"    {written / 2**20:8.1f} MiB written in {elapsed:6.1f} s, peak {peak / 2**20:8.1f} MiB")
+
+
+async def main(users: int) -> None:
+    await DatabaseManager.initialize()
+    print(f"Seeding {users:,} users")
+    await _seed(users)
+
+    for name, export in (("streamed", _streamed), ("materialized", _materialized)):
+        print(f"  {name}:")
+        await _measure(export)
+    await DatabaseManager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users))
@@ -0,0 +1,98 @@
+"""
+Users hydrated per second by the repository read path.
+
+Seeds a temporary SQLite database and reads one large page of users in
+three ways: ORM entities mapped through the validating ``Email``
+constructor (the repository's previous behaviour), Core rows through the
+validating constructor, and Core rows through the trusted path that
+``SQLAlchemyUserRepository.list_users`` now uses.
+
+Usage:
+    python -m tests.benchmarks.bench_hydration --users 20000 --repeats 5
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from typing import Any, List  # noqa: E402
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.domain.models import Email, User  # noqa: E402
+from app.infrastructure.database import AsyncSessionLocal, DatabaseManager, UserModel  # noqa: E402
+from app.infrastructure.repositories import _USER_COLUMNS, SQLAlchemyUserRepository  # noqa: E402
+from tests.benchmarks.harness import measure_async  # noqa: E402
+
+
+def _validated(row: Any) -> User:
+    return User(
+        id=row.id,
+        email=Email(row.email),
+        hashed_password=row.hashed_password,
+        is_active=row.is_active,
+        is_verified=row.is_verified,
+        first_name=row.first_name,
+        last_name=row.last_name,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        last_login=row.last_login,
+        token_version=row.token_version
+    )
+
+
+async def _orm_validated(limit: int) -> List[User]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(UserModel).limit(limit))
+        return [_validated(db_user) for db_user in result.scalars()]
+
+
+async def _core_validated(limit: int) -> List[User]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(*_USER_COLUMNS).limit(limit))
+        return [_validated(row) for row in result]
+
+
+async def _core_trusted(limit: int) -> List[User]:
+    async with AsyncSessionLocal() as session:
+        return await SQLAlchemyUserRepository(session).list_users(limit=limit)
+
+
+async def main(users: int, repeats: int) -> None:
+    await DatabaseManager.initialize()
+    async with AsyncSessionLocal() as session:
+        rows = [
+            SQLAlchemyUserRepository(session)._to_row(
+                User.create(email=f"user{i}@example.com", hashed_password="x", first_name="First")
+            )
+            for i in range(users)
+        ]
+        await session.execute(insert(UserModel), rows)
+        await session.commit()
+
+    print(f"list_users page of {users} users x {repeats}")
+    for name, read in (
+        ("ORM entities + Email()", _orm_validated),
+        ("Core rows + Email()", _core_validated),
+        ("Core rows + from_trusted", _core_trusted),
+    ):
+        async def page(i: int) -> None:
+            assert len(await read(users)) == users
+
+        result = await measure_async(name, page, repeats, warmup=1)
+        print(f"  {name:>26}: {users * result.throughput:12,.0f} users/s (p50 page {result.p50_ms:8.1f} ms)")
+    await DatabaseManager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.repeats))
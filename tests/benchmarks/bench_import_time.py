@@ -0,0 +1,116 @@
+"""
+Import-time profile of the application entry point.
+
+Imports ``main`` in fresh interpreters under ``python -X importtime``,
+which is what every worker pays before it can serve its first request,
+and reports the total import time and the packages it is spent in.
+Each run is one sample; the results use the benchmark harness format so
+they can be saved and compared against a baseline like the suite's.
+
+Usage:
+    python -m tests.benchmarks.bench_import_time --runs 10
+    python -m tests.benchmarks.bench_import_time --save import-time.json
+    python -m tests.benchmarks.bench_import_time --baseline import-time.json
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from tests.benchmarks.harness import (
+    BenchmarkResult,
+    compare_results,
+    environment,
+    load_results,
+    save_results,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _import_main() -> Tuple[float, float, Dict[str, float]]:
+    """
+    Import ``main`` in a new interpreter.
+
+    Returns:
+        Process wall time and total import time in seconds, and the
+        time spent importing each top-level package's own modules
+    """
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'import-time.db')}")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    wall = time.perf_counter() - started
+
+    packages: Dict[str, float] = defaultdict(float)
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        packages[name.strip().split(".")[0]] += int(own) / 1e6
+    return wall, sum(packages.values()), packages
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters to sample")
+    parser.add_argument("--top", type=int, default=15, help="slowest packages to list")
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    # The first run compiles bytecode; keep it out of the samples
+    _import_main()
+    walls: List[float] = []
+    totals: List[float] = []
+    packages: Dict[str, List[float]] = defaultdict(list)
+    for _ in range(args.runs):
+        wall, total, per_package = _import_main()
+        walls.append(wall)
+        totals.append(total)
+        for name, seconds in per_package.items():
+            packages[name].append(seconds)
+
+    results = [
+        BenchmarkResult.from_latencies("import main", totals, sum(totals)),
+        BenchmarkResult.from_latencies("interpreter start + import", walls, sum(walls)),
+    ]
+    for result in results:
+        print(f"  {result.format()}")
+
+    print(f"Slowest packages to import (median of {args.runs} runs):")
+    ranked = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in ranked[:args.top]:
+        print(f"  {statistics.median(samples) * 1000:9.1f} ms  {name}")
+
+    if args.save:
+        save_results(args.save, results, metadata={"runs": args.runs})
+        print(f"Results saved to {args.save}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        if baseline.get("environment", {}).get("platform") != environment()["platform"]:
+            print("Warning: baseline was recorded on a different platform")
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,106 @@
+"""
+GET /api/v1/auth/me throughput with FastAPI's generic response encoding
+vs the fast JSON response path.
+
+First times the encoding step alone for one UserResponse: FastAPI's
+``serialize_response`` (revalidate, dump to JSON-compatible values) plus
+``JSONResponse`` rendering, against ``ModelJSONResponse`` rendering the
+model with its compiled serializer. Then measures requests/sec for a warm
+/me (user served from the cache) with FAST_JSON_RESPONSES off and on.
+
+Usage:
+    python -m tests.benchmarks.bench_json_responses --requests 3000 --rounds 3
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from typing import Any  # noqa: E402
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.api.responses import ModelJSONResponse  # noqa: E402
+from app.api.schemas import UserResponse  # noqa: E402
+from app.domain.models import User  # noqa: E402
+from app.infrastructure.config import settings  # noqa: E402
+from app.infrastructure.database import DatabaseManager  # noqa: E402
+from main import create_app  # noqa: E402
+from tests.benchmarks.harness import measure, measure_async  # noqa: E402
+
+PASSWORD = "bench-password-1"
+
+
+async def _encoding(iterations: int) -> None:
+    user = User.create(email="bench@example.com", hashed_password="x", first_name="Ada", last_name="Lovelace")
+    model = UserResponse(
+        id=user.id, email=str(user.email), first_name=user.first_name, last_name=user.last_name,
+        is_active=user.is_active, is_verified=user.is_verified, created_at=user.created_at,
+        last_login=user.created_at
+    )
+    field = create_response_field(name="Response_me", type_=UserResponse)
+
+    async def generic() -> bytes:
+        return JSONResponse(await serialize_response(field=field, response_content=model)).body
+
+    assert await generic() == ModelJSONResponse(model).body
+    results = [
+        await measure_async("generic", lambda i: generic(), iterations, warmup=100),
+        measure("compiled", lambda i: ModelJSONResponse(model).body, iterations, warmup=100),
+    ]
+    print(f"Encoding one UserResponse x {iterations}")
+    for result in results:
+        print(f"  {result.name:>9}: {result.mean_ms * 1000:6.2f} us per response")
+
+
+async def _requests_per_second(app: Any, token: str, requests: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def me(i: int) -> None:
+            response = await client.get("/api/v1/auth/me", headers=headers)
+            assert response.status_code == 200, response.text
+
+        result = await measure_async("me", me, requests, warmup=100)
+    return result.throughput
+
+
+async def main(requests: int, rounds: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+    await _encoding(requests * 10)
+
+    await DatabaseManager.initialize()
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await client.post("/api/v1/auth/signup", json={"email": "bench-me@example.com", "password": PASSWORD})
+        login = await client.post("/api/v1/auth/login", json={"email": "bench-me@example.com", "password": PASSWORD})
+        token = login.json()["access_token"]
+
+    # Alternate the settings over several rounds so drift affects both alike
+    throughputs = {False: [], True: []}
+    for _ in range(rounds):
+        for enabled in (False, True):
+            settings.FAST_JSON_RESPONSES = enabled
+            throughputs[enabled].append(await _requests_per_second(app, token, requests))
+    print(f"GET /me x {requests} x {rounds} rounds, warm user cache (best round)")
+    for enabled, results in throughputs.items():
+        print(f"  FAST_JSON_RESPONSES={enabled!s:>5}: {max(results):8.0f} requests/s")
+    await DatabaseManager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.rounds))
@@ -0,0 +1,110 @@
+"""
+Database round trips per GET /api/v1/auth/me.
+
+Counts statements plus transaction BEGIN/COMMIT/ROLLBACK issued per request
+with the read-only session (autocommit, no commit) and with the regular
+read-write session that get_current_user used before. The user cache is
+disabled so every request reaches the database.
+
+Usage:
+    python -m tests.benchmarks.bench_me_round_trips --requests 200
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from typing import Any, Dict  # noqa: E402
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.api.dependencies import get_readonly_user_repository, get_user_repository  # noqa: E402
+from app.domain.models import User  # noqa: E402
+from app.infrastructure.config import settings  # noqa: E402
+from app.infrastructure.database import AsyncSessionLocal, DatabaseManager, engine  # noqa: E402
+from app.infrastructure.repositories import SQLAlchemyUserRepository  # noqa: E402
+from app.infrastructure.security import JWTManager  # noqa: E402
+from main import create_app  # noqa: E402
+
+
+class RoundTripCounter:
+    """Counts statements and non-autocommit transaction control calls."""
+
+    def __init__(self):
+        self.counts = {"statements": 0, "begin": 0, "commit": 0, "rollback": 0}
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._on_statement)
+        for name in ("begin", "commit", "rollback"):
+            event.listen(sync_engine, name, self._transaction_listener(name))
+
+    def _on_statement(self, *args: Any) -> None:
+        self.counts["statements"] += 1
+
+    def _transaction_listener(self, name: str):
+        def listener(conn: Any) -> None:
+            # In autocommit mode the driver ignores BEGIN/COMMIT/ROLLBACK
+            if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+                self.counts[name] += 1
+        return listener
+
+    def reset(self) -> None:
+        for name in self.counts:
+            self.counts[name] = 0
+
+
+async def _run(app: Any, token: str, requests: int, counter: RoundTripCounter) -> Dict[str, float]:
+    counter.reset()
+    headers = {"Authorization": f"Bearer {token}"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/api/v1/auth/me", headers=headers)
+            assert response.status_code == 200, response.text
+        elapsed = time.perf_counter() - started
+    per_request = {name: count / requests for name, count in counter.counts.items()}
+    per_request["round_trips"] = sum(per_request.values())
+    per_request["requests_per_s"] = requests / elapsed
+    return per_request
+
+
+async def main(requests: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    settings.USER_CACHE_ENABLED = False
+    await DatabaseManager.initialize()
+    user = User.create(email="bench-me@example.com", hashed_password="not-used")
+    async with AsyncSessionLocal() as session:
+        await SQLAlchemyUserRepository(session).add(user)
+        await session.commit()
+    token = JWTManager.create_access_token(str(user.id))
+    counter = RoundTripCounter()
+
+    app = create_app()
+    read_only = await _run(app, token, requests, counter)
+    app.dependency_overrides[get_readonly_user_repository] = get_user_repository
+    read_write = await _run(app, token, requests, counter)
+    await DatabaseManager.close()
+
+    print(f"GET /me x {requests} (user cache disabled), per request:")
+    for name, result in (("read-write session", read_write), ("read-only session", read_only)):
+        print(
+            f"  {name:>18}: {result['round_trips']:.2f} round trips "
+            f"(statements {result['statements']:.2f}, begin {result['begin']:.2f}, "
+            f"commit {result['commit']:.2f}, rollback {result['rollback']:.2f}) | "
+            f"{result['requests_per_s']:8.1f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,101 @@
+"""
+Page latency at depth, OFFSET/LIMIT vs keyset pagination.
+
+Seeds a temporary SQLite database and times one page of users at the
+start of the table and at ``--depth`` rows in, read through
+``SQLAlchemyUserRepository.list_users`` (OFFSET/LIMIT) and through
+``list_users_page`` with the cursor of the preceding row. OFFSET pages
+slow down linearly with depth because skipped rows are still read;
+keyset pages seek through ``ix_users_created_at_id`` and stay flat.
+
+Usage:
+    python -m tests.benchmarks.bench_pagination --users 1000100 --depth 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from datetime import datetime, timedelta  # noqa: E402
+from typing import Optional  # noqa: E402
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.domain.models import User  # noqa: E402
+from app.domain.repository import encode_cursor  # noqa: E402
+from app.infrastructure.database import AsyncSessionLocal, DatabaseManager, UserModel  # noqa: E402
+from app.infrastructure.repositories import _USER_COLUMNS, SQLAlchemyUserRepository  # noqa: E402
+from tests.benchmarks.harness import measure_async  # noqa: E402
+
+BATCH_SIZE = 10000
+
+
+async def _seed(users: int) -> None:
+    base = datetime(2024, 1, 1)
+    async with AsyncSessionLocal() as session:
+        repo = SQLAlchemyUserRepository(session)
+        for start in range(0, users, BATCH_SIZE):
+            rows = []
+            for i in range(start, min(start + BATCH_SIZE, users)):
+                user = User.create(email=f"user{i}@example.com", hashed_password="x")
+                user.created_at = user.updated_at = base + timedelta(seconds=i)
+                rows.append(repo._to_row(user))
+            await session.execute(insert(UserModel), rows)
+        await session.commit()
+
+
+async def _cursor_at(depth: int) -> Optional[str]:
+    """Cursor whose page starts at row ``depth`` in (created_at, id) order."""
+    if depth == 0:
+        return None
+    async with AsyncSessionLocal() as session:
+        stmt = (
+            select(*_USER_COLUMNS)
+            .order_by(UserModel.created_at, UserModel.id)
+            .offset(depth - 1).limit(1)
+        )
+        row = (await session.execute(stmt)).first()
+        return encode_cursor(SQLAlchemyUserRepository._row_to_domain_model(row))
+
+
+async def main(users: int, depth: int, limit: int, repeats: int) -> None:
+    await DatabaseManager.initialize()
+    print(f"Seeding {users:,} users")
+    await _seed(users)
+
+    print(f"Page of {limit} users x {repeats}")
+    for position in (0, depth):
+        cursor = await _cursor_at(position)
+
+        async def offset_page(i: int) -> None:
+            async with AsyncSessionLocal() as session:
+                page = await SQLAlchemyUserRepository(session).list_users(limit=limit, offset=position)
+                assert len(page) == limit
+
+        async def keyset_page(i: int) -> None:
+            async with AsyncSessionLocal() as session:
+                page = await SQLAlchemyUserRepository(session).list_users_page(limit=limit, cursor=cursor)
+                assert len(page.users) == limit
+
+        for name, read in (("OFFSET/LIMIT", offset_page), ("keyset cursor", keyset_page)):
+            result = await measure_async(name, read, repeats, warmup=1)
+            print(f"  depth {position:>9,} {name:>14}: p50 {result.p50_ms:8.2f} ms, p95 {result.p95_ms:8.2f} ms")
+    await DatabaseManager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000100)
+    parser.add_argument("--depth", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    if args.depth + args.limit > args.users:
+        parser.error("--depth + --limit must not exceed --users")
+    asyncio.run(main(args.users, args.depth, args.limit, args.repeats))
@@ -0,0 +1,96 @@
+"""
+Event-loop latency under concurrent logins.
+
+Runs a burst of concurrent logins while a probe coroutine measures how late
+the event loop wakes it up. The "blocking" scenario verifies passwords inline
+on the event loop (the behaviour before the hashing pool existed); the
+"pooled" scenario goes through LoginService, which offloads bcrypt to the
+hashing pool.
+
+Usage:
+    python -m tests.benchmarks.bench_password_hashing --logins 32
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from app.domain.models import User
+from app.domain.usermanagement.login import LoginService
+from app.infrastructure.security import PasswordHasher, password_hashing_pool
+from tests.fakes import InMemoryUnitOfWork, InMemoryUserRepository
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark-password-1"
+PROBE_INTERVAL = 0.005
+
+
+async def _probe(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def _run_scenario(
+    login: Callable[[], Awaitable[None]],
+    logins: int
+) -> Dict[str, float]:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "elapsed_s": elapsed,
+        "logins_per_s": logins / elapsed,
+        "probe_samples": len(lags),
+        "loop_lag_p50_ms": statistics.median(lags_ms),
+        "loop_lag_p99_ms": lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))],
+        "loop_lag_max_ms": lags_ms[-1],
+    }
+
+
+async def main(logins: int) -> None:
+    user = User.create(email=EMAIL, hashed_password=PasswordHasher.hash(PASSWORD))
+    repo = InMemoryUserRepository([user])
+    service = LoginService(InMemoryUnitOfWork(repo))
+
+    async def blocking_login() -> None:
+        found = await repo.get_by_email(EMAIL)
+        assert found and PasswordHasher.verify(PASSWORD, found.hashed_password)
+
+    async def pooled_login() -> None:
+        await service.authenticate(EMAIL, PASSWORD)
+
+    results = {
+        "blocking": await _run_scenario(blocking_login, logins),
+        "pooled": await _run_scenario(pooled_login, logins),
+    }
+    password_hashing_pool.shutdown()
+
+    print(f"{logins} concurrent logins, pool={password_hashing_pool.stats()}")
+    for name, result in results.items():
+        print(
+            f"{name:>9}: {result['logins_per_s']:7.2f} logins/s | "
+            f"loop lag p50 {result['loop_lag_p50_ms']:8.2f} ms, "
+            f"p99 {result['loop_lag_p99_ms']:8.2f} ms, "
+            f"max {result['loop_lag_max_ms']:8.2f} ms "
+            f"({result['probe_samples']} probes)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
@@ -0,0 +1,90 @@
+"""
+Memory used by materialized users, slotted vs dict-backed models.
+
+Builds N users the way repository reads do (``User.from_trusted`` with
+distinct ids, emails, hashes and timestamps) and reports traced bytes
+per user with tracemalloc. For comparison the same users are built from
+dict-backed copies of the ``User``/``Email`` dataclasses, which is what the
+domain models were before they were slotted.
+
+Usage:
+    python -m tests.benchmarks.bench_user_memory --users 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Optional
+from uuid import UUID
+
+from app.domain.models import User
+
+
+@dataclass
+class _DictEmail:
+    value: str
+
+
+@dataclass
+class _DictUser:
+    id: UUID = field(default_factory=uuid.uuid4)
+    email: _DictEmail = None
+    hashed_password: str = ""
+    is_active: bool = True
+    is_verified: bool = False
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    last_login: Optional[datetime] = None
+    token_version: int = 0
+
+
+def _slotted(i: int, created_at: datetime) -> Any:
+    return User.from_trusted(
+        uuid.uuid4(), f"user{i}@example.com", f"$2b$12${i:053d}", True, False,
+        "First", None, created_at, created_at + timedelta(seconds=1), None, 0
+    )
+
+
+def _dict_backed(i: int, created_at: datetime) -> Any:
+    return _DictUser(
+        uuid.uuid4(), _DictEmail(f"user{i}@example.com"), f"$2b$12${i:053d}", True, False,
+        "First", None, created_at, created_at + timedelta(seconds=1), None, 0
+    )
+
+
+def _measure(build: Callable[[int, datetime], Any], users: int) -> float:
+    gc.collect()
+    base = datetime(2024, 1, 1)
+    tracemalloc.start()
+    started = time.perf_counter()
+    materialized: List[Any] = [build(i, base + timedelta(seconds=i)) for i in range(users)]
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del materialized
+    print(f"    built in {elapsed:.1f} s (tracing slows construction)")
+    return current / users
+
+
+def main(users: int) -> None:
+    print(f"Materializing {users:,} users")
+    results = {}
+    for name, build in (("dict-backed", _dict_backed), ("slotted", _slotted)):
+        print(f"  {name}:")
+        results[name] = _measure(build, users)
+        print(f"    {results[name]:8.1f} bytes/user, {results[name] * users / 2**20:8.1f} MiB total")
+    saved = results["dict-backed"] - results["slotted"]
+    print(f"  slotted saves {saved:.1f} bytes/user ({saved / results['dict-backed']:.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000000)
+    args = parser.parse_args()
+    main(args.users)
@@ -0,0 +1,230 @@
+"""
+Benchmark harness.
+
+Times a callable over a number of iterations, reports throughput and
+latency percentiles, saves results as JSON and compares them against a
+stored baseline.
+"""
+
+import asyncio
+import json
+import platform
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput and latency of one benchmark scenario."""
+
+    name: str
+    iterations: int
+    concurrency: int
+    elapsed_seconds: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_latencies(
+        cls,
+        name: str,
+        latencies: Sequence[float],
+        elapsed_seconds: float,
+        concurrency: int = 1
+    ) -> "BenchmarkResult":
+        """
+        Summarize per-call latencies.
+
+        Args:
+            name: Scenario name
+            latencies: Per-call latencies in seconds
+            elapsed_seconds: Wall time for all calls
+            concurrency: Number of concurrent callers
+
+        Returns:
+            Benchmark result
+        """
+        ordered = sorted(latencies)
+        return cls(
+            name=name,
+            iterations=len(ordered),
+            concurrency=concurrency,
+            elapsed_seconds=elapsed_seconds,
+            throughput=len(ordered) / elapsed_seconds if elapsed_seconds else 0.0,
+            p50_ms=percentile(ordered, 50) * 1000,
+            p95_ms=percentile(ordered, 95) * 1000,
+            p99_ms=percentile(ordered, 99) * 1000,
+            mean_ms=sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+            max_ms=ordered[-1] * 1000 if ordered else 0.0,
+        )
+
+    def format(self) -> str:
+        """Format the result as one report line."""
+        return (
+            f"{self.name:<28} {self.throughput:12,.1f} ops/s | "
+            f"p50 {self.p50_ms:9.3f} ms | p95 {self.p95_ms:9.3f} ms | "
+            f"p99 {self.p99_ms:9.3f} ms | n={self.iterations} c={self.concurrency}"
+        )
+
+
+def percentile(ordered: Sequence[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+
+    Args:
+        ordered: Values in ascending order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or 0.0 for no values
+    """
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def measure(
+    name: str,
+    func: Callable[[int], Any],
+    iterations: int,
+    warmup: int = 0
+) -> BenchmarkResult:
+    """
+    Time a synchronous callable.
+
+    Args:
+        name: Scenario name
+        func: Callable taking the iteration index
+        iterations: Number of timed calls
+        warmup: Number of untimed calls made first
+
+    Returns:
+        Benchmark result
+    """
+    for i in range(warmup):
+        func(-1 - i)
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        call_started = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - call_started)
+    return BenchmarkResult.from_latencies(name, latencies, time.perf_counter() - started)
+
+
+async def measure_async(
+    name: str,
+    func: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 0
+) -> BenchmarkResult:
+    """
+    Time a coroutine function with a fixed number of concurrent callers.
+
+    Args:
+        name: Scenario name
+        func: Coroutine function taking the iteration index
+        iterations: Number of timed calls, shared between the callers
+        concurrency: Number of concurrent callers
+        warmup: Number of untimed calls made first
+
+    Returns:
+        Benchmark result
+    """
+    for i in range(warmup):
+        await func(-1 - i)
+    latencies: List[float] = []
+    indexes = iter(range(iterations))
+
+    async def worker() -> None:
+        for i in indexes:
+            call_started = time.perf_counter()
+            await func(i)
+            latencies.append(time.perf_counter() - call_started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return BenchmarkResult.from_latencies(name, latencies, elapsed, concurrency)
+
+
+def environment() -> Dict[str, str]:
+    """Describe the machine the results were recorded on."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def save_results(path: str, results: List[BenchmarkResult], metadata: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Write results to a JSON file.
+
+    Args:
+        path: Output file path
+        results: Benchmark results
+        metadata: Extra run information stored alongside the results
+    """
+    document = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "metadata": metadata or {},
+        "results": {result.name: asdict(result) for result in results},
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Read a JSON file written by save_results."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Any],
+    tolerance: float
+) -> List[str]:
+    """
+    Find scenarios that regressed against a baseline.
+
+    A scenario regresses when its p95 latency grew, or its throughput
+    dropped, by more than ``tolerance`` (a fraction, e.g. 0.2 for 20%).
+    Scenarios missing from the baseline are not compared.
+
+    Args:
+        results: Current results
+        baseline: Document loaded with load_results
+        tolerance: Allowed relative slowdown
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    recorded = baseline.get("results", {})
+    for result in results:
+        previous = recorded.get(result.name)
+        if previous is None:
+            continue
+        if result.p95_ms > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result.name}: p95 {result.p95_ms:.3f} ms vs baseline {previous['p95_ms']:.3f} ms"
+            )
+        if result.throughput < previous["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: throughput {result.throughput:,.1f} ops/s "
+                f"vs baseline {previous['throughput']:,.1f} ops/s"
+            )
+    return regressions
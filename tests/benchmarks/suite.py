@@ -0,0 +1,221 @@
+"""
+Benchmark suite for the authentication hot paths.
+
+Drives signup, login, refresh, /me and password-reset confirmation
+through the real application factory against a temporary SQLite database,
+then times JWTManager and PasswordHasher in isolation. Bcrypt runs at the configured
+BCRYPT_ROUNDS, so results are comparable with production settings.
+
+Results can be saved as JSON and compared against a baseline recorded on
+the same machine; the run exits non-zero when any scenario's p95 latency
+or throughput regressed by more than the tolerance.
+
+Usage:
+    python -m tests.benchmarks.suite --save tests/benchmarks/baseline.json
+    python -m tests.benchmarks.suite --baseline tests/benchmarks/baseline.json
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+# The login scenario replays one account far beyond the login throttle
+os.environ.setdefault("LOGIN_RATE_LIMIT_ENABLED", "false")
+
+from typing import List  # noqa: E402
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.infrastructure.config import settings  # noqa: E402
+from app.infrastructure.database import DatabaseManager  # noqa: E402
+from app.infrastructure.security import JWTManager, PasswordHasher, password_hashing_pool  # noqa: E402
+from main import create_app  # noqa: E402
+from tests.benchmarks.harness import (  # noqa: E402
+    BenchmarkResult,
+    compare_results,
+    environment,
+    load_results,
+    measure,
+    measure_async,
+    save_results,
+)
+
+PASSWORD = "bench-password-1"
+NEW_PASSWORD = "bench-password-2"
+
+
+async def _signup(client: AsyncClient, email: str) -> str:
+    response = await client.post("/api/v1/auth/signup", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def _login(client: AsyncClient, email: str, password: str = PASSWORD) -> str:
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()["access_token"]
+
+
+async def run_http_benchmarks(iterations: int, hash_iterations: int, concurrency: int) -> List[BenchmarkResult]:
+    """
+    Benchmark the auth endpoints through the application factory.
+
+    Args:
+        iterations: Calls for endpoints that do not hash passwords
+        hash_iterations: Calls for endpoints that run bcrypt
+        concurrency: Concurrent clients
+
+    Returns:
+        One result per endpoint
+    """
+    app = create_app()
+    await DatabaseManager.initialize()
+    results = []
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def signup(i: int) -> None:
+            await _signup(client, f"bench-signup-{i}@example.com")
+
+        results.append(await measure_async(
+            "http.signup", signup, hash_iterations, concurrency, warmup=1
+        ))
+
+        await _signup(client, "bench-login@example.com")
+
+        async def login(i: int) -> None:
+            await _login(client, "bench-login@example.com")
+
+        results.append(await measure_async(
+            "http.login", login, hash_iterations, concurrency, warmup=1
+        ))
+
+        # One refresh token chain per concurrent client; each call rotates one
+        chains: asyncio.Queue = asyncio.Queue()
+        for _ in range(concurrency):
+            response = await client.post(
+                "/api/v1/auth/login", json={"email": "bench-login@example.com", "password": PASSWORD}
+            )
+            chains.put_nowait(response.json()["refresh_token"])
+
+        async def refresh(i: int) -> None:
+            response = await client.post("/api/v1/auth/refresh", json={"refresh_token": await chains.get()})
+            assert response.status_code == 200, response.text
+            chains.put_nowait(response.json()["refresh_token"])
+
+        results.append(await measure_async(
+            "http.refresh", refresh, iterations, concurrency, warmup=1
+        ))
+
+        headers = {"Authorization": f"Bearer {await _login(client, 'bench-login@example.com')}"}
+
+        async def me(i: int) -> None:
+            response = await client.get("/api/v1/auth/me", headers=headers)
+            assert response.status_code == 200, response.text
+
+        results.append(await measure_async(
+            "http.me", me, iterations, concurrency, warmup=10
+        ))
+
+        user_id = await _signup(client, "bench-reset@example.com")
+        reset_token = JWTManager.create_access_token(user_id, expires_delta=60)
+
+        async def reset_confirm(i: int) -> None:
+            response = await client.post(
+                "/api/v1/auth/password-reset/confirm",
+                json={"token": reset_token, "new_password": NEW_PASSWORD}
+            )
+            assert response.status_code == 200, response.text
+
+        results.append(await measure_async(
+            "http.password_reset_confirm", reset_confirm, hash_iterations, concurrency, warmup=1
+        ))
+    await DatabaseManager.close()
+    return results
+
+
+def run_component_benchmarks(iterations: int, hash_iterations: int) -> List[BenchmarkResult]:
+    """
+    Benchmark JWTManager and PasswordHasher without the HTTP stack.
+
+    Args:
+        iterations: Calls for JWT operations
+        hash_iterations: Calls for bcrypt operations
+
+    Returns:
+        One result per operation
+    """
+    results = [
+        measure("jwt.create_access_token", lambda i: JWTManager.create_access_token("bench-user"), iterations)
+    ]
+
+    token = JWTManager.create_access_token("bench-user")
+    JWTManager.configure_token_cache(0)
+    results.append(measure("jwt.verify_token", lambda i: JWTManager.verify_token(token), iterations))
+    JWTManager.configure_token_cache(settings.TOKEN_CACHE_SIZE)
+    results.append(measure(
+        "jwt.verify_token_cached", lambda i: JWTManager.verify_token(token), iterations, warmup=1
+    ))
+
+    results.append(measure("password.hash", lambda i: PasswordHasher.hash(PASSWORD), hash_iterations))
+    hashed = PasswordHasher.hash(PASSWORD)
+    results.append(measure("password.verify", lambda i: PasswordHasher.verify(PASSWORD, hashed), hash_iterations))
+    return results
+
+
+async def run_suite(iterations: int, hash_iterations: int, concurrency: int) -> List[BenchmarkResult]:
+    """Run every benchmark scenario."""
+    results = await run_http_benchmarks(iterations, hash_iterations, concurrency)
+    results.extend(run_component_benchmarks(iterations * 10, hash_iterations))
+    password_hashing_pool.shutdown()
+    return results
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500, help="calls per cheap HTTP scenario")
+    parser.add_argument("--hash-iterations", type=int, default=40, help="calls per bcrypt-bound scenario")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    # Per-request INFO logging would dominate the endpoint timings' output
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+    results = asyncio.run(run_suite(args.iterations, args.hash_iterations, args.concurrency))
+
+    print(f"bcrypt rounds={PasswordHasher.rounds}, jwt backend={JWTManager.get_backend().name}")
+    for result in results:
+        print(f"  {result.format()}")
+
+    if args.save:
+        save_results(args.save, results, metadata={
+            "bcrypt_rounds": PasswordHasher.rounds,
+            "jwt_backend": JWTManager.get_backend().name,
+            "concurrency": args.concurrency,
+        })
+        print(f"Results saved to {args.save}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        if baseline.get("environment", {}).get("platform") != environment()["platform"]:
+            print("Warning: baseline was recorded on a different platform")
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
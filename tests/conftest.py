@@ -0,0 +1,42 @@
+"""
+Shared pytest configuration.
+
+Points the application at an in-memory database, a cheap bcrypt cost and
+a per-IP login limit that the whole API suite (one client IP) stays under,
+before any application module reads its settings.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("LOGIN_RATE_LIMIT_IP_ATTEMPTS", "1000")
+
+import pytest_asyncio  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.infrastructure.database import Base  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def db_engine():
+    """Fresh in-memory SQLite engine with the schema created."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_session(db_engine):
+    """Session bound to the per-test in-memory database."""
+    session_factory = async_sessionmaker(
+        db_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,196 @@
+"""
+Test doubles shared by unit tests and benchmarks.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
+
+from app.domain.models import User
+from app.domain.repository import UnitOfWork, UserPage, UserRepository, decode_cursor, encode_cursor
+
+
+class InMemoryUserRepository(UserRepository):
+    """Dictionary-backed UserRepository for exercising domain services."""
+
+    def __init__(self, users: Optional[List[User]] = None):
+        self.users: Dict[UUID, User] = {user.id: user for user in users or []}
+        self.password_updates: List[UUID] = []
+
+    async def add(self, user: User) -> None:
+        self.users[user.id] = user
+
+    async def add_unique(self, user: User) -> bool:
+        if await self.exists_by_email(str(user.email)):
+            return False
+        await self.add(user)
+        return True
+
+    async def add_many(self, users: List[User]) -> List[User]:
+        return [user for user in users if not await self.add_unique(user)]
+
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        return self.users.get(user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        email = email.lower()
+        return next((u for u in self.users.values() if str(u.email) == email), None)
+
+    async def update(self, user: User) -> None:
+        self.users[user.id] = user
+
+    async def get_token_version(self, user_id: UUID) -> Optional[int]:
+        user = self.users.get(user_id)
+        return user.token_version if user else None
+
+    async def update_password(
+        self,
+        user_id: UUID,
+        hashed_password: str,
+        invalidate_tokens: bool = True
+    ) -> None:
+        self.password_updates.append(user_id)
+        if user_id in self.users:
+            self.users[user_id].update_password(hashed_password, invalidate_tokens)
+
+    async def delete(self, user_id: UUID) -> None:
+        self.users.pop(user_id, None)
+
+    async def list_users(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        is_active: Optional[bool] = None
+    ) -> List[User]:
+        users = [u for u in self.users.values() if is_active in (None, u.is_active)]
+        return users[offset:offset + limit]
+
+    async def list_users_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> UserPage:
+        users = sorted(
+            (u for u in self.users.values() if is_active in (None, u.is_active)),
+            key=lambda u: (u.created_at, str(u.id))
+        )
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            users = [u for u in users if (u.created_at, str(u.id)) > (position[0], str(position[1]))]
+        if len(users) <= limit:
+            return UserPage(users=users)
+        return UserPage(users=users[:limit], next_cursor=encode_cursor(users[limit - 1]))
+
+    async def stream_users(
+        self,
+        is_active: Optional[bool] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[User]:
+        users = [u for u in self.users.values() if is_active in (None, u.is_active)]
+        for user in sorted(users, key=lambda u: (u.created_at, str(u.id))):
+            yield user
+
+    async def exists_by_email(self, email: str) -> bool:
+        return await self.get_by_email(email) is not None
+
+
+class InMemoryUnitOfWork(UnitOfWork):
+    """UnitOfWork over an InMemoryUserRepository that counts commits."""
+
+    def __init__(self, users: Optional[InMemoryUserRepository] = None):
+        self._users = users if users is not None else InMemoryUserRepository()
+        self.commits = 0
+
+    async def __aenter__(self) -> "InMemoryUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        pass
+
+    @property
+    def users(self) -> InMemoryUserRepository:
+        return self._users
+
+
+class FakeRedis:
+    """
+    In-process stand-in for the subset of redis.asyncio used by the app.
+
+    Key expiry is not simulated; ``ttls`` records the requested TTLs.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.sorted_sets: Dict[str, Dict[str, float]] = {}
+        self.ttls: Dict[str, int] = {}
+        self.calls = 0
+
+    async def get(self, key: str) -> Any:
+        self.calls += 1
+        return self.values.get(key)
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None) -> None:
+        self.calls += 1
+        self.values[key] = value
+        if ex is not None:
+            self.ttls[key] = ex
+
+    async def delete(self, *keys: str) -> int:
+        self.calls += 1
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    async def exists(self, key: str) -> int:
+        self.calls += 1
+        return int(key in self.values)
+
+    async def zadd(self, key: str, mapping: Dict[str, float]) -> None:
+        self.calls += 1
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    async def zremrangebyscore(self, key: str, low: Any, high: Any) -> None:
+        self.calls += 1
+        members = self.sorted_sets.get(key, {})
+        for member, score in list(members.items()):
+            if float(low) <= score <= float(high):
+                del members[member]
+
+    async def zrangebyscore(self, key: str, low: Any, high: Any) -> List[bytes]:
+        self.calls += 1
+        members = self.sorted_sets.get(key, {})
+        return [
+            member.encode("utf-8")
+            for member, score in sorted(members.items(), key=lambda item: item[1])
+            if float(low) <= score <= float(high)
+        ]
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakePipeline:
+    """Queues FakeRedis calls and runs them on execute()."""
+
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands: List[Any] = []
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self.redis, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self.commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> List[Any]:
+        return [await method(*args, **kwargs) for method, args, kwargs in self.commands]
@@ -0,0 +1,416 @@
+"""
+Tests for the HTTP API exercised through the application factory.
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+
+from app.api.admin import _encode_csv
+from app.api.dependencies import get_signup_service
+from app.domain.models import User
+from app.infrastructure.config import settings
+from app.infrastructure.database import DatabaseManager, ReadOnlySessionLocal, engine
+from app.infrastructure.security import JWTManager
+from main import create_app
+
+PASSWORD = "secret-password-1"
+
+
+@pytest.fixture
+def app():
+    """Fresh application instance."""
+    return create_app()
+
+
+@pytest_asyncio.fixture
+async def client(app):
+    """HTTP client bound to the application and an in-memory database."""
+    await DatabaseManager.initialize()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    await DatabaseManager.close()
+
+
+async def _signup_and_login(client, email: str) -> str:
+    response = await client.post(
+        "/api/v1/auth/signup", json={"email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 201, response.text
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["access_token"]
+
+
+@pytest.mark.asyncio
+async def test_request_id_header(client):
+    """Test that responses carry the proxy's request id, or a generated one."""
+    response = await client.get("/health", headers={"X-Request-ID": "proxy-id.1"})
+    assert response.headers["X-Request-ID"] == "proxy-id.1"
+
+    response = await client.get("/health", headers={"X-Request-ID": "not a valid id"})
+    assert len(response.headers["X-Request-ID"]) == 32
+
+
+@pytest.mark.asyncio
+async def test_metrics(client, monkeypatch):
+    """Test that /metrics needs the admin key and reports route, database, crypto and throttle metrics."""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-key")
+    await _signup_and_login(client, "metrics@example.com")
+    assert (await client.get("/metrics")).status_code == 403
+
+    response = await client.get("/metrics", headers={"X-Admin-Key": "admin-key"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/auth/login",status="200"}' in body
+    assert 'http_requests_in_progress{method="GET"}' in body
+    assert 'db_statement_duration_seconds_count{operation="INSERT"}' in body
+    assert 'password_hash_duration_seconds_count{operation="verify"}' in body
+    assert 'jwt_duration_seconds_count{operation="encode"}' in body
+    assert 'login_attempts_total{outcome="admitted"}' in body
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(monkeypatch):
+    """Test that responses report the request's DB time and query count."""
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+    await DatabaseManager.initialize()
+    async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/auth/signup", json={"email": "timing@example.com", "password": PASSWORD}
+        )
+    await DatabaseManager.close()
+
+    assert response.status_code == 201
+    db_timing, app_timing = response.headers["Server-Timing"].split(", ")
+    assert db_timing.startswith("db;dur=")
+    assert db_timing.endswith('queries"') and 'desc="0 queries"' not in db_timing
+    assert app_timing.startswith("app;dur=")
+
+
+@pytest.mark.asyncio
+async def test_internal_stats(client, monkeypatch):
+    """Test that the internal stats endpoint needs the admin key and reports pool and cache metrics."""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-key")
+    assert (await client.get("/internal/stats")).status_code == 403
+
+    response = await client.get("/internal/stats", headers={"X-Admin-Key": "admin-key"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert {"db_pool", "password_hashing", "user_cache", "token_cache"} <= body.keys()
+    assert "checked_out" in body["db_pool"]
+
+
+@pytest.mark.asyncio
+async def test_me_returns_current_user(client):
+    """Test that /me resolves the user behind the bearer token."""
+    token = await _signup_and_login(client, "me@example.com")
+
+    response = await client.get(
+        "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "me@example.com"
+
+
+@pytest.mark.asyncio
+async def test_me_rejects_invalid_token(client):
+    """Test that /me returns 401 for a bad token."""
+    response = await client.get(
+        "/api/v1/auth/me", headers={"Authorization": "Bearer not-a-token"}
+    )
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_readonly_session_uses_autocommit():
+    """Test that read-only sessions skip transaction round trips."""
+    async with ReadOnlySessionLocal() as session:
+        conn = await session.connection()
+        assert conn.sync_connection.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+        assert session.sync_session.autoflush is False
+    await DatabaseManager.close()
+
+
+@pytest.mark.asyncio
+async def test_signup_duplicate_email_returns_conflict(client):
+    """Test that a duplicate signup maps to 409 instead of a server error."""
+    payload = {"email": "dup@example.com", "password": PASSWORD}
+
+    assert (await client.post("/api/v1/auth/signup", json=payload)).status_code == 201
+    response = await client.post("/api/v1/auth/signup", json=payload)
+
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_login_timestamp_is_persisted_after_flush(client):
+    """Test that /login records last_login through the write-behind buffer."""
+    from app.infrastructure.login_tracker import last_login_buffer
+
+    token = await _signup_and_login(client, "last-login@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.get("/api/v1/auth/me", headers=headers)
+
+    assert await last_login_buffer.flush() >= 1
+    response = await client.get("/api/v1/auth/me", headers=headers)
+
+    assert response.json()["last_login"] is not None
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_token(client):
+    """Test that a token is rejected after logging out with it."""
+    token = await _signup_and_login(client, "logout@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 401
+    response = await client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_issues_new_tokens_and_logout_ends_the_family(client):
+    """Test refresh rotation and that logout revokes the refresh tokens too."""
+    await _signup_and_login(client, "refresh@example.com")
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": "refresh@example.com", "password": PASSWORD}
+    )
+    refresh_token = response.json()["refresh_token"]
+    assert refresh_token
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200, response.text
+    tokens = response.json()
+
+    response = await client.post(
+        "/api/v1/auth/logout", headers={"Authorization": f"Bearer {tokens['access_token']}"}
+    )
+    assert response.status_code == 200
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_me_is_served_from_claims_and_caches(client):
+    """Test that a warm /me request issues no SQL statements."""
+    token = await _signup_and_login(client, "warm@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.get("/api/v1/auth/me", headers=headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_password_reset_invalidates_issued_tokens(client):
+    """Test that tokens issued before a password change are rejected."""
+    await _signup_and_login(client, "reset@example.com")
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": "reset@example.com", "password": PASSWORD}
+    )
+    tokens = response.json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    user_id = (await client.get("/api/v1/auth/me", headers=headers)).json()["id"]
+
+    reset_token = JWTManager.create_access_token(user_id, expires_delta=5)
+    response = await client.post(
+        "/api/v1/auth/password-reset/confirm",
+        json={"token": reset_token, "new_password": "another-password-2"}
+    )
+    assert response.status_code == 200
+
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 401
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_throttle_returns_429_before_checking_password(app, client, monkeypatch):
+    """Test that throttled logins get 429 with Retry-After and skip bcrypt."""
+    from app.api.dependencies import get_login_throttle
+    from app.infrastructure.rate_limit import InMemoryRateLimiter, LoginThrottle
+    from app.infrastructure.security import PasswordHasher
+
+    throttle = LoginThrottle(
+        by_email=InMemoryRateLimiter(limit=1, window_seconds=60),
+        by_ip=InMemoryRateLimiter(limit=100, window_seconds=60),
+    )
+    app.dependency_overrides[get_login_throttle] = lambda: throttle
+    payload = {"email": "throttled@example.com", "password": "wrong-password-1"}
+
+    assert (await client.post("/api/v1/auth/login", json=payload)).status_code == 401
+    verify_calls = []
+    monkeypatch.setattr(PasswordHasher, "verify", lambda *args: verify_calls.append(args))
+    response = await client.post("/api/v1/auth/login", json=payload)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert verify_calls == []
+
+
+def test_client_ip_honours_proxy_headers_only_from_trusted_peers():
+    """Test that forwarded headers from untrusted peers are ignored."""
+    from starlette.requests import Request
+
+    from app.api.dependencies import get_client_ip
+
+    def request(peer: str, headers: dict) -> Request:
+        return Request({
+            "type": "http",
+            "client": (peer, 1234),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        })
+
+    assert get_client_ip(request("10.0.0.5", {"X-Real-IP": "203.0.113.7"})) == "203.0.113.7"
+    assert get_client_ip(request("10.0.0.5", {"X-Forwarded-For": "1.1.1.1, 203.0.113.7"})) == "203.0.113.7"
+    assert get_client_ip(request("198.51.100.1", {"X-Real-IP": "203.0.113.7"})) == "198.51.100.1"
+
+
+@pytest.mark.asyncio
+async def test_admin_users_requires_key_and_pages(client, monkeypatch):
+    """Test that the admin listing checks X-Admin-Key and follows cursors."""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-key")
+    for i in range(3):
+        response = await client.post(
+            "/api/v1/auth/signup", json={"email": f"admin{i}@example.com", "password": PASSWORD}
+        )
+        assert response.status_code == 201
+
+    assert (await client.get("/api/v1/admin/users")).status_code == 403
+    assert (await client.get("/api/v1/admin/users", headers={"X-Admin-Key": "wrong"})).status_code == 403
+
+    headers = {"X-Admin-Key": "admin-key"}
+    first = (await client.get("/api/v1/admin/users", params={"limit": 2}, headers=headers)).json()
+    second = (await client.get(
+        "/api/v1/admin/users", params={"limit": 2, "cursor": first["next_cursor"]}, headers=headers
+    )).json()
+    bad = await client.get("/api/v1/admin/users", params={"cursor": "bogus"}, headers=headers)
+
+    emails = [user["email"] for user in first["users"] + second["users"]]
+    assert sorted(emails) == [f"admin{i}@example.com" for i in range(3)]
+    assert second["next_cursor"] is None
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_admin_export_streams_ndjson_and_csv(client, monkeypatch):
+    """Test that the export streams every user without credentials."""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-key")
+    headers = {"X-Admin-Key": "admin-key"}
+    await client.post("/api/v1/auth/signup", json={"email": "export@example.com", "password": PASSWORD})
+
+    ndjson = await client.get("/api/v1/admin/users/export", headers=headers)
+    csv_export = await client.get("/api/v1/admin/users/export", params={"format": "csv"}, headers=headers)
+
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [row["email"] for row in rows] == ["export@example.com"]
+    assert "hashed_password" not in rows[0]
+    lines = csv_export.text.splitlines()
+    assert lines[0].startswith("id,email,first_name")
+    assert lines[1].split(",")[1] == "export@example.com"
+    assert (await client.get("/api/v1/admin/users/export", params={"format": "xml"}, headers=headers)).status_code == 422
+
+
+def test_admin_csv_export_neutralizes_formulas():
+    """Test that CSV cells that spreadsheets would evaluate are quoted."""
+    user = User.create(email="f@example.com", hashed_password="hash", first_name="=cmd()")
+
+    assert ",'=cmd()," in _encode_csv([user])
+
+
+@pytest.mark.asyncio
+async def test_admin_import_creates_users_from_body(client, monkeypatch):
+    """Test that an imported user can log in with their password."""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-key")
+    body = "email,password\nimported@example.com,{}\nimported@example.com,{}\n".format(PASSWORD, PASSWORD)
+
+    response = await client.post(
+        "/api/v1/admin/users/import", params={"format": "csv"},
+        content=body.encode(), headers={"X-Admin-Key": "admin-key"}
+    )
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["imported"], report["duplicates"]) == (1, 1)
+    login = await client.post("/api/v1/auth/login", json={"email": "imported@example.com", "password": PASSWORD})
+    assert login.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_signup_persists_profile(client):
+    """Test that names sent at signup are stored, not only echoed back."""
+    response = await client.post("/api/v1/auth/signup", json={
+        "email": "profile@example.com", "password": PASSWORD, "first_name": "Ada", "last_name": "Lovelace"
+    })
+    assert response.status_code == 201
+    login = await client.post("/api/v1/auth/login", json={"email": "profile@example.com", "password": PASSWORD})
+
+    me = await client.get(
+        "/api/v1/auth/me", headers={"Authorization": f"Bearer {login.json()['access_token']}"}
+    )
+
+    assert (me.json()["first_name"], me.json()["last_name"]) == ("Ada", "Lovelace")
+
+
+@pytest.mark.asyncio
+async def test_fast_json_responses_match_generic_encoding(client, monkeypatch):
+    """Test that the fast response path produces the same bytes as FastAPI's."""
+    token = await _signup_and_login(client, "fast@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    fast = await client.get("/api/v1/auth/me", headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+    generic = await client.get("/api/v1/auth/me", headers=headers)
+
+    assert fast.status_code == generic.status_code == 200
+    assert fast.headers["content-type"] == generic.headers["content-type"] == "application/json"
+    assert fast.content == generic.content
+
+
+@pytest.mark.asyncio
+async def test_signup_errors_keep_credentials_out_of_logs(app, client, caplog):
+    """Test that a failed signup logs neither the email nor the database parameters."""
+    class FailingSignup:
+        async def register(self, email, password, first_name=None, last_name=None):
+            raise RuntimeError(f"insert failed for {email}")
+
+    app.dependency_overrides[get_signup_service] = lambda: FailingSignup()
+    response = await client.post(
+        "/api/v1/auth/signup", json={"email": "leak@example.com", "password": PASSWORD}
+    )
+
+    assert response.status_code == 500
+    assert "Signup error: RuntimeError" in caplog.text
+    assert "leak@example.com" not in caplog.text
+
+    with pytest.raises(DBAPIError) as raised:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT * FROM missing WHERE email = :email"), {"email": "leak@example.com"})
+    assert "leak@example.com" not in str(raised.value)
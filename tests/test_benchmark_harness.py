@@ -0,0 +1,81 @@
+"""
+Tests for the benchmark harness used by tests/benchmarks/suite.py.
+"""
+
+import pytest
+
+from tests.benchmarks.harness import (
+    BenchmarkResult,
+    compare_results,
+    load_results,
+    measure,
+    measure_async,
+    percentile,
+    save_results,
+)
+
+
+def _result(name: str = "scenario", p95_ms: float = 10.0, throughput: float = 100.0) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name, iterations=10, concurrency=1, elapsed_seconds=0.1, throughput=throughput,
+        p50_ms=5.0, p95_ms=p95_ms, p99_ms=p95_ms, mean_ms=5.0, max_ms=p95_ms
+    )
+
+
+def test_percentile_uses_nearest_rank():
+    """Test that percentiles pick an observed value by nearest rank."""
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_measure_counts_timed_calls_only():
+    """Test that warmup calls are not included in the result."""
+    calls = []
+
+    result = measure("noop", calls.append, iterations=5, warmup=2)
+
+    assert result.iterations == 5
+    assert calls == [-1, -2, 0, 1, 2, 3, 4]
+    assert result.p50_ms <= result.p95_ms <= result.p99_ms <= result.max_ms
+
+
+@pytest.mark.asyncio
+async def test_measure_async_shares_iterations_between_callers():
+    """Test that concurrent callers run each iteration exactly once."""
+    seen = []
+
+    async def call(i: int) -> None:
+        seen.append(i)
+
+    result = await measure_async("noop", call, iterations=20, concurrency=4)
+
+    assert result.iterations == 20
+    assert result.concurrency == 4
+    assert sorted(seen) == list(range(20))
+
+
+def test_compare_results_flags_latency_and_throughput_regressions(tmp_path):
+    """Test regressions are reported beyond the tolerance only."""
+    path = str(tmp_path / "baseline.json")
+    save_results(path, [_result("fast"), _result("slow"), _result("starved")])
+    baseline = load_results(path)
+
+    regressions = compare_results(
+        [
+            _result("fast", p95_ms=11.0, throughput=90.0),
+            _result("slow", p95_ms=13.0),
+            _result("starved", throughput=70.0),
+            _result("new", p95_ms=1000.0),
+        ],
+        baseline,
+        tolerance=0.2
+    )
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("slow: p95")
+    assert regressions[1].startswith("starved: throughput")
@@ -0,0 +1,87 @@
+"""
+Tests for the caching infrastructure module.
+"""
+
+import json
+
+import pytest
+
+from app.domain.models import User
+from app.infrastructure.cache import TTLCache, UserCache, _serialize_user
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries disappear after their TTL."""
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    clock.now = 5
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_honours_explicit_expiry():
+    """Test that a per-entry expiry overrides the default TTL."""
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=60, clock=clock)
+    cache.set("a", 1, expires_at=2)
+
+    clock.now = 1
+    assert cache.get("a") == 1
+    clock.now = 2
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_user_cache_returns_copies():
+    """Test that callers cannot mutate the cached user."""
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    user = User.create(email="a@example.com", hashed_password="hash")
+    await cache.set(user)
+
+    cached = await cache.get(user.id)
+    cached.deactivate()
+
+    assert (await cache.get(user.id)).is_active
+    await cache.invalidate(user.id)
+    assert await cache.get(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_user_cache_never_stores_password_hash():
+    """Test that cached users come back without their password hash."""
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    user = User.create(email="a@example.com", hashed_password="hash")
+    await cache.set(user)
+
+    assert (await cache.get(user.id)).hashed_password == ""
+    assert user.hashed_password == "hash"
+    assert "hash" not in json.loads(_serialize_user(user)).values()
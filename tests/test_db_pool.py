@@ -0,0 +1,80 @@
+"""
+Tests for database connection pool configuration and monitoring.
+"""
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure.config import Settings
+from app.infrastructure.db_pool import (
+    DEFAULT_POOL_SIZE,
+    InstrumentedAsyncQueuePool,
+    PoolMonitor,
+    engine_options,
+    pool_monitor,
+)
+
+
+def test_engine_options_leave_sqlite_pool_alone():
+    """Test that SQLite keeps the dialect's default pool."""
+    settings = Settings(DATABASE_URL="sqlite+aiosqlite:///./test.db")
+    assert engine_options(settings) == {}
+
+
+def test_engine_options_for_postgres():
+    """Test per-dialect defaults and overrides for server databases."""
+    defaults = engine_options(Settings(DATABASE_URL="postgresql+asyncpg://u:p@db/app"))
+    assert defaults["poolclass"] is InstrumentedAsyncQueuePool
+    assert defaults["pool_size"] == DEFAULT_POOL_SIZE
+    assert defaults["pool_pre_ping"] is True
+
+    tuned = engine_options(Settings(
+        DATABASE_URL="postgresql+asyncpg://u:p@db/app",
+        DB_POOL_SIZE=20,
+        DB_MAX_OVERFLOW=0,
+        DB_POOL_TIMEOUT=2.5,
+    ))
+    assert tuned["pool_size"] == 20
+    assert tuned["max_overflow"] == 0
+    assert tuned["pool_timeout"] == 2.5
+
+
+@pytest.mark.asyncio
+async def test_pool_monitor_counts_checkouts():
+    """Test that pool events update the checked-out counters."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monitor = PoolMonitor()
+    monitor.attach(engine.sync_engine)
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert monitor.stats()["checked_out"] == 1
+    await engine.dispose()
+
+    stats = monitor.stats()
+    assert stats["checkouts"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["peak_checked_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_timeouts(tmp_path):
+    """Test that checkout timeouts and waits are recorded."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    timeouts_before = pool_monitor.timeouts
+
+    async with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+    await engine.dispose()
+
+    assert pool_monitor.timeouts == timeouts_before + 1
+    assert pool_monitor.max_wait_seconds >= 0.05
@@ -0,0 +1,52 @@
+"""
+Tests for the import file readers.
+"""
+
+import pytest
+
+from app.infrastructure.import_files import aiter_lines, read_import_records
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _read(data: bytes, import_format: str, chunk_size: int = 7):
+    chunks = _chunks(*(data[i:i + chunk_size] for i in range(0, len(data), chunk_size)))
+    return [record async for record in read_import_records(aiter_lines(chunks), import_format)]
+
+
+@pytest.mark.asyncio
+async def test_reads_ndjson_across_chunk_boundaries():
+    """Test that records split across chunks parse, and bad lines are flagged."""
+    data = (
+        b'{"email": "a@example.com", "password": "pw", "is_verified": true}\r\n'
+        b"\n"
+        b"not json\n"
+        b'{"email": "b@example.com", "password_hash": "$2b$04$x"}'
+    )
+
+    records = await _read(data, "ndjson")
+
+    assert [(r.line, r.email, r.error) for r in records] == [
+        (1, "a@example.com", None), (3, None, "malformed-json"), (4, "b@example.com", None)
+    ]
+    assert records[0].is_verified and records[2].password_hash == "$2b$04$x"
+
+
+@pytest.mark.asyncio
+async def test_reads_csv_with_header():
+    """Test that CSV columns map by header name and ragged rows are flagged."""
+    data = (
+        b"Email,Password,First_Name,is_verified\n"
+        b'a@example.com,pw,"Smith, Ada",yes\n'
+        b"b@example.com,pw\n"
+    )
+
+    records = await _read(data, "csv")
+
+    assert [(r.line, r.email, r.first_name, r.is_verified, r.error) for r in records] == [
+        (2, "a@example.com", "Smith, Ada", True, None),
+        (3, None, None, False, "wrong-column-count"),
+    ]
@@ -0,0 +1,68 @@
+"""
+Tests for the JWT backends.
+"""
+
+import time
+
+import pytest
+from jose import ExpiredSignatureError, JWTError
+
+from app.infrastructure.jwt_backends import (
+    HS256JWTBackend,
+    JoseJWTBackend,
+    create_jwt_backend,
+)
+
+SECRET = "test-secret"
+
+
+def _claims(exp_offset: int = 60) -> dict:
+    now = int(time.time())
+    return {"sub": "user-1", "iat": now, "exp": now + exp_offset, "type": "access_token"}
+
+
+@pytest.mark.parametrize(
+    ("encoder", "decoder"),
+    [
+        (HS256JWTBackend(SECRET), JoseJWTBackend(SECRET, "HS256")),
+        (JoseJWTBackend(SECRET, "HS256"), HS256JWTBackend(SECRET)),
+        (HS256JWTBackend(SECRET), HS256JWTBackend(SECRET)),
+    ],
+)
+def test_backends_are_interchangeable(encoder, decoder):
+    """Test that tokens from one backend decode with the other."""
+    claims = _claims()
+    assert decoder.decode(encoder.encode(claims)) == claims
+
+
+@pytest.mark.parametrize("backend", [HS256JWTBackend(SECRET), JoseJWTBackend(SECRET, "HS256")])
+def test_backends_reject_bad_tokens(backend):
+    """Test that expired, tampered and foreign-key tokens are rejected."""
+    with pytest.raises(ExpiredSignatureError):
+        backend.decode(backend.encode(_claims(exp_offset=-60)))
+
+    token = backend.encode(_claims())
+    header, payload, signature = token.split(".")
+    tampered = ".".join([header, payload[:-2] + "xx", signature])
+    with pytest.raises(JWTError):
+        backend.decode(tampered)
+
+    with pytest.raises(JWTError):
+        backend.decode(HS256JWTBackend("other-secret").encode(_claims()))
+
+    with pytest.raises(JWTError):
+        backend.decode("not-a-token")
+
+
+def test_native_backend_rejects_other_algorithms():
+    """Test that the native backend refuses tokens signed with another alg."""
+    token = JoseJWTBackend(SECRET, "HS512").encode(_claims())
+    with pytest.raises(JWTError):
+        HS256JWTBackend(SECRET).decode(token)
+
+
+def test_create_jwt_backend_falls_back_to_jose():
+    """Test that non-HS256 algorithms always use python-jose."""
+    assert isinstance(create_jwt_backend("native", SECRET, "HS256"), HS256JWTBackend)
+    assert isinstance(create_jwt_backend("native", SECRET, "HS512"), JoseJWTBackend)
+    assert isinstance(create_jwt_backend("jose", SECRET, "HS256"), JoseJWTBackend)
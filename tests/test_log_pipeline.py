@@ -0,0 +1,81 @@
+"""
+Tests for the queue-based log pipeline.
+"""
+
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+from app.infrastructure.log_pipeline import LogPipeline, request_id_var
+
+
+@pytest.fixture
+def pipeline_logger():
+    """Isolated logger with a pipeline writing to a buffer."""
+    logger = logging.getLogger("tests.log_pipeline")
+    logger.propagate = False
+    stream = io.StringIO()
+    pipeline = LogPipeline()
+    yield pipeline, logger, stream
+    pipeline.stop()
+    logger.removeHandler(pipeline.handler)
+
+
+class _Renders:
+    """Records the thread its message argument is rendered on."""
+
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self) -> str:
+        self.thread = threading.current_thread()
+        return "rendered"
+
+
+def test_records_are_formatted_as_json_on_the_writer_thread(pipeline_logger):
+    """Test that messages are rendered lazily off the logging thread."""
+    pipeline, logger, stream = pipeline_logger
+    pipeline.install("INFO", "json", stream=stream, logger=logger)
+    argument = _Renders()
+
+    token = request_id_var.set("req-1")
+    try:
+        logger.info("User logged in: %s", argument, extra={"user_id": "42"})
+    finally:
+        request_id_var.reset(token)
+    logger.debug("Below the level")
+    pipeline.stop()
+
+    [line] = stream.getvalue().splitlines()
+    event = json.loads(line)
+    assert event["event"] == "User logged in: rendered"
+    assert event["level"] == "info"
+    assert event["logger"] == "tests.log_pipeline"
+    assert event["request_id"] == "req-1"
+    assert event["user_id"] == "42"
+    assert "timestamp" in event
+    assert argument.thread is not threading.current_thread()
+
+
+def test_sampling_keeps_whole_requests_and_all_warnings(pipeline_logger):
+    """Test that sampling drops request INFO logs only."""
+    pipeline, logger, stream = pipeline_logger
+    pipeline.install("INFO", "text", sample_rate=0.0, stream=stream, logger=logger)
+
+    token = request_id_var.set("req-2")
+    try:
+        logger.info("Sampled out")
+        logger.warning("Kept warning")
+    finally:
+        request_id_var.reset(token)
+    logger.info("Kept outside requests")
+    pipeline.stop()
+
+    output = stream.getvalue()
+    assert "Sampled out" not in output
+    assert "[req-2] Kept warning" in output
+    assert "[-] Kept outside requests" in output
+    assert pipeline.stats()["sampled_out"] == 1
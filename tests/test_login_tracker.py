@@ -0,0 +1,88 @@
+"""
+Tests for the last_login write-behind buffer.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.models import User
+from app.infrastructure.cache import UserCache
+from app.infrastructure.login_tracker import LastLoginBuffer
+from app.infrastructure.repositories import SQLAlchemyUserRepository
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _add_users(session_factory, count: int):
+    users = [User.create(email=f"user{i}@example.com", hashed_password="hash") for i in range(count)]
+    async with session_factory() as session:
+        repo = SQLAlchemyUserRepository(session)
+        for user in users:
+            await repo.add(user)
+        await session.commit()
+    return users
+
+
+async def _last_login(session_factory, user):
+    async with session_factory() as session:
+        return (await SQLAlchemyUserRepository(session).get_by_id(user.id)).last_login
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_latest_timestamp_per_user(session_factory):
+    """Test that only the newest buffered login per user is written."""
+    first, second = await _add_users(session_factory, 2)
+    buffer = LastLoginBuffer(session_factory, flush_interval=60, flush_threshold=100)
+    earlier = datetime(2024, 1, 1, 12, 0)
+    later = earlier + timedelta(minutes=5)
+
+    buffer.record(first.id, later)
+    buffer.record(first.id, earlier)
+    buffer.record(second.id, earlier)
+    assert buffer.stats()["buffered"] == 2
+
+    assert await buffer.flush() == 2
+    assert await _last_login(session_factory, first) == later
+    assert await _last_login(session_factory, second) == earlier
+    assert buffer.stats()["buffered"] == 0
+    assert buffer.stats()["flushes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_threshold_triggers_background_flush(session_factory):
+    """Test that reaching the size threshold flushes without waiting."""
+    users = await _add_users(session_factory, 3)
+    buffer = LastLoginBuffer(session_factory, flush_interval=60, flush_threshold=3)
+    buffer.start()
+    try:
+        for user in users:
+            buffer.record(user.id, datetime(2024, 1, 1))
+        for _ in range(50):
+            if buffer.stats()["flushes"]:
+                break
+            await asyncio.sleep(0.01)
+        assert buffer.stats()["flushed_rows"] == 3
+    finally:
+        await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_buffer_and_invalidates_cache(session_factory):
+    """Test that shutdown flushes pending logins and drops cached users."""
+    (user,) = await _add_users(session_factory, 1)
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    await cache.set(user)
+    buffer = LastLoginBuffer(session_factory, flush_interval=60, flush_threshold=100, cache=cache)
+    buffer.start()
+
+    buffer.record(user.id, datetime(2024, 1, 1))
+    await buffer.stop()
+
+    assert await _last_login(session_factory, user) == datetime(2024, 1, 1)
+    assert await cache.get(user.id) is None
@@ -0,0 +1,100 @@
+"""
+Tests for the Alembic migrations and the startup schema check.
+"""
+
+import os
+
+import pytest
+import pytest_asyncio
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure import database
+from app.infrastructure.database import SCHEMA_REVISION, Base, DatabaseManager, SchemaOutOfDate
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic.ini")
+
+
+def _config(connection) -> Config:
+    config = Config(ALEMBIC_INI)
+    config.attributes["connection"] = connection
+    config.attributes["configure_logging"] = False
+    return config
+
+
+@pytest_asyncio.fixture
+async def empty_engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    yield engine
+    await engine.dispose()
+
+
+def test_schema_revision_is_the_migration_head():
+    """Test that SCHEMA_REVISION names the latest migration."""
+    assert ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head() == SCHEMA_REVISION
+
+
+@pytest.mark.asyncio
+async def test_migrations_match_the_models(empty_engine):
+    """Test that upgrading to head produces the schema the models declare."""
+    def upgrade_and_compare(connection):
+        command.upgrade(_config(connection), "head")
+        return compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+    async with empty_engine.begin() as conn:
+        assert await conn.run_sync(upgrade_and_compare) == []
+
+
+@pytest.mark.asyncio
+async def test_verify_schema_requires_the_current_revision(empty_engine, monkeypatch):
+    """Test that startup in migrations mode refuses an unmigrated database."""
+    monkeypatch.setattr(database, "engine", empty_engine)
+    monkeypatch.setattr(database.settings, "DATABASE_SCHEMA_MODE", "migrations")
+
+    with pytest.raises(SchemaOutOfDate):
+        await DatabaseManager.initialize()
+
+    async with empty_engine.begin() as conn:
+        await conn.run_sync(lambda connection: command.upgrade(_config(connection), "0001"))
+    with pytest.raises(SchemaOutOfDate, match="0001"):
+        await DatabaseManager.initialize()
+
+    async with empty_engine.begin() as conn:
+        await conn.run_sync(lambda connection: command.upgrade(_config(connection), "head"))
+    await DatabaseManager.initialize()
+
+
+@pytest.mark.asyncio
+async def test_upgrade_adds_token_version_to_existing_users(empty_engine):
+    """Test that users created before token versions start at version 0."""
+    async with empty_engine.begin() as conn:
+        await conn.run_sync(lambda connection: command.upgrade(_config(connection), "0001"))
+        await conn.execute(text(
+            "INSERT INTO users (id, email, hashed_password, is_active, is_verified, created_at, updated_at) "
+            "VALUES ('aaaaaaaa-0000-4000-8000-000000000000', 'a@example.com', 'hash', 1, 0, "
+            "'2026-01-01 00:00:00', '2026-01-01 00:00:00')"
+        ))
+        await conn.run_sync(lambda connection: command.upgrade(_config(connection), "head"))
+        result = await conn.execute(text("SELECT token_version FROM users"))
+        assert result.scalar_one() == 0
+
+
+@pytest.mark.asyncio
+async def test_create_all_refuses_an_outdated_table(empty_engine, monkeypatch):
+    """Test that create_all mode fails at startup instead of serving a stale schema."""
+    monkeypatch.setattr(database, "engine", empty_engine)
+    monkeypatch.setattr(database.settings, "DATABASE_SCHEMA_MODE", "create_all")
+    async with empty_engine.begin() as conn:
+        await conn.run_sync(lambda connection: command.upgrade(_config(connection), "0001"))
+
+    with pytest.raises(SchemaOutOfDate, match="users.token_version"):
+        await DatabaseManager.initialize()
+
+    async with empty_engine.begin() as conn:
+        await conn.run_sync(lambda connection: command.upgrade(_config(connection), "head"))
+    await DatabaseManager.initialize()
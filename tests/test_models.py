@@ -0,0 +1,42 @@
+"""
+Tests for the domain models.
+"""
+
+import copy
+
+import pytest
+
+from app.domain.models import Email, PasswordResetToken, User
+
+
+def test_models_are_slotted():
+    """Test that model instances carry no per-instance __dict__."""
+    user = User.create(email="a@example.com", hashed_password="hash")
+    token = PasswordResetToken(token="t", user_id=user.id, expires_at=user.created_at)
+
+    for instance in (user, user.email, token):
+        assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        user.nickname = "ada"
+
+
+def test_slotted_user_keeps_mutators_and_copies():
+    """Test that mutators and copy.copy still work on slotted users."""
+    user = User.create(email=" A@Example.com ", hashed_password="hash")
+    clone = copy.copy(user)
+
+    user.deactivate()
+    user.update_profile(first_name="Ada")
+
+    assert str(user.email) == "a@example.com"
+    assert user.full_name == "Ada"
+    assert user.token_version == 1
+    assert clone.is_active and clone.token_version == 0
+
+
+def test_email_from_trusted_skips_validation():
+    """Test that trusted emails are taken as stored."""
+    assert Email.from_trusted("a@example.com") == Email("a@example.com")
+    with pytest.raises(ValueError):
+        Email("not-an-email")
+    assert Email.from_trusted("not-an-email").value == "not-an-email"
@@ -0,0 +1,48 @@
+"""
+Tests for per-request query statistics.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import select
+
+from app.infrastructure.database import UserModel
+from app.infrastructure.query_stats import QueryStats, QueryTracker, current_query_stats
+
+
+@pytest.mark.asyncio
+async def test_statements_are_counted_per_request(db_engine, db_session, caplog):
+    """Test that a request's statements are counted and repeats are reported once."""
+    QueryTracker(repeat_threshold=2).attach(db_engine.sync_engine)
+    stats = QueryStats()
+
+    token = current_query_stats.set(stats)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.infrastructure.query_stats"):
+            for _ in range(4):
+                await db_session.execute(select(UserModel.id))
+    finally:
+        current_query_stats.reset(token)
+    await db_session.execute(select(UserModel.id))
+
+    assert stats.count == 4
+    assert stats.total_seconds > 0
+    warnings = [r for r in caplog.records if "N+1" in r.getMessage()]
+    assert len(warnings) == 1
+    assert stats.server_timing(0.5).endswith('desc="4 queries", app;dur=500.00')
+
+
+@pytest.mark.asyncio
+async def test_slow_statements_are_logged(db_engine, db_session, caplog):
+    """Test that statements over the threshold are logged without parameters."""
+    tracker = QueryTracker(slow_query_seconds=1e-9)
+    tracker.attach(db_engine.sync_engine)
+
+    with caplog.at_level(logging.WARNING, logger="app.infrastructure.query_stats"):
+        await db_session.execute(select(UserModel.id).where(UserModel.email == "secret@example.com"))
+
+    assert tracker.slow_queries == 1
+    [record] = caplog.records
+    assert "Slow query" in record.getMessage()
+    assert "secret@example.com" not in record.getMessage()
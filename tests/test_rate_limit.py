@@ -0,0 +1,69 @@
+"""
+Tests for the rate limiters and login throttle.
+"""
+
+import pytest
+
+from app.infrastructure.rate_limit import InMemoryRateLimiter, LoginThrottle
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_refills():
+    """Test that a full bucket allows `limit` attempts, then refills over the window."""
+    clock = FakeClock()
+    limiter = InMemoryRateLimiter(limit=3, window_seconds=60, clock=clock)
+
+    assert [(await limiter.hit("k")).allowed for _ in range(3)] == [True, True, True]
+    rejected = await limiter.hit("k")
+    assert not rejected.allowed
+    assert rejected.retry_after == pytest.approx(20.0)
+    assert (await limiter.hit("other")).allowed
+
+    clock.now += 20
+    assert (await limiter.hit("k")).allowed
+    assert not (await limiter.hit("k")).allowed
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_bounds_tracked_keys():
+    """Test that the least recently used buckets are dropped past max_keys."""
+    limiter = InMemoryRateLimiter(limit=1, window_seconds=60, max_keys=2, clock=FakeClock())
+    for key in ("a", "b", "c"):
+        await limiter.hit(key)
+
+    assert len(limiter) == 2
+    assert (await limiter.hit("a")).allowed
+
+
+@pytest.mark.asyncio
+async def test_login_throttle_limits_by_ip_and_email():
+    """Test both limits, and that IP rejections leave the email budget alone."""
+    clock = FakeClock()
+    throttle = LoginThrottle(
+        by_email=InMemoryRateLimiter(limit=2, window_seconds=60, clock=clock),
+        by_ip=InMemoryRateLimiter(limit=3, window_seconds=60, clock=clock),
+    )
+
+    assert (await throttle.check("victim@example.com", "10.0.0.1")).allowed
+    assert (await throttle.check("victim@example.com", "10.0.0.2")).allowed
+    assert not (await throttle.check("victim@example.com", "10.0.0.3")).allowed
+
+    assert (await throttle.check("a@example.com", "10.0.0.1")).allowed
+    assert (await throttle.check("b@example.com", "10.0.0.1")).allowed
+    assert not (await throttle.check("c@example.com", "10.0.0.1")).allowed
+    assert (await throttle.check("c@example.com", "10.0.0.9")).allowed
+
+    assert throttle.stats() == {
+        "backend": "memory",
+        "admitted": 5,
+        "rejected_by_email": 1,
+        "rejected_by_ip": 1,
+    }
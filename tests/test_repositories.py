@@ -0,0 +1,201 @@
+"""
+Tests for the SQLAlchemy user repository.
+"""
+
+from datetime import timedelta
+from uuid import UUID
+
+import pytest
+
+from app.domain.models import User
+from app.domain.repository import InvalidCursor
+from app.infrastructure.cache import UserCache
+from app.infrastructure.repositories import SQLAlchemyUserRepository
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_is_served_from_cache(db_session):
+    """Test that repeated lookups hit the cache instead of the database."""
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    repo = SQLAlchemyUserRepository(db_session, cache=cache)
+    user = User.create(email="a@example.com", hashed_password="hash")
+    await repo.add(user)
+
+    first = await repo.get_by_id(user.id)
+    second = await repo.get_by_id(user.id)
+
+    assert first.email == second.email
+    assert cache.stats()["local"]["hits"] == 1
+    assert cache.stats()["local"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_user(db_session):
+    """Test that update, update_password and delete invalidate the cache."""
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    repo = SQLAlchemyUserRepository(db_session, cache=cache)
+    user = User.create(email="a@example.com", hashed_password="hash")
+    await repo.add(user)
+    await repo.get_by_id(user.id)
+
+    await repo.update_password(user.id, "new-hash")
+    assert (await repo.get_by_id(user.id)).hashed_password == "new-hash"
+
+    user.update_profile(first_name="Asha")
+    await repo.update(user)
+    assert (await repo.get_by_id(user.id)).first_name == "Asha"
+
+    await repo.delete(user.id)
+    assert await repo.get_by_id(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_updating_a_cached_user_keeps_the_password_hash(db_session):
+    """Test that a user read from the cache, without its hash, can be updated safely."""
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    repo = SQLAlchemyUserRepository(db_session, cache=cache)
+    await repo.add(User.create(email="a@example.com", hashed_password="hash"))
+    user = await repo.get_by_email("a@example.com")
+    await repo.get_by_id(user.id)
+
+    cached = await repo.get_by_id(user.id)
+    assert cached.hashed_password == ""
+    cached.update_profile(first_name="Asha")
+    await repo.update(cached)
+
+    stored = await repo.get_by_email("a@example.com")
+    assert (stored.first_name, stored.hashed_password) == ("Asha", "hash")
+
+
+@pytest.mark.asyncio
+async def test_add_unique_reports_email_conflict(db_session):
+    """Test that a second user with the same email is not inserted."""
+    repo = SQLAlchemyUserRepository(db_session)
+    first = User.create(email="a@example.com", hashed_password="hash")
+    second = User.create(email="a@example.com", hashed_password="other-hash")
+
+    assert await repo.add_unique(first)
+    assert not await repo.add_unique(second)
+
+    stored = await repo.get_by_email("a@example.com")
+    assert stored.id == first.id
+    assert await repo.get_by_id(second.id) is None
+
+
+@pytest.mark.asyncio
+async def test_reads_hydrate_users_from_core_rows(db_session):
+    """Test that the trusted row mapping round-trips every field."""
+    repo = SQLAlchemyUserRepository(db_session)
+    user = User.create(email="Row@Example.com", hashed_password="hash", first_name="Ada")
+    user.deactivate()
+    await repo.add(user)
+
+    by_id = await repo.get_by_id(user.id)
+    by_email = await repo.get_by_email("row@example.com")
+    listed = await repo.list_users(is_active=False)
+
+    assert by_id == user
+    assert by_email == user
+    assert listed == [user]
+    assert str(by_id.email) == "row@example.com"
+
+
+@pytest.mark.asyncio
+async def test_list_users_page_walks_every_user_once(db_session):
+    """Test that cursor pages follow (created_at, id) order without gaps or repeats."""
+    repo = SQLAlchemyUserRepository(db_session)
+    users = [User.create(email=f"user{i}@example.com", hashed_password="hash") for i in range(7)]
+    # Shared timestamps exercise the id tie-breaker
+    for i, user in enumerate(users):
+        user.created_at = users[0].created_at + timedelta(seconds=i // 2)
+        await repo.add(user)
+
+    seen, cursor = [], None
+    while True:
+        page = await repo.list_users_page(limit=3, cursor=cursor)
+        seen.extend(page.users)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+        # A user inserted before the cursor position does not shift later pages
+        late = User.create(email=f"late{len(seen)}@example.com", hashed_password="hash")
+        late.created_at = users[0].created_at - timedelta(seconds=1)
+        await repo.add(late)
+
+    expected = sorted(users, key=lambda u: (u.created_at, str(u.id)))
+    assert [u.id for u in seen] == [u.id for u in expected]
+
+
+@pytest.mark.asyncio
+async def test_list_users_page_orders_ties_by_stored_id(db_session):
+    """Test that users sharing created_at and an id prefix are all paged."""
+    repo = SQLAlchemyUserRepository(db_session)
+    users = [User.create(email=f"user{i}@example.com", hashed_password="hash") for i in range(4)]
+    for i, user in enumerate(users):
+        user.id = UUID(f"aaaaaaaa-0000-4000-8000-00000000000{i}")
+        user.created_at = users[0].created_at
+        await repo.add(user)
+
+    seen, cursor = [], None
+    while True:
+        page = await repo.list_users_page(limit=1, cursor=cursor)
+        seen.extend(page.users)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert [u.id for u in seen] == [u.id for u in users]
+
+
+@pytest.mark.asyncio
+async def test_list_users_page_rejects_malformed_cursor(db_session):
+    """Test that a tampered cursor raises InvalidCursor."""
+    repo = SQLAlchemyUserRepository(db_session)
+
+    with pytest.raises(InvalidCursor):
+        await repo.list_users_page(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_stream_users_yields_every_user_in_order(db_session):
+    """Test that streaming across several batches yields each user once, in order."""
+    repo = SQLAlchemyUserRepository(db_session)
+    users = [User.create(email=f"user{i}@example.com", hashed_password="hash") for i in range(5)]
+    users[1].deactivate()
+    for user in users:
+        await repo.add(user)
+
+    streamed = [user async for user in repo.stream_users(batch_size=2)]
+    active = [user async for user in repo.stream_users(is_active=True, batch_size=2)]
+
+    expected = sorted(users, key=lambda u: (u.created_at, str(u.id)))
+    assert streamed == expected
+    assert active == [u for u in expected if u.is_active]
+
+
+@pytest.mark.asyncio
+async def test_add_many_reports_email_conflicts(db_session):
+    """Test that a bulk insert skips registered emails and returns them."""
+    repo = SQLAlchemyUserRepository(db_session)
+    existing = User.create(email="taken@example.com", hashed_password="hash")
+    await repo.add(existing)
+    users = [User.create(email=f"user{i}@example.com", hashed_password="hash") for i in range(3)]
+    clash = User.create(email="taken@example.com", hashed_password="other-hash")
+
+    skipped = await repo.add_many(users + [clash])
+
+    assert skipped == [clash]
+    assert [u.id for u in await repo.list_users(limit=10)] == [existing.id] + [u.id for u in users]
+
+
+@pytest.mark.asyncio
+async def test_add_many_reports_emails_repeated_in_the_batch(db_session):
+    """Test that a bulk insert keeps the first of two users with one email."""
+    repo = SQLAlchemyUserRepository(db_session)
+    first = User.create(email="twice@example.com", hashed_password="hash")
+    repeat = User.create(email="twice@example.com", hashed_password="other-hash")
+
+    skipped = await repo.add_many([first, repeat])
+
+    assert skipped == [repeat]
+    assert [u.id for u in await repo.list_users(limit=10)] == [first.id]
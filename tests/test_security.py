@@ -0,0 +1,155 @@
+"""
+Tests for the security infrastructure module.
+
+Covers password hashing (sync and pooled), the hashing worker pool and
+JWT verification.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from jose import ExpiredSignatureError, jwt
+
+from app.infrastructure.config import settings
+from app.infrastructure.security import JWTManager, PasswordHasher, PasswordHashingPool
+
+
+@pytest.mark.asyncio
+async def test_hash_async_round_trip():
+    """Test that pooled hashing produces hashes the verifier accepts."""
+    hashed = await PasswordHasher.hash_async("secret-password-1")
+
+    assert hashed != "secret-password-1"
+    assert await PasswordHasher.verify_async("secret-password-1", hashed)
+    assert not await PasswordHasher.verify_async("wrong-password-1", hashed)
+    assert PasswordHasher.verify("secret-password-1", hashed)
+
+
+@pytest.mark.asyncio
+async def test_verify_async_rejects_malformed_hash():
+    """Test that a malformed hash is reported as a mismatch."""
+    assert not await PasswordHasher.verify_async("secret-password-1", "not-a-hash")
+
+
+@pytest.mark.asyncio
+async def test_pool_caps_concurrency_and_tracks_queue():
+    """Test that the pool never runs more jobs than its cap."""
+    pool = PasswordHashingPool(max_concurrency=2)
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def work() -> int:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return 1
+
+    try:
+        results = await asyncio.gather(*(pool.run(work) for _ in range(6)))
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert sum(results) == 6
+    assert peak <= 2
+    assert stats["completed"] == 6
+    assert stats["running"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] >= 1
+    assert stats["max_wait_ms"] > 0
+
+
+def test_pool_rejects_invalid_configuration():
+    """Test that invalid pool settings are rejected."""
+    with pytest.raises(ValueError):
+        PasswordHashingPool(max_concurrency=0)
+    with pytest.raises(ValueError):
+        PasswordHashingPool(max_concurrency=1, executor_type="fiber")
+
+
+def test_needs_rehash_detects_cost_mismatch(monkeypatch):
+    """Test that hashes with a different cost factor need a rehash."""
+    monkeypatch.setattr(PasswordHasher, "rounds", 4)
+    current = PasswordHasher.hash("secret-password-1")
+    stale = PasswordHasher.hash("secret-password-1", rounds=5)
+
+    assert not PasswordHasher.needs_rehash(current)
+    assert PasswordHasher.needs_rehash(stale)
+    assert PasswordHasher.needs_rehash("not-a-hash")
+
+
+def test_calibrate_stays_within_bounds():
+    """Test that calibration respects the configured round limits."""
+    assert PasswordHasher.calibrate(target_ms=0, min_rounds=4, max_rounds=6) == 4
+    assert PasswordHasher.calibrate(target_ms=10_000, min_rounds=4, max_rounds=6) == 6
+
+
+def test_configure_rejects_out_of_range_rounds():
+    """Test that configure validates the cost factor."""
+    with pytest.raises(ValueError):
+        PasswordHasher.configure(3)
+
+
+@pytest.fixture
+def token_cache():
+    """Give each test a fresh verified-token cache with a controllable clock."""
+    clock = {"now": time.time()}
+    JWTManager.configure_token_cache(100, clock=lambda: clock["now"])
+    yield clock
+    JWTManager.configure_token_cache(settings.TOKEN_CACHE_SIZE)
+
+
+def test_decode_token_caches_verified_claims(token_cache):
+    """Test that a replayed token is served from the cache."""
+    token = JWTManager.create_access_token("user-1")
+
+    first = JWTManager.decode_token(token)
+    first["sub"] = "tampered"
+    second = JWTManager.decode_token(token)
+
+    assert second["sub"] == "user-1"
+    assert JWTManager.token_cache_stats()["hits"] == 1
+    assert JWTManager.token_cache_stats()["misses"] == 1
+
+
+def test_cached_token_expires_with_exp_claim(token_cache):
+    """Test that cache entries are dropped once the token's exp passes."""
+    token = JWTManager.create_access_token("user-1", expires_delta=1)
+    exp = JWTManager.decode_token(token)["exp"]
+
+    token_cache["now"] = exp
+    JWTManager.decode_token(token)
+
+    stats = JWTManager.token_cache_stats()
+    assert stats["hits"] == 0
+    assert stats["misses"] == 2
+
+
+def test_expired_token_is_rejected_and_not_cached(token_cache):
+    """Test that expired tokens raise and never enter the cache."""
+    token = jwt.encode(
+        {"sub": "user-1", "exp": int(time.time()) - 60, "type": "access_token"},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+    with pytest.raises(ExpiredSignatureError):
+        JWTManager.decode_token(token)
+    assert JWTManager.verify_token(token) is None
+    assert JWTManager.token_cache_stats()["size"] == 0
+
+
+def test_verify_token_checks_type(token_cache):
+    """Test that verify_token rejects tokens of the wrong type."""
+    token = JWTManager.create_refresh_token("user-1")
+
+    assert JWTManager.verify_token(token) is None
+    assert JWTManager.verify_token(token, token_type="refresh_token") == "user-1"
+    assert JWTManager.verify_token("not-a-token") is None
@@ -0,0 +1,122 @@
+"""
+Tests for the token revocation stores.
+"""
+
+import pytest
+
+from app.infrastructure.token_store import BloomFilter, InMemoryRevocationStore, RedisRevocationStore
+from tests.fakes import FakeRedis
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_memory_store_revokes_until_expiry():
+    """Test that revoked ids are reported until the token would expire."""
+    clock = FakeClock()
+    store = InMemoryRevocationStore(bucket_seconds=60, clock=clock)
+
+    await store.revoke("a", expires_at=clock.now + 30)
+    await store.revoke("b", expires_at=clock.now + 300)
+
+    assert await store.is_revoked("a")
+    assert not await store.is_revoked("c")
+    clock.now += 31
+    assert not await store.is_revoked("a")
+    assert await store.is_revoked("b")
+
+
+@pytest.mark.asyncio
+async def test_memory_store_evicts_whole_expired_buckets():
+    """Test that entries are dropped once their expiry bucket has passed."""
+    clock = FakeClock(0.0)
+    store = InMemoryRevocationStore(bucket_seconds=60, clock=clock)
+    for i in range(10):
+        await store.revoke(f"short-{i}", expires_at=50.0)
+    await store.revoke("long", expires_at=500.0)
+    await store.revoke("expired", expires_at=-1.0)
+
+    assert len(store) == 11
+    clock.now = 61.0
+    await store.is_revoked("long")
+
+    assert len(store) == 1
+    assert store.stats()["evicted"] == 10
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added item is reported as present."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_redis_store_skips_redis_for_ids_outside_the_filter():
+    """Test that only Bloom filter hits are confirmed against Redis."""
+    redis = FakeRedis()
+    clock = FakeClock()
+    store = RedisRevocationStore("redis://fake", sync_interval=1.0, clock=clock)
+    store._redis = redis
+
+    await store.revoke("revoked", expires_at=clock.now + 60)
+    assert redis.ttls["revoked:revoked"] == 60
+    await store.sync()
+    calls = redis.calls
+
+    assert not await store.is_revoked("never-revoked")
+    assert redis.calls == calls
+    assert await store.is_revoked("revoked")
+    assert redis.calls == calls + 1
+    assert store.stats()["filter_skips"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_store_sync_picks_up_other_workers_revocations():
+    """Test that a revocation by another worker is visible after a sync."""
+    redis = FakeRedis()
+    clock = FakeClock()
+    worker_a = RedisRevocationStore("redis://fake", sync_interval=1.0, clock=clock)
+    worker_b = RedisRevocationStore("redis://fake", sync_interval=1.0, clock=clock)
+    worker_a._redis = worker_b._redis = redis
+    await worker_b.sync()
+
+    await worker_a.revoke("shared", expires_at=clock.now + 60)
+    assert not await worker_b.is_revoked("shared")
+
+    await worker_b.sync()
+    assert await worker_b.is_revoked("shared")
+
+
+@pytest.mark.asyncio
+async def test_redis_store_keeps_revocations_made_during_a_sync():
+    """Test that a revocation racing the feed read stays in the new filter."""
+    redis = FakeRedis()
+    clock = FakeClock()
+    store = RedisRevocationStore("redis://fake", sync_interval=1.0, clock=clock)
+    store._redis = redis
+    await store.sync()
+    read_feed = redis.zrangebyscore
+
+    async def read_then_revoke(key, low, high):
+        members = await read_feed(key, low, high)
+        await store.revoke("racing", expires_at=clock.now + 60)
+        return members
+
+    redis.zrangebyscore = read_then_revoke
+    await store.sync()
+    redis.zrangebyscore = read_feed
+
+    assert await store.is_revoked("racing")
+    assert "racing" in store._filter
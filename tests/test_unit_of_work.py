@@ -0,0 +1,124 @@
+"""
+Tests for the SQLAlchemy unit of work.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.domain.models import User
+from app.domain.usermanagement.login import LoginService
+from app.infrastructure.cache import TokenVersionCache
+from app.infrastructure.database import Base
+from app.infrastructure.repositories import SQLAlchemyUserRepository
+from app.infrastructure.security import PasswordHasher
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+
+
+@pytest.fixture
+def commits(db_engine):
+    """Number of COMMITs issued on the test engine."""
+    issued = []
+    event.listen(db_engine.sync_engine, "commit", lambda conn: issued.append(conn))
+    return issued
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.mark.asyncio
+async def test_writes_are_grouped_into_one_commit(session_factory, commits):
+    """Test that several writes commit together and reads commit nothing."""
+    user = User.create(email="a@example.com", hashed_password="hash")
+    async with SQLAlchemyUnitOfWork(session_factory) as uow:
+        await uow.users.add(user)
+        await uow.users.update_password(user.id, "new-hash")
+        assert uow.has_writes
+        await uow.commit()
+
+    async with SQLAlchemyUnitOfWork(session_factory) as uow:
+        stored = await uow.users.get_by_id(user.id)
+        await uow.commit()
+
+    assert stored.hashed_password == "new-hash"
+    assert len(commits) == 1
+
+
+@pytest.mark.asyncio
+async def test_exit_commits_pending_writes_and_rolls_back_on_error(session_factory, commits):
+    """Test that leaving the unit commits outstanding writes unless it raised."""
+    kept = User.create(email="kept@example.com", hashed_password="hash")
+    lost = User.create(email="lost@example.com", hashed_password="hash")
+    async with SQLAlchemyUnitOfWork(session_factory) as uow:
+        await uow.users.add_unique(kept)
+    with pytest.raises(RuntimeError):
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            await uow.users.add(lost)
+            raise RuntimeError("boom")
+
+    async with SQLAlchemyUnitOfWork(session_factory) as uow:
+        assert await uow.users.exists_by_email("kept@example.com")
+        assert not await uow.users.exists_by_email("lost@example.com")
+    assert len(commits) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_is_invalidated_after_commit(tmp_path):
+    """Test that a read between a write and its commit cannot cache the old row."""
+    # A file database, so other sessions read the last committed state
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    version_cache = TokenVersionCache(max_size=10, ttl_seconds=60)
+    user = User.create(email="a@example.com", hashed_password="hash")
+    async with SQLAlchemyUnitOfWork(factory) as uow:
+        await uow.users.add(user)
+
+    async with SQLAlchemyUnitOfWork(factory, version_cache=version_cache) as uow:
+        await uow.users.update_password(user.id, "new-hash")
+        async with factory() as other:
+            racing = SQLAlchemyUserRepository(other, version_cache=version_cache)
+            assert await racing.get_token_version(user.id) == 0
+        await uow.commit()
+
+    async with factory() as session:
+        repo = SQLAlchemyUserRepository(session, version_cache=version_cache)
+        assert await repo.get_token_version(user.id) == 1
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_login_releases_the_connection_before_verifying(session_factory, monkeypatch):
+    """Test that bcrypt runs outside the lookup's transaction."""
+    monkeypatch.setattr(PasswordHasher, "rounds", 4)
+    user = User.create(email="a@example.com", hashed_password=PasswordHasher.hash("secret-password-1"))
+    async with SQLAlchemyUnitOfWork(session_factory) as uow:
+        await uow.users.add(user)
+
+    verify = PasswordHasher.verify_async
+    in_transaction = []
+
+    async def recording_verify(password, hashed_password):
+        in_transaction.append(uow.session.in_transaction())
+        return await verify(password, hashed_password)
+
+    monkeypatch.setattr(PasswordHasher, "verify_async", recording_verify)
+    async with SQLAlchemyUnitOfWork(session_factory) as uow:
+        authenticated = await LoginService(uow).authenticate("a@example.com", "secret-password-1")
+
+    assert authenticated.id == user.id
+    assert in_transaction == [False]
+
+
+@pytest.mark.asyncio
+async def test_unit_must_be_entered_before_use(session_factory):
+    """Test that using a unit outside `async with` raises a clear error."""
+    uow = SQLAlchemyUnitOfWork(session_factory)
+
+    with pytest.raises(RuntimeError, match="async with"):
+        uow.users
+    with pytest.raises(RuntimeError, match="async with"):
+        await uow.commit()
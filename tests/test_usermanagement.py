@@ -0,0 +1,230 @@
+"""
+Tests for the user management domain services.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.domain.models import User
+from app.domain.usermanagement.login import InvalidCredentials, LoginService
+from app.domain.usermanagement.signup import (
+    EmailAlreadyRegistered,
+    SignupService,
+    WeakPassword,
+)
+from app.domain.usermanagement.token_refresh import (
+    InvalidRefreshToken,
+    RefreshTokenReused,
+    TokenRefreshService,
+)
+from app.domain.usermanagement.user_import import ImportRecord, UserImportService
+from app.infrastructure.security import JWTManager, PasswordHasher, PasswordHashingPool
+from app.infrastructure.token_store import InMemoryRefreshTokenStore
+from tests.fakes import InMemoryUnitOfWork, InMemoryUserRepository
+
+PASSWORD = "secret-password-1"
+
+
+@pytest.mark.asyncio
+async def test_authenticate_rejects_wrong_password():
+    """Test that a wrong password raises InvalidCredentials."""
+    user = User.create(email="a@example.com", hashed_password=PasswordHasher.hash(PASSWORD))
+    service = LoginService(InMemoryUnitOfWork(InMemoryUserRepository([user])))
+
+    with pytest.raises(InvalidCredentials):
+        await service.authenticate("a@example.com", "wrong-password-1")
+
+
+@pytest.mark.asyncio
+async def test_authenticate_upgrades_stale_hash(monkeypatch):
+    """Test that a successful login rehashes passwords at an outdated cost."""
+    monkeypatch.setattr(PasswordHasher, "rounds", 4)
+    stale_hash = PasswordHasher.hash(PASSWORD, rounds=5)
+    user = User.create(email="a@example.com", hashed_password=stale_hash)
+    repo = InMemoryUserRepository([user])
+    uow = InMemoryUnitOfWork(repo)
+
+    authenticated = await LoginService(uow).authenticate("A@example.com ", PASSWORD)
+
+    assert repo.password_updates == [user.id]
+    assert uow.commits == 1
+    assert authenticated.hashed_password != stale_hash
+    assert not PasswordHasher.needs_rehash(authenticated.hashed_password)
+    assert PasswordHasher.verify(PASSWORD, authenticated.hashed_password)
+    # Re-hashing the same password must not log out other sessions
+    assert authenticated.token_version == 0
+
+
+@pytest.mark.asyncio
+async def test_authenticate_keeps_current_hash(monkeypatch):
+    """Test that hashes at the current cost are left alone."""
+    monkeypatch.setattr(PasswordHasher, "rounds", 4)
+    user = User.create(email="a@example.com", hashed_password=PasswordHasher.hash(PASSWORD))
+    repo = InMemoryUserRepository([user])
+    uow = InMemoryUnitOfWork(repo)
+
+    await LoginService(uow).authenticate("a@example.com", PASSWORD)
+
+    assert repo.password_updates == []
+    assert uow.commits == 0
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_duplicate_email():
+    """Test that registering a taken email raises EmailAlreadyRegistered."""
+    repo = InMemoryUserRepository()
+    service = SignupService(InMemoryUnitOfWork(repo))
+    await service.register("a@example.com", PASSWORD)
+
+    with pytest.raises(EmailAlreadyRegistered):
+        await service.register(" A@example.com", PASSWORD)
+    assert len(repo.users) == 1
+
+
+@pytest.mark.asyncio
+async def test_register_stores_profile_in_one_commit():
+    """Test that names given at signup are part of the stored user."""
+    repo = InMemoryUserRepository()
+    uow = InMemoryUnitOfWork(repo)
+
+    user = await SignupService(uow).register("a@example.com", PASSWORD, first_name="Ada", last_name="Lovelace")
+
+    assert (await repo.get_by_id(user.id)).full_name == "Ada Lovelace"
+    assert uow.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_register_validates_password_before_storage():
+    """Test that weak passwords are rejected without touching the repository."""
+    repo = InMemoryUserRepository()
+
+    with pytest.raises(WeakPassword):
+        await SignupService(InMemoryUnitOfWork(repo)).register("a@example.com", "password")
+    assert repo.users == {}
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_tokens_without_hashing(monkeypatch):
+    """Test that a refresh token is exchanged for a new pair in the same family."""
+    monkeypatch.setattr(PasswordHasher, "verify", None)
+    user = User.create(email="a@example.com", hashed_password="unused")
+    service = TokenRefreshService(InMemoryUserRepository([user]), InMemoryRefreshTokenStore())
+    issued = await service.issue_tokens(user)
+
+    refreshed = await service.refresh(issued.refresh_token)
+
+    assert JWTManager.verify_token(refreshed.access_token) == str(user.id)
+    old_claims = JWTManager.decode_token(issued.refresh_token)
+    new_claims = JWTManager.decode_token(refreshed.refresh_token)
+    assert new_claims["fam"] == old_claims["fam"]
+    assert new_claims["jti"] != old_claims["jti"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_reuse_revokes_family():
+    """Test that replaying a used refresh token revokes the whole family."""
+    user = User.create(email="a@example.com", hashed_password="unused")
+    store = InMemoryRefreshTokenStore()
+    service = TokenRefreshService(InMemoryUserRepository([user]), store)
+    issued = await service.issue_tokens(user)
+    refreshed = await service.refresh(issued.refresh_token)
+
+    with pytest.raises(RefreshTokenReused):
+        await service.refresh(issued.refresh_token)
+    with pytest.raises(InvalidRefreshToken):
+        await service.refresh(refreshed.refresh_token)
+    assert store.stats()["reuse_detected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_access_tokens():
+    """Test that an access token cannot be used as a refresh token."""
+    user = User.create(email="a@example.com", hashed_password="unused")
+    service = TokenRefreshService(InMemoryUserRepository([user]), InMemoryRefreshTokenStore())
+    issued = await service.issue_tokens(user)
+
+    with pytest.raises(InvalidRefreshToken):
+        await service.refresh(issued.access_token)
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejected_after_password_change():
+    """Test that a password change invalidates outstanding refresh tokens."""
+    user = User.create(email="a@example.com", hashed_password="unused")
+    repo = InMemoryUserRepository([user])
+    service = TokenRefreshService(repo, InMemoryRefreshTokenStore())
+    issued = await service.issue_tokens(user)
+
+    await repo.update_password(user.id, "new-hash")
+
+    with pytest.raises(InvalidRefreshToken):
+        await service.refresh(issued.refresh_token)
+
+
+async def _records(*records):
+    for record in records:
+        yield record
+
+
+@pytest.mark.asyncio
+async def test_import_records_counts_imported_duplicates_and_invalid():
+    """Test that an import validates, hashes, inserts and reports per batch."""
+    existing = User.create(email="taken@example.com", hashed_password="hash")
+    repo = InMemoryUserRepository([existing])
+    legacy_hash = PasswordHasher.hash(PASSWORD, rounds=4)
+    batches = []
+    uow = InMemoryUnitOfWork(repo)
+    service = UserImportService(uow, batch_size=2, progress=lambda report: batches.append(report.processed))
+
+    report = await service.import_records(_records(
+        ImportRecord(line=1, email=" New@Example.com ", password=PASSWORD, is_verified=True),
+        ImportRecord(line=2, email="legacy@example.com", password_hash=legacy_hash),
+        ImportRecord(line=3, email="taken@example.com", password=PASSWORD),
+        ImportRecord(line=4, email="weak@example.com", password="short"),
+        ImportRecord(line=5, email="bad@example.com", password_hash="$2b$12$not-a-hash"),
+        ImportRecord(line=6, error="malformed-json"),
+    ))
+
+    assert (report.processed, report.imported, report.duplicates, report.invalid) == (6, 2, 1, 3)
+    assert batches == [2, 4, 6]
+    assert uow.commits == 3
+    assert sorted((r.line, r.reason) for r in report.rejections) == [
+        (3, "email-already-registered"),
+        (4, "password-too-short"),
+        (5, "invalid-password-hash"),
+        (6, "malformed-json"),
+    ]
+    new_user = await repo.get_by_email("new@example.com")
+    assert new_user.is_verified and PasswordHasher.verify(PASSWORD, new_user.hashed_password)
+    assert (await repo.get_by_email("legacy@example.com")).hashed_password == legacy_hash
+
+
+@pytest.mark.asyncio
+async def test_import_leaves_hashing_pool_slots_for_logins():
+    """Test that a login verify is not queued behind an import's whole batch."""
+    pool = PasswordHashingPool(max_concurrency=2)
+
+    async def slow_hash(password: str) -> str:
+        return await pool.run(time.sleep, 0.05) or "hash"
+
+    service = UserImportService(
+        InMemoryUnitOfWork(InMemoryUserRepository()),
+        batch_size=20,
+        hash_password=slow_hash,
+        hash_concurrency=1
+    )
+    records = [ImportRecord(line=i, email=f"user{i}@example.com", password=PASSWORD) for i in range(20)]
+    importing = asyncio.create_task(service.import_records(_records(*records)))
+    await asyncio.sleep(0.01)
+
+    started = time.perf_counter()
+    await pool.run(time.sleep, 0)
+    login_wait = time.perf_counter() - started
+
+    report = await importing
+    pool.shutdown()
+    assert report.imported == 20
+    # The whole batch takes 20 x 50 ms on one slot; a login waits for none of it
+    assert login_wait < 0.05